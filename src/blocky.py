@@ -18,8 +18,32 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-from pathlib import Path
-from typing import Union, Callable
+# pylint: disable=too-many-lines
+# rationale: The template engine is intentionally distributed as a single module.
+
+import abc
+import argparse
+import asyncio
+import contextvars
+import copy
+import hashlib
+import importlib.resources
+import inspect
+import json
+import mmap
+import os
+import pickle
+import re
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, wraps
+from pathlib import Path, PurePath
+from typing import Union, AsyncIterable, Callable, Collection, Iterable, Iterator, Mapping, NamedTuple, TextIO
 
 __author__ = "Lubomir Milko"
 __copyright__ = "Copyright (C) 2025 Lubomir Milko"
@@ -36,6 +60,8 @@ class Tag:
     *<example>*
     Tag name is usually variable, but a default name can be assigned.
     """
+    __slots__ = ("__begin", "__end", "__name", "__str", "__names")
+
     # pylint: disable=used-before-assignment
     # rationale: Probably a bug in Pylint, because it assumes that the first "str" type hint is a variable
     # being used before assignment.
@@ -48,9 +74,58 @@ class Tag:
             begin_str (str, optional): String defining the beginning of a tag. Defaults to "<".
             end_str (str, optional): String defining the end of a tag. Defaults to ">".
         """
-        self.begin = begin_str
-        self.end = end_str
-        self.name = name
+        self.__begin: str = begin_str
+        self.__end: str = end_str
+        self.__name: str = name
+        # Complete tag string with the default name and the interned tag strings with other names.
+        self.__str: str = ""
+        self.__names: dict[str, str] = {}
+        self.__update()
+
+    @property
+    def begin(self) -> str:
+        """
+        Property method that returns the string defining the beginning of a tag.
+
+        Returns:
+            str: Tag begin string.
+        """
+        return self.__begin
+
+    @begin.setter
+    def begin(self, begin_str: str) -> None:
+        self.__begin = begin_str
+        self.__update()
+
+    @property
+    def end(self) -> str:
+        """
+        Property method that returns the string defining the end of a tag.
+
+        Returns:
+            str: Tag end string.
+        """
+        return self.__end
+
+    @end.setter
+    def end(self, end_str: str) -> None:
+        self.__end = end_str
+        self.__update()
+
+    @property
+    def name(self) -> str:
+        """
+        Property method that returns the default tag name.
+
+        Returns:
+            str: Default tag name.
+        """
+        return self.__name
+
+    @name.setter
+    def name(self, name: str) -> None:
+        self.__name = name
+        self.__update()
 
     def str_name(self, tag_name: str = "") -> str:
         """
@@ -63,8 +138,14 @@ class Tag:
         Returns:
             str: Tag string.
         """
-        name = tag_name if tag_name else self.name
-        return str(f"{self.begin}{name}{self.end}")
+        if not tag_name:
+            return self.__str
+        tag_str = self.__names.get(tag_name)
+        if tag_str is None:
+            if len(self.__names) >= _MAX_TAG_NAMES:
+                self.__names.clear()
+            tag_str = self.__names[tag_name] = sys.intern(f"{self.__begin}{tag_name}{self.__end}")
+        return tag_str
 
     @property
     def str(self) -> str:
@@ -75,13 +156,24 @@ class Tag:
         Returns:
             str: Tag string.
         """
-        return str(f"{self.begin}{self.name}{self.end}")
+        return self.__str
+
+    def __update(self) -> None:
+        """
+        Creates the tag string with the default name again and forgets the tag strings with other names after
+        the tag begin, end or the default name is changed.
+        """
+        self.__str = sys.intern(f"{self.__begin}{self.__name}{self.__end}")
+        self.__names = {}
 
 
 class TagsFormat:
     """
     Class defining the format of tags used in template strings.
     """
+    __slots__ = ("variable", "block_start", "block_end", "block_variation", "char_repeat", "std_last_first_start",
+                 "std_last_first_end")
+
     def __init__(
             self, variable: Tag, block_start: Tag, block_end: Tag, block_variation: Tag, char_repeat: Tag,
             std_last_first_start: Tag, std_last_first_end: Tag) -> None:
@@ -98,6 +190,8 @@ class BlockConfig:
     """
     Block configuration class defining the formatting of blocks within the string template.
     """
+    __slots__ = ("tags", "tab_size")
+
     def __init__(self, tags: TagsFormat, tab_size: int = 4) -> None:
         self.tags: TagsFormat = tags
         self.tab_size: int = tab_size
@@ -180,7 +274,7 @@ class BlockData(object):
         """
         def get_value(value: any) -> list | BlockData | str:
             val = None
-            if isinstance(value, (list, tuple)):
+            if _is_data_list(value):
                 val = [get_value(v) for v in value]
             elif isinstance(value, dict):
                 val = BlockData()
@@ -197,6 +291,10 @@ class Block:
     """
     Class representing a block indicated by block start and block end tags inside parent block template.
     """
+    __slots__ = ("__template", "__content", "__content_chunks", "__chunk_tags", "__tag_pos", "__tag_pos_content",
+                 "__clone_flag", "__set_first_value", "__compiled", "raw_content", "config", "name", "parent",
+                 "subblocks")
+
     def __init__(self, template: str | Path = "", block_name: str = "",
                  config: BlockConfig = DEFAULT_BLOCK_CONFIG, parent: "Block" = None) -> None:
         """
@@ -211,14 +309,26 @@ class Block:
         """
         # Template with tags to be filled by filling module.
         self.__template: str = ""
-        # Content created by filling tags in the template and its clones.
+        # Content created by filling tags in the template and its clones. The content of the finished clones up to
+        # the last new line char is kept in separate chunks to avoid copying the whole content with each clone.
+        self.__content: str = ""
+        self.__content_chunks: list[str] | tuple = ()
+        # Tag strings that can be found in the content chunks. Empty chunks and tags are represented by the shared
+        # empty tuple and frozenset to keep the blocks without any clones small.
+        self.__chunk_tags: frozenset[str] = frozenset()
+        # Positions of the first occurrences of tag strings in the active part of the content valid only for
+        # the content string stored together with them. Value -1 indicates a tag that is not present and values
+        # below -1 indicate a tag that is not present before the position -2 - value.
+        self.__tag_pos: dict[str, int] = {}
+        self.__tag_pos_content: str | None = None
         # Flag indicating that a new clone of the template is going to be automatically added after the
         # actual content as soon as new template variables or blocks are set.
         self.__clone_flag: bool = False
         # Flag indicating that a first value of a special *first-last value* tag should be set.
         self.__set_first_value: bool = True
+        # Compiled template used for filling the block content by the fill method.
+        self.__compiled: CompiledTemplate | None = None
         self.raw_content: bool = False
-        self.content: str = ""
         self.config = config
         # Block name corresponding to the block tag name in the template.
         self.name: str = block_name
@@ -232,6 +342,30 @@ class Block:
         if template:
             self.load_template(template)
 
+    @property
+    def content(self) -> str:
+        """
+        Property method that returns the block content, i.e. the block template with the filled tags and its clones.
+
+        Returns:
+            str: Block content.
+        """
+        if self.__content_chunks:
+            self.__join_content_chunks()
+        return self.__content
+
+    @content.setter
+    def content(self, content: str) -> None:
+        """
+        Setter method that sets the block content.
+
+        Args:
+            content (str): Block content.
+        """
+        self.__content = content
+        self.__content_chunks = ()
+        self.__chunk_tags = frozenset()
+
     @property
     def template(self) -> str:
         """
@@ -253,10 +387,59 @@ class Block:
         self.__template = template
         self.content = template
 
+    @classmethod
+    def from_string(cls, template: str, subblock_name: str = "", config: BlockConfig = DEFAULT_BLOCK_CONFIG) \
+            -> "Block":
+        """
+        Creates a new block object with the template string. Unlike the constructor, the string is never checked
+        to be a path to the template file.
+
+        Args:
+            template (str): Template string.
+            subblock_name (str, optional): Name of the subblock to be extracted from the specified template.
+                If not specified, then the whole template string will be set as a template. Defaults to an
+                empty string "".
+            config (:class:`BlockConfig`, optional): Block configuration (template tags format, tabulator size, etc.)
+
+        Returns:
+            Block: Block object.
+        """
+        blk = cls(block_name=subblock_name, config=config)
+        blk.template = template
+        if subblock_name:
+            blk.template = blk.get_subblock(subblock_name).template
+            blk.subblocks = {}
+        return blk
+
+    @classmethod
+    def from_file(cls, template_file_path: str | Path, subblock_name: str = "",
+                  config: BlockConfig = DEFAULT_BLOCK_CONFIG) -> "Block":
+        """
+        Creates a new block object with the template loaded from the text file. The template is kept in the
+        process-wide :class:`TemplateCache`, i.e. the file is read and parsed again only if it has been modified.
+
+        Args:
+            template_file_path (str | Path): Path to the text file containing the template.
+            subblock_name (str, optional): Name of the subblock to be extracted from the file template.
+                If not specified, then the whole file template will be set as a template. Defaults to an
+                empty string "".
+            config (:class:`BlockConfig`, optional): Block configuration (template tags format, tabulator size, etc.)
+
+        Returns:
+            Block: Block object.
+        """
+        blk = cls(config=config)
+        blk._set_compiled_template(template_cache.get_template(template_file_path, subblock_name, config),
+                                   subblock_name if subblock_name else Path(template_file_path).name)
+        return blk
+
     def load_template(self, template: str | Path, subblock_name: str = "") -> None:
         """
         Loads block template from the text file. Alternatively, if the template is provided directly
         as a string (i.e., not the file path), then the string is directly used as a block template.
+        Strings containing a new line char are always used as a template without checking the file system.
+        Templates loaded from files are kept in the process-wide :class:`TemplateCache`, i.e. the file is read
+        and parsed again only if it has been modified.
 
         Args:
             template (str | Path): Path to the text file containing a string to be used as a block template.
@@ -266,42 +449,101 @@ class Block:
                 If not specified, then the whole template string will be set as a template. Defaults to an
                 empty string "".
         """
-        if Path(template).is_file():
-            with open(template, "r", encoding="utf-8") as file_template:
-                template_str = file_template.read()
-            self.name = Path(template).name
-        else:
-            template_str = template
-
-        if subblock_name:
-            blk_file = Block(template=template_str, config=self.config)
-            self.template = blk_file.get_subblock(subblock_name).template
+        if _is_template_file(template):
+            self._set_compiled_template(template_cache.get_template(template, subblock_name, self.config),
+                                        subblock_name if subblock_name else Path(template).name)
+        elif subblock_name:
+            self.template = Block.from_string(f"{template}", subblock_name, self.config).template
             self.name = subblock_name
-            del blk_file
         else:
-            self.template = template_str
+            self.template = template
+
+    def _set_compiled_template(self, compiled: "CompiledTemplate", block_name: str) -> None:
+        """
+        Sets the template of a compiled template loaded from a file or a template loader as the block template.
+        The compiled template is then used for filling the block without parsing the template again. Used also by
+        the :class:`TemplateLoader` objects creating the blocks.
 
-    def save_content(self, content_file_path: str | Path) -> None:
+        Args:
+            compiled (CompiledTemplate): Compiled template.
+            block_name (str): Block name.
+        """
+        self.template = compiled.template
+        self.__compiled = compiled
+        self.name = block_name
+
+    def save_content(self, content_file_path: str | Path, only_changed: bool = False) -> bool:
         """
-        Saves block content to the text file.
+        Saves block content to the text file. The content is written into a temporary file first, which then
+        replaces the original file, so the file never contains a partially written content. The hard links to
+        the original file are therefore not updated. Special files, e.g. pipes or devices, are written in place.
 
         Args:
             content_file_path (str | Path): Path to the text file in which the block content will be saved.
+            only_changed (bool, optional): Flag indicating that the file is not written if it already contains
+                the same content, i.e. its modification time is not changed. The content is compared using its
+                size and hash before anything is written. Defaults to False.
+
+        Returns:
+            bool: True if the file was written, False if it was skipped, because its content did not change.
+        """
+        return _save_file(content_file_path, self.content, only_changed)
+
+    def render_to(self, output: TextIO, block_data: object | dict) -> None:
+        """
+        Fills the block content using the data from a specified object or a dictionary the same way as the
+        :meth:`fill` method and writes the filled content into the output instead of keeping it in the block.
+        The finished lines of the content are written as soon as they are rendered, i.e. the memory needed for
+        writing large contents is limited by the largest list item instead of the whole content.
+        The block content itself is not changed.
+
+        Args:
+            output (TextIO): Text file or other object with the ``write`` method into which the content is written.
+            block_data (object | dict): Object or dictionary with the attribute-value or key-value pairs to be
+                used for filling the block content (see the :meth:`fill` method).
+        """
+        if self.__clone_flag:
+            # Pending clone is filled together with the previous clones, i.e. by a block copy filled as a whole.
+            blk = copy.copy(self)
+            blk.content = self.content
+            blk.subblocks = {}
+            blk.fill(block_data)
+            output.write(blk.content)
+            return
+        if self.__compiled is None or self.__compiled.template != self.content:
+            self.__compiled = CompiledTemplate(self.content, self.config)
+        self.__compiled.render_to(output, block_data)
+
+    async def render_to_async(self, output: object, block_data: object | dict) -> None:
+        """
+        Writes the filled block content into the output the same way as the :meth:`render_to` method, but the block
+        is filled in a worker thread without blocking the event loop (see the :meth:`fill_async` method).
+
+        Args:
+            output (object): Object with the ``write`` method into which the content is written. The ``write``
+                method can be a coroutine function, e.g. of an asynchronous file. If the output also has a ``drain``
+                coroutine method, e.g. ``asyncio.StreamWriter``, then it is awaited after each write.
+            block_data (object | dict): Object or dictionary with the attribute-value or key-value pairs to be
+                used for filling the block content (see the :meth:`fill` method).
         """
-        with open(content_file_path, "w", encoding="utf-8") as file_content:
-            file_content.write(self.content)
+        await _run_async(self.render_to, _AsyncWriter(output), block_data)
 
     def fill(self, block_data: object | dict, __subidx: int = 0) -> int | bool:
         """
         Fills the block content using the data from a specified object (:class:`BlockData` recommended) or a
-        dictionary. The list below defines the relationships between the object attribute values or dictionary
-        values and their use in a block template:
+        dictionary. The object can also be any other mapping, dataclass, named tuple or an object with slots,
+        which are used directly without converting them. The list below defines the relationships between
+        the object attribute values or dictionary values and their use in a block template:
 
         *   Strings, integers, floats, booleans -> Values set directly as block variables into the template tags.
         *   Subobject or subdictionary -> Data to be filled into a subblock of the parent block being filled.
-        *   List or tuple -> Content of block clones. Each list or tuple item should consist of another subobject or
-            a subdictionary representing attributes and their values to be used in one cloned instance of
-            a template block.
+        *   List or tuple (except named tuples) -> Content of block clones. Each list or tuple item should consist of
+            another subobject or a subdictionary representing attributes and their values to be used in one cloned
+            instance of a template block.
+        *   Other collection or iterator, e.g. a set, a range or a generator -> Content of block clones the same as
+            for a list, except for the strings and binary data, e.g. bytes, which are not lists. Iterators are
+            consumed in a single pass without keeping their items, i.e. the data containing them can be filled
+            only once and an iterator filled into more blocks with the same name is converted into a tuple first.
 
         Args:
             block_data (object | dict): Object or dictionary with the attribute-value or key-value pairs to be
@@ -324,74 +566,193 @@ class Block:
                 being filled within the current call of this method.
         """
         # Do nothing if block_data is not a dictionary or an object.
-        if block_data is None or isinstance(block_data, (list, tuple, str, int, float, bool)):
+        if _get_data_accessor(block_data.__class__) is None:
             return 0
 
+        if self.__clone_flag:
+            # If the cloning is pending, then the block data are filled into the content textually, because
+            # the values can be filled also into the unset tags remaining in the previous clones.
+            return self.__fill_textual(block_data, __subidx)
+
+        # Render the compiled block content in a single walk through its nodes.
+        if self.__compiled is None or self.__compiled.template != self.content:
+            self.__compiled = CompiledTemplate(self.content, self.config)
+        try:
+            # pylint: disable=protected-access
+            # rationale: Rendering of the nodes is meant to be used only by the compiled template and the block.
+            content = self.__compiled._render_nodes(block_data)
+        except _InexactRenderError:
+            return self.__fill_textual(block_data, __subidx)
+        (_, ret_vari_idx, fill_hndl) = _get_data_scope(block_data)
+        self.content = content
+        if fill_hndl:
+            _wait_async(fill_hndl(self, block_data, __subidx))
+        return ret_vari_idx
+
+    async def fill_async(self, block_data: object | dict) -> int | bool:
+        """
+        Fills the block content the same way as the :meth:`fill` method, but in a worker thread without blocking
+        the event loop, so multiple blocks can be filled concurrently while waiting for their data. In addition to
+        the data accepted by the :meth:`fill` method, the lists of block clones can be defined by asynchronous
+        iterables, e.g. asynchronous generators, and the ``fill_hndl`` handlers can be coroutine functions.
+        The items of asynchronous iterables and the handlers are awaited in the event loop calling this method.
+
+        .. note::
+            The asynchronous methods share a pool of 64 worker threads, i.e. at most 64 blocks or templates are
+            filled concurrently and the others wait for a free thread. Each worker thread waits while its data or
+            handlers are awaited. The asynchronous methods can also be awaited from the coroutine ``fill_hndl``
+            handlers and data sources, i.e. within another asynchronous filling, in which case the nested
+            filling runs in its own thread outside of the pool.
+
+        Args:
+            block_data (object | dict): Object or dictionary with the attribute-value or key-value pairs to be
+                used for filling the block template (see the :meth:`fill` method).
+
+        Returns:
+            int | bool: Iteration index to be used for setting the parent block containing the elements
+                being filled within the current call of this method.
+        """
+        return await _run_async(self.fill, block_data)
+
+    def _fill_compiled(self, compiled: "CompiledTemplate", block_data: object | dict) -> int | bool:
+        """
+        Fills the block content the same way as the :meth:`fill` method using an already compiled template of
+        the block content, i.e. without parsing the block content again. Used by the :class:`CompiledTemplate`.
+
+        Args:
+            compiled (CompiledTemplate): Compiled template of the block content.
+            block_data (object | dict): Object or dictionary with the data to be filled into the block content.
+
+        Returns:
+            int | bool: Iteration index to be used for setting the parent block (see the :meth:`fill` method).
+        """
+        self.__compiled = compiled
+        return self.fill(block_data)
+
+    def _fill_textual(self, block_data: object | dict) -> int | bool:
+        """
+        Fills the block content by searching and replacing the tags in the block content without rendering
+        the compiled template. Used by the :class:`CompiledTemplate` if the compiled rendering is known to fail.
+
+        Args:
+            block_data (object | dict): Object or dictionary with the data to be filled into the block content.
+
+        Returns:
+            int | bool: Iteration index to be used for setting the parent block (see the :meth:`fill` method).
+        """
+        return self.__fill_textual(block_data)
+
+    def __fill_textual(self, block_data: object | dict, subidx: int = 0) -> int | bool:
+        """
+        Fills the block content using the data from a specified object or a dictionary by searching and replacing
+        the tags in the block content. Produces the same results as the :meth:`fill` method.
+
+        Args:
+            block_data (object | dict): Object or dictionary with the attribute-value or key-value pairs to be
+                used for filling the block template.
+            subidx (int, optional): Item index for attributes of list type sent to the fill handler function.
+                Defaults to 0.
+
+        Returns:
+            int | bool: Iteration index to be used for setting the parent block containing the elements
+                being filled within the current call of this method.
+        """
         # Returned variation index used for setting the parent block after the execution of this method.
         ret_vari_idx = 0
 
         # Get the block data in form of a dictionary even if it is defined as an object.
-        data_dict = block_data if isinstance(block_data, dict) else block_data.__dict__
+        data_dict = _get_data_dict(block_data)
+        values = tuple(data_dict.values())
+        # Tag names and the filling steps of the attributes are the same for all data with the same attributes
+        # and value types, e.g. for all items of a list.
+        plan = _get_fill_plan(tuple(data_dict), tuple(map(type, values)), self.config)
 
         # 1. Loop through list or tuple items of block data and fill the template blocks that need to be cloned.
-        for (attrib, value) in data_dict.items():
-            if isinstance(value, (list, tuple)):
-                while True:
-                    subblk = self.get_subblock(f"{attrib.upper()}")
-                    if subblk is None:
-                        break
-                    if value:
-                        for (i, val) in enumerate(value):
-                            subblk.fill(val, i)
-                            subblk.clone()
-                        subblk.set(count=1)
-                    else:
-                        subblk.clear(count=1)   # Value is an empty list, i.e., [].
+        for (idx, name, start_tag) in plan.lists:
+            value = values[idx]
+            while True:
+                subblk = self.__get_planned_subblock(name, start_tag)
+                if subblk is None:
+                    break
+                if value.__class__ is not list and not isinstance(value, tuple) and \
+                        self.content.count(start_tag) > 1:
+                    # Items of other iterables, e.g. generators, are kept only if they are filled into more blocks.
+                    value = tuple(_iter_items(value))
+                # Items are consumed in a single pass, the last clone is distinguished when the block is set.
+                filled = False
+                for (i, val) in enumerate(_iter_items(value)):
+                    subblk.fill(val, i)
+                    subblk.clone()
+                    filled = True
+                if filled:
+                    subblk.set(count=1)
+                else:
+                    subblk.clear(count=1)   # Value is an empty list, i.e., [].
 
         # 2. Loop through other types (None, object or dict) of block data and fill the single instance (non-cloned)
         #    template blocks.
-        for (attrib, value) in data_dict.items():
-            if not isinstance(value, (list, tuple, str, int, float, bool)) and attrib != "fill_hndl":
-                while True:
-                    subblk = self.get_subblock(f"{attrib.upper()}")
-                    if subblk is None:
-                        # If value is a None object or an empty dict, i.e., None or {} and there is no
-                        # template block with the specified name, then try to clear the variables with that name.
-                        if not value:
-                            self.clear_variables(f"{attrib.upper()}")
-                        break
-                    if value:
-                        # Get the variation index from the internal elements if they contain a vari_idx attribute.
-                        vari_idx = subblk.fill(value)
-                        subblk.set(variation_idx=vari_idx, count=1)
-                    else:
-                        subblk.clear(count=1)   # Value is a None object or an empty dict, i.e., None or {}.
+        for (idx, name, start_tag) in plan.blocks:
+            value = values[idx]
+            while True:
+                subblk = self.__get_planned_subblock(name, start_tag)
+                if subblk is None:
+                    # If value is a None object or an empty dict, i.e., None or {} and there is no
+                    # template block with the specified name, then try to clear the variables with that name.
+                    if not value:
+                        self.clear_variables(name)
+                    break
+                if value:
+                    # Get the variation index from the internal elements if they contain a vari_idx attribute.
+                    vari_idx = subblk.fill(value)
+                    subblk.set(variation_idx=vari_idx, count=1)
+                else:
+                    subblk.clear(count=1)   # Value is a None object or an empty dict, i.e., None or {}.
 
         # 3. Loop through simple data type items of block data and fill the template tags.
-        for (attrib, value) in data_dict.items():
-            if isinstance(value, (str, int, float, bool)):
-                if attrib == "vari_idx":
-                    # If the attribute is vari_idx, then return its value to be used as a variation_idx
-                    # argument of the set method setting the parent block containing this attribute.
-                    ret_vari_idx = value
+        for (idx, name, start_tag) in plan.variables:
+            value = values[idx]
+            if name is None:
+                # If the attribute is vari_idx, then return its value to be used as a variation_idx
+                # argument of the set method setting the parent block containing this attribute.
+                ret_vari_idx = value
+                continue
+            while True:
+                subblk = self.__get_planned_subblock(name, start_tag)
+                if subblk is None:
+                    break
+                if value:
+                    subblk.set(count=1)
                 else:
-                    while True:
-                        subblk = self.get_subblock(f"{attrib.upper()}")
-                        if subblk is None:
-                            break
-                        if value:
-                            subblk.set(count=1)
-                        else:
-                            subblk.clear(count=1)   # Value is "", 0 or False
-                    self.set_variables(**{f"{attrib.upper()}": value})
+                    subblk.clear(count=1)   # Value is "", 0 or False
+            # Same as setting a single simple value by the set_variables method.
+            self.clone(passive=True)
+            self.__replace_variables([self.config.tags.variable.str_name(name)], [f"{value}"])
 
         # 4. If an external fill handle is defined within the block data, then call it.
         fill_hndl = data_dict.get("fill_hndl")
         if fill_hndl:
-            fill_hndl(self, block_data, __subidx)
+            _wait_async(fill_hndl(self, block_data, subidx))
 
         return ret_vari_idx
 
+    def __get_planned_subblock(self, subblock_name: str, start_tag: str) -> Union["Block", None]:
+        """
+        Returns a subblock object the same way as the :meth:`get_subblock` method, but without searching the block
+        content if the subblock start tag is not present in it.
+
+        Args:
+            subblock_name (str): Name of the subblock.
+            start_tag (str): Subblock start tag string.
+
+        Returns:
+            Block | None: Subblock object or None if the subblock is not found.
+        """
+        self.clone(passive=True)
+        if start_tag not in self.__chunk_tags and start_tag not in self.__content and \
+                _is_content_tag(start_tag, self.config):
+            return None
+        return self.get_subblock(subblock_name)
+
     def reset(self, all_subblocks: bool = True) -> None:
         """
         Resets block content to the initial template.
@@ -462,7 +823,18 @@ class Block:
                     self.__set_first_value = False
                     self.__set_char_repeat_tag()
                 # Perform a clone, i.e. finalize the content and add new template at the end of the content.
-                self.content = f"{self.content}{self.__template}"
+                # The content up to the last new line char is not going to be modified anymore if it does not
+                # contain the searched tags, so it is moved into a content chunk instead of copying it.
+                nl_pos = self.__content.rfind("\n")
+                if nl_pos > 0:
+                    if not self.__content_chunks:
+                        self.__content_chunks = []
+                    self.__content_chunks.append(self.__content[: nl_pos])
+                    chunk_tags = _get_content_tags(self.__content_chunks[-1], self.config)
+                    if chunk_tags:
+                        self.__chunk_tags = self.__chunk_tags.union(chunk_tags)
+                    self.__content = self.__content[nl_pos:]
+                self.__content = f"{self.__content}{self.__template}"
                 self.__clone_flag = False
             if not passive:
                 if not force:
@@ -498,7 +870,9 @@ class Block:
                     self.config.tags.block_end.str_name(subblock_name))
                 if subblk_start >= 0 and subblk_end >= 0:
                     # If subblock tags are found, then create a new subblock and set correct parent-subblock relations.
-                    subblk = Block(self.content[subblk_start: subblk_end], subblock_name, self.config, self)
+                    # The subblock template is set directly, because the subblock content is never a file path.
+                    subblk = Block(block_name=subblock_name, config=self.config, parent=self)
+                    subblk.template = self.__content[subblk_start: subblk_end]
             ret_blk.append(subblk)
         if ret_blk:
             if len(ret_blk) == 1:
@@ -594,7 +968,7 @@ class Block:
                 if blk_obj.__clone_flag:
                     blk_obj.set(variation_idx, all_subblocks, raw_content)
 
-        if self.parent and self.content != self.__template:
+        if self.parent and (self.__content_chunks or self.__content != self.__template):
             # If content has been changed from the template, then clone the parent block if
             # its cloning flag is set to true to ensure that the subblock tags can be
             # found in the parent block content and the subblock content can be set into them.
@@ -605,21 +979,22 @@ class Block:
             self.__set_first_value = True
             self.__set_char_repeat_tag()
         set_num = 0
+        blk_content = None
         while self.parent and (set_num < count or count < 0):
             # pylint: disable=protected-access
-            # rationale: Private method __get_subblock_start_end_pos is called from non-self object only here and
-            # it is easier and simpler to keep it that way instead of rewriting the method to be static and sending
-            # parent object data into it for processing.
+            # rationale: Private methods __get_subblock_start_end_pos and __replace_content are called from non-self
+            # object only here and it is easier and simpler to keep it that way instead of rewriting the methods to be
+            # static and sending parent object data into them for processing.
             (subblk_start, subblk_end) = self.parent._Block__get_subblock_start_end_pos(
                 self.parent.config.tags.block_start.str_name(self.name),
                 self.parent.config.tags.block_end.str_name(self.name),
                 True)
             if 0 <= subblk_start < subblk_end:
-                blk_content = self.__get_variation(self.content, self.name, variation_idx)
+                if blk_content is None:
+                    blk_content = self.__get_variation(self.content, self.name, variation_idx)
                 # If subblock tags are found, then set the current block content into all corresponding subblock tags
                 # in the parent block content.
-                self.parent.content = \
-                    f"{self.parent.content[: subblk_start]}{blk_content}{self.parent.content[subblk_end:]}"
+                self.parent._Block__replace_content(subblk_start, subblk_end, blk_content)
                 # Increment number of blocks being set into the parent block.
                 set_num += 1
             else:
@@ -691,8 +1066,9 @@ class Block:
             # Clone block if the cloning flag is set to true to ensure that the variable tags can be
             # found in the block content and the variable values can be set into them.
             self.clone(passive=True)
-            # Loop through variable tags and replace them with the corresponding variable values.
-            for var_idx, var_tag in enumerate(var_tags):
+            # Loop through variable tags and get the corresponding variable values for the actual iteration.
+            iter_values = []
+            for var_idx in range(len(var_tags)):
                 if isinstance(var_values[var_idx], str):
                     var_value = var_values[var_idx]
                 else:
@@ -706,7 +1082,8 @@ class Block:
                             var_value = var_values[var_idx][-1]
                     except TypeError:
                         var_value = var_values[var_idx]
-                self.content = self.content.replace(var_tag, f"{var_value}")
+                iter_values.append(f"{var_value}")
+            self.__replace_variables(var_tags, iter_values)
             iter_idx += 1
             if detected_iters_num > 1 or autoclone:
                 self.clone()
@@ -719,12 +1096,129 @@ class Block:
         Args:
             var_names (str): Arguments with variable names to be cleared.
         """
-        for var_name in var_names:
-            self.content = self.content.replace(self.config.tags.variable.str_name(var_name), "")
+        var_tags = [self.config.tags.variable.str_name(var_name) for var_name in var_names]
+        self.__replace_variables(var_tags, [""] * len(var_tags))
+
+    def __replace_variables(self, var_tags: list[str], var_values: list[str]) -> None:
+        """
+        Replaces the variable tags in the block content with the corresponding values. The tags are replaced in
+        a single scan of the content if it gives the same result as replacing the tags one after another, i.e.
+        if the values cannot be combined with the surrounding content into other variable tags being replaced.
+
+        Args:
+            var_tags (list[str]): Variable tag strings.
+            var_values (list[str]): Values of the variables in the same order as the tags.
+        """
+        content = self.__get_active_content(*var_tags)
+        if len(var_tags) > 1 and len(set(var_tags)) == len(var_tags):
+            var_regex = _get_variables_regex(tuple(var_tags), self.config)
+            if var_regex is not None and not any(var_regex.search(value) for value in var_values):
+                (begin_len, end_len) = (len(self.config.tags.variable.begin), len(self.config.tags.variable.end))
+                values = {tag[begin_len: -end_len]: value for (tag, value) in zip(var_tags, var_values)}
+                parts = var_regex.split(content)
+                parts[1::2] = map(values.__getitem__, parts[1::2])
+                new_content = "".join(parts)
+                if not var_regex.search(new_content):
+                    self.__content = new_content
+                    return
+        for (var_tag, var_value) in zip(var_tags, var_values):
+            content = content.replace(var_tag, var_value)
+        self.__content = content
+
+    def __get_active_content(self, *tags: str) -> str:
+        """
+        Returns the active part of the block content following the content chunks, in which the specified tags can
+        be searched and replaced with the same result as in the whole block content. If the tags can be found
+        also in the content chunks, then the chunks are joined into the active part of the content first.
+
+        Args:
+            tags (str): Tag strings to be searched in the block content.
+
+        Returns:
+            str: Active part of the block content.
+        """
+        if self.__content_chunks:
+            for tag in tags:
+                if tag in self.__chunk_tags or not _is_content_tag(tag, self.config):
+                    self.__join_content_chunks()
+                    break
+        return self.__content
+
+    def __join_content_chunks(self) -> None:
+        """
+        Joins the content chunks with the active part of the block content.
+        """
+        self.__content_chunks.append(self.__content)
+        self.__content = "".join(self.__content_chunks)
+        self.__content_chunks = ()
+        self.__chunk_tags = frozenset()
+
+    def __find_tag(self, tag: str) -> int:
+        """
+        Returns the position of the first occurrence of a tag string in the active part of the block content.
+        The positions are remembered for the actual content, so the repeated search for the same tag, e.g. when
+        the subblock is extracted and then set, or when it is not present in the content, takes a constant time.
+
+        Args:
+            tag (str): Tag string.
+
+        Returns:
+            int: Position of the tag or -1 if the tag is not found.
+        """
+        if "\n" in tag:
+            return self.__content.find(tag)
+        if self.__tag_pos_content is not self.__content:
+            self.__tag_pos = {}
+            self.__tag_pos_content = self.__content
+        pos = self.__tag_pos.get(tag, -2)
+        if pos < -1:
+            pos = self.__tag_pos[tag] = self.__content.find(tag, -2 - pos)
+        return pos
+
+    def __replace_content(self, start: int, end: int, new_content: str) -> None:
+        """
+        Replaces the part of the active block content with a new content and updates the remembered positions of
+        the tag strings, i.e. only the lines affected by the replacement are searched again for the tags.
+
+        Args:
+            start (int): Start position of the replaced part.
+            end (int): End position of the replaced part.
+            new_content (str): New content replacing the part.
+        """
+        content = self.__content
+        self.__content = f"{content[: start]}{new_content}{content[end:]}"
+        if self.__tag_pos_content is not content or len(self.__tag_pos) > _MAX_TAG_POS:
+            # Too many remembered tags would make the update slower than searching the tags again.
+            return
+        # Tags cannot contain the new line char, so only the tags on the lines with replaced content could change.
+        line_start = content.rfind("\n", 0, start) + 1
+        line_end = content.find("\n", end)
+        shift = len(new_content) - (end - start)
+        (line_end, new_line_end) = (len(content), len(self.__content)) if line_end < 0 else \
+            (line_end, line_end + shift)
+        tag_pos = {}
+        for (tag, pos) in self.__tag_pos.items():
+            if 0 <= pos < line_start or -2 - line_start <= pos < -1:
+                # Tag position or the position before which the tag is not present precedes the replaced lines.
+                tag_pos[tag] = pos
+                continue
+            new_pos = self.__content.find(tag, line_start, new_line_end)
+            if new_pos >= 0:
+                tag_pos[tag] = new_pos
+            elif pos == -1:
+                tag_pos[tag] = -1
+            elif pos >= line_end:
+                tag_pos[tag] = pos + shift
+            elif pos <= -2 - line_end:
+                tag_pos[tag] = pos - shift
+            else:
+                tag_pos[tag] = -2 - new_line_end
+        self.__tag_pos = tag_pos
+        self.__tag_pos_content = self.__content
 
     def __get_subblock_start_end_pos(self, start_tag: str, end_tag: str, include_tags: bool = False) -> tuple[int, int]:
         """
-        Returns start and end position of a subblock string in the block content.
+        Returns start and end position of a subblock string in the active part of the block content.
 
         Args:
             start_tag (str): Subblock start tag string.
@@ -735,31 +1229,32 @@ class Block:
         Returns:
             tuple[int, int]: Returned start and end character position of the subblock, i.e. ``(start_pos, end_pos)``.
         """
-        subblk_start = self.content.find(start_tag)
+        content = self.__get_active_content(start_tag, end_tag)
+        subblk_start = self.__find_tag(start_tag)
         if subblk_start >= 0:
             if not include_tags:
                 subblk_start += len(start_tag)
                 # Return "\n" char pos + 1 if "\n" is found, else return -1 + 1 = 0
-                next_nl = self.content.find("\n", subblk_start) + 1
-                if next_nl > 0 and not self.content[subblk_start: next_nl].strip():
+                next_nl = content.find("\n", subblk_start) + 1
+                if next_nl > 0 and not content[subblk_start: next_nl].strip():
                     subblk_start = next_nl
             else:
-                prev_nl = self.content.rfind("\n", 0, subblk_start) + 1
-                next_nl = self.content.find("\n", subblk_start)
-                if next_nl > 0 and self.content[prev_nl: next_nl].strip() == start_tag:
+                prev_nl = content.rfind("\n", 0, subblk_start) + 1
+                next_nl = content.find("\n", subblk_start)
+                if next_nl > 0 and content[prev_nl: next_nl].strip() == start_tag:
                     subblk_start = prev_nl
 
-        subblk_end = self.content.find(end_tag)
+        subblk_end = self.__find_tag(end_tag)
         if subblk_start >= 0 and subblk_end >= 0:
             if not include_tags:
-                last_nl = self.content.rfind("\n", subblk_start, subblk_end) + 1
-                if last_nl > 0 and not self.content[last_nl: subblk_end].strip():
+                last_nl = content.rfind("\n", subblk_start, subblk_end) + 1
+                if last_nl > 0 and not content[last_nl: subblk_end].strip():
                     subblk_end = last_nl
             else:
-                prev_nl = self.content.rfind("\n", 0, subblk_end)
+                prev_nl = content.rfind("\n", 0, subblk_end)
                 subblk_end += len(end_tag)
-                next_nl = self.content.find("\n", subblk_end) + 1
-                if next_nl > 0 and self.content[prev_nl: next_nl].strip() == end_tag:
+                next_nl = content.find("\n", subblk_end) + 1
+                if next_nl > 0 and content[prev_nl: next_nl].strip() == end_tag:
                     subblk_end = next_nl
 
         return (subblk_start, subblk_end)
@@ -769,16 +1264,26 @@ class Block:
         Replaces special tags representing repeated characters in the block content with the correct amount of
         repeated characters (usually spaces or tabulators) to keep predefined right-alignement.
         """
+        tag = self.config.tags.char_repeat.str
+        # Data about the char repeat tags in the template searched one after another are computed only once for
+        # each template.
+        templ_table = _get_template_char_repeat_table(self.__template, self.config)
         last_pos = 0
+        cont_pos = 0
+        self.__get_active_content(tag)
         # Loop through all *char repeat* tags in block template and replace them with the correct
         # number of repeated characters.
         while True:
-            # Get data about char repeat in the block content.
-            (cont_start, cont_end, new_col, repeat_char) = self.__get_char_repeat_data(self.content)
+            # Get data about char repeat in the block content. The content preceding the previous tag does not
+            # contain the tag, unless it is formed together with the repeated characters set in place of the tag.
+            (cont_start, cont_end, new_col, repeat_char) = self.__get_char_repeat_data(
+                self.__content, False, cont_pos)
             if cont_start >= 0:
                 # Get data about char repeat in the block template, i.e. the content before it has been filled.
-                (templ_start, templ_end, orig_col, _) = self.__get_char_repeat_data(
-                    self.__template, True, last_pos)
+                templ_data = templ_table.get(last_pos)
+                if templ_data is None:
+                    templ_data = self.__get_char_repeat_data(self.__template, True, last_pos)
+                (templ_start, templ_end, orig_col, _) = templ_data
                 orig_len = templ_end - templ_start
                 # Calculate new length of repeated characters in the filled content.
                 new_len = orig_len + (orig_col - new_col)
@@ -790,7 +1295,8 @@ class Block:
                 if new_len <= 0:
                     new_len = 1
                 # Set repeated characters into the block content instead of the *char repeat* tag.
-                self.content = f"{self.content[0: cont_start]}{new_len * repeat_char}{self.content[cont_end:]}"
+                self.__content = f"{self.__content[0: cont_start]}{new_len * repeat_char}{self.__content[cont_end:]}"
+                cont_pos = max(cont_start - len(tag) + 1, 0)
                 # Remember last *char repeat* tag position in the template, because if there are more of these tags,
                 # then we need to start searching only after the previous tag position, not again from the start.
                 last_pos = templ_end
@@ -846,27 +1352,48 @@ class Block:
                 then the standard value is used. This switch has a priority over the ``first`` switch argument.
                 Defaults to False.
         """
+        start_tag = self.config.tags.std_last_first_start.str
+        end_tag = self.config.tags.std_last_first_end.str
+        variation_tag = self.config.tags.block_variation.str_name(self.config.tags.std_last_first_start.name)
+        variation_idx = 1 if last else 2 if first else 0
+        content = self.__get_active_content(start_tag, end_tag)
+        search_pos = 0
         # Loop through all *last value* tags in block content and replace them with either standard value or last value.
         while True:
+            # The content preceding the previously replaced tag does not contain the start/end tags, unless they are
+            # formed together with the value set in place of the tag, so the search does not start from the beginning.
+            start = content.find(start_tag, search_pos)
+            end = content.find(end_tag, search_pos)
+            if start < 0 or end < 0:
+                break
             # Get the start and end position of the *last value* tag including the start/end tags.
-            (subblk_start, subblk_end) = \
-                self.__get_subblock_start_end_pos(
-                    self.config.tags.std_last_first_start.str,
-                    self.config.tags.std_last_first_end.str,
-                    True)
-            # If *last value* tag is found.
-            if 0 <= subblk_start < subblk_end:
-                # Extract the content of the *last value* tag without the start/end tags themselves.
-                (subblk_cont_start, subblk_cont_end) = \
-                    self.__get_subblock_start_end_pos(
-                        self.config.tags.std_last_first_start.str,
-                        self.config.tags.std_last_first_end.str)
-                value_content = self.content[subblk_cont_start: subblk_cont_end]
-                value_content = self.__get_variation(
-                    value_content, self.config.tags.std_last_first_start.name, 1 if last else 2 if first else 0)
-                self.content = f"{self.content[: subblk_start]}{value_content}{self.content[subblk_end:]}"
-            else:
+            subblk_start = start
+            prev_nl = content.rfind("\n", 0, start) + 1
+            next_nl = content.find("\n", start)
+            if next_nl > 0 and content[prev_nl: next_nl].strip() == start_tag:
+                subblk_start = prev_nl
+            prev_nl = content.rfind("\n", 0, end)
+            subblk_end = end + len(end_tag)
+            next_nl = content.find("\n", subblk_end) + 1
+            if next_nl > 0 and content[prev_nl: next_nl].strip() == end_tag:
+                subblk_end = next_nl
+            if subblk_start >= subblk_end:
                 break
+            # Get the content of the *last value* tag without the start/end tags themselves.
+            subblk_cont_start = start + len(start_tag)
+            next_nl = content.find("\n", subblk_cont_start) + 1
+            if next_nl > 0 and not content[subblk_cont_start: next_nl].strip():
+                subblk_cont_start = next_nl
+            subblk_cont_end = end
+            last_nl = content.rfind("\n", subblk_cont_start, end) + 1
+            if last_nl > 0 and not content[last_nl: end].strip():
+                subblk_cont_end = last_nl
+            # The values are split only once for each distinct content of the *last value* tag.
+            values = _get_variations(content[subblk_cont_start: subblk_cont_end], variation_tag)
+            value_content = values[variation_idx] if variation_idx < len(values) else values[0]
+            self.__replace_content(subblk_start, subblk_end, value_content)
+            content = self.__content
+            search_pos = max(subblk_start - max(len(start_tag), len(end_tag)) + 1, 0)
 
     def __get_variation(self, content: str, block_name: str, variation_idx: int) -> str:
         """
@@ -882,19 +1409,3913 @@ class Block:
             str: Block content string variation corresponding to the specified variation index.
         """
         var = content
-        if self.config.tags.block_variation.str_name(block_name) in content:
-            var_list = content.split(self.config.tags.block_variation.str_name(block_name))
+        variation_tag = self.config.tags.block_variation.str_name(block_name)
+        if variation_tag in content:
+            if content == self.__template:
+                # The variations of the unchanged template are split only once for each template.
+                var_list = _get_variations(content, variation_tag)
+                return var_list[variation_idx] if variation_idx < len(var_list) else var_list[0]
+            # Only the variations up to the selected one are split from the filled content.
+            var_list = content.split(variation_tag, variation_idx + 1)
             if variation_idx < len(var_list):
                 var = var_list[variation_idx]
             else:
                 var = var_list[0]
-            # Remove initial empty space up to the first new line char "\n", including the "\n" if present.
-            first_nl = var.find("\n") + 1
-            if first_nl > 0 and var[: first_nl].strip() == "":
-                var = var[first_nl:]
-            # Remove trailing empty space after the final new line char "\n", not including the final "\n" if present).
-            last_nl = var.rfind("\n") + 1
-            if last_nl > 0 and var[last_nl:].strip() == "":
-                var = var[0: last_nl]
+            var = _trim_variation(var)
 
         return var
+
+
+# Types of values set directly into the template variables.
+_SIMPLE_TYPES = (str, int, float, bool)
+# Binary data types, which are collections of bytes, but not the lists of block clones.
+_BINARY_TYPES = (bytes, bytearray, memoryview)
+# Marker of a missing value in the data scopes, because None is a valid data value.
+_MISSING = object()
+# Maximum number of tag strings with different names remembered by a tag.
+_MAX_TAG_NAMES = 4096
+# Maximum number of tag positions updated after the block content is changed.
+_MAX_TAG_POS = 32
+# Number of output chunks collected by the streaming render before the finished lines are written to the output.
+_STREAM_CHUNKS = 1024
+
+
+def _is_template_file(template: str | Path) -> bool:
+    """
+    Checks if the template is a path to an existing template file. Strings containing a new line char are
+    considered to be template strings without checking the file system and strings that cannot be a valid path,
+    e.g. too long strings, are not considered to be files.
+
+    Args:
+        template (str | Path): Template string or path to the template file.
+
+    Returns:
+        bool: True if the template is a path to an existing file.
+    """
+    if isinstance(template, str) and "\n" in template:
+        return False
+    try:
+        return Path(template).is_file()
+    except (OSError, ValueError):
+        return False
+
+
+@lru_cache(maxsize=None)
+def _get_tag_patterns(config: BlockConfig) -> tuple[tuple[str, str, re.Pattern], ...]:
+    """
+    Returns the begin and end strings of all tag types defined in the block configuration together with
+    the regular expression matching all tag strings in a text starting with the begin string and ending with
+    the nearest end string.
+
+    Args:
+        config (BlockConfig): Block configuration.
+
+    Returns:
+        tuple[tuple[str, str, re.Pattern], ...]: Tuples in form of ``(begin, end, pattern)``.
+    """
+    tags = config.tags
+    pairs = dict.fromkeys((tag.begin, tag.end) for tag in (
+        tags.variable, tags.block_start, tags.block_end, tags.block_variation, tags.char_repeat,
+        tags.std_last_first_start, tags.std_last_first_end))
+    # The lookahead is used to find also the overlapping tag strings.
+    return tuple((begin, end, re.compile(f"(?=({re.escape(begin)}[^\n]*?{re.escape(end)}))")) for (begin, end) in pairs)
+
+
+@lru_cache(maxsize=256)
+def _get_variables_regex(var_tags: tuple[str, ...], config: BlockConfig) -> re.Pattern | None:
+    """
+    Returns the regular expression matching any of the variable tags, which can be used for replacing all tags
+    in a single scan of the content.
+
+    Args:
+        var_tags (tuple[str, ...]): Variable tag strings.
+        config (BlockConfig): Block configuration.
+
+    Returns:
+        re.Pattern | None: Regular expression or ``None`` if the tag names contain the first char of the tag begin
+            string or the last char of the tag end string, i.e. the tags could overlap each other.
+    """
+    (begin, end) = (config.tags.variable.begin, config.tags.variable.end)
+    if not begin or not end or any(
+            begin[:1] in tag[len(begin):] or end[-1:] in tag[: -len(end)] for tag in var_tags):
+        return None
+    names = "|".join(re.escape(tag[len(begin): -len(end)]) for tag in var_tags)
+    return re.compile(f"{re.escape(begin)}({names}){re.escape(end)}")
+
+
+def _get_content_tags(content: str, config: BlockConfig) -> set[str]:
+    """
+    Returns all tag strings that can be found in the content.
+
+    Args:
+        content (str): Block content.
+        config (BlockConfig): Block configuration.
+
+    Returns:
+        set[str]: Tag strings found in the content.
+    """
+    content_tags = set()
+    for (_, _, pattern) in _get_tag_patterns(config):
+        content_tags.update(pattern.findall(content))
+    return content_tags
+
+
+@lru_cache(maxsize=4096)
+def _is_content_tag(tag: str, config: BlockConfig) -> bool:
+    """
+    Checks that the tag string is always found by the :func:`_get_content_tags` function if it is present
+    in the content.
+
+    Args:
+        tag (str): Tag string.
+        config (BlockConfig): Block configuration.
+
+    Returns:
+        bool: True if the tag can be found, False otherwise.
+    """
+    return "\n" not in tag and any(
+        tag.startswith(begin) and tag.find(end, len(begin)) == len(tag) - len(end) > 0
+        for (begin, end, _) in _get_tag_patterns(config))
+
+
+@lru_cache(maxsize=1024)
+def _get_data_accessor(data_type: type) -> Callable[[object], Mapping] | None:
+    """
+    Returns a function providing the attribute-value pairs of the block data of a specified type in form of
+    a mapping, i.e. the mapping itself, the instance dictionary of an object, the fields of a named tuple or
+    the attributes stored in the slots of an object. The attributes are provided in the order of their
+    definition, which is also the order of filling them into the template.
+
+    Args:
+        data_type (type): Type of the block data.
+
+    Returns:
+        Callable[[object], Mapping] | None: Function returning the attribute-value mapping of the block data or
+            None if the data of the type are not filled into the template blocks as a single instance, i.e.
+            ``None``, simple values, lists, tuples, other collections and iterators.
+    """
+    if issubclass(data_type, Mapping):
+        return lambda block_data: block_data
+    if issubclass(data_type, tuple) and hasattr(data_type, "_fields"):
+        fields = data_type._fields
+        return lambda block_data: dict(zip(fields, block_data))
+    if data_type is type(None) or issubclass(data_type, (Collection, Iterator, AsyncIterable, *_SIMPLE_TYPES)):
+        return None
+    slot_names = []
+    # Objects have the instance dictionary unless all classes except the base object class define the slots.
+    has_dict = False
+    for cls in reversed(data_type.__mro__):
+        slots = cls.__dict__.get("__slots__", ())
+        has_dict = has_dict or (cls is not object and "__slots__" not in cls.__dict__)
+        for name in ((slots,) if isinstance(slots, str) else slots):
+            if name.startswith("__") and not name.endswith("__"):
+                # Private attribute names stored in the slots are mangled the same way as in the instance dictionary.
+                slot_names.append(f"_{cls.__name__.lstrip('_')}{name}")
+            elif name == "__dict__":
+                has_dict = True
+            elif name != "__weakref__":
+                slot_names.append(name)
+    if not slot_names and has_dict:
+        return lambda block_data: block_data.__dict__
+
+    def get_slots(block_data: object) -> dict:
+        data_dict = {}
+        for name in slot_names:
+            value = getattr(block_data, name, _MISSING)
+            if value is not _MISSING:
+                data_dict[name] = value
+        data_dict.update(getattr(block_data, "__dict__", {}))
+        return data_dict
+    return get_slots
+
+
+def _get_data_dict(block_data: object | Mapping) -> Mapping | None:
+    """
+    Returns the attribute-value pairs of the block data in form of a mapping.
+
+    Args:
+        block_data (object | Mapping): Mapping, object, dataclass, named tuple or an object with slots.
+
+    Returns:
+        Mapping | None: Attribute-value mapping of the block data or None if the data are not filled into the
+            template blocks as a single instance.
+    """
+    if block_data.__class__ is dict:
+        return block_data
+    accessor = _get_data_accessor(block_data.__class__)
+    return None if accessor is None else accessor(block_data)
+
+
+@lru_cache(maxsize=1024)
+def _is_list_type(data_type: type) -> bool:
+    """
+    Checks that the block data of a specified type are a list of the block clones, i.e. a list, a tuple, another
+    collection, an iterator, e.g. a generator, or an asynchronous iterable, but not a mapping, a string, binary
+    data or a named tuple.
+
+    Args:
+        data_type (type): Type of the block data.
+
+    Returns:
+        bool: True if the data of the type are a list of the block clones, False otherwise.
+    """
+    return issubclass(data_type, (Collection, Iterator, AsyncIterable)) and \
+        not issubclass(data_type, (*_SIMPLE_TYPES, *_BINARY_TYPES)) and _get_data_accessor(data_type) is None
+
+
+def _is_data_list(value: object) -> bool:
+    """
+    Checks that the block data value is a list of the block clones (see the :func:`_is_list_type` function).
+
+    Args:
+        value (object): Block data value.
+
+    Returns:
+        bool: True if the value is a list of the block clones, False otherwise.
+    """
+    return value.__class__ is list or _is_list_type(value.__class__)
+
+
+def _get_data_snapshot(value: object) -> object:
+    """
+    Returns a snapshot of the block data value that is equal to the snapshot of another value only if both values
+    are filled into the template the same way, i.e. the objects are converted to dictionaries, the lists of block
+    clones to tuples and the simple values are paired with their types.
+
+    Args:
+        value (object): Block data value.
+
+    Returns:
+        object: Snapshot of the value not affected by later modifications of the value.
+
+    Raises:
+        TypeError: If the value contains an iterator or an asynchronous iterable that cannot be read without
+            consuming it or an object that cannot be copied.
+    """
+    if isinstance(value, _SIMPLE_TYPES):
+        return (value.__class__, value)
+    if _is_data_list(value):
+        if not isinstance(value, Collection):
+            raise TypeError("Iterator cannot be stored in a data snapshot.")
+        return tuple(_get_data_snapshot(item) for item in value)
+    data_dict = None if value is None else _get_data_dict(value)
+    if data_dict is None:
+        return copy.deepcopy(value)
+    return {attrib: _get_data_snapshot(val) for (attrib, val) in data_dict.items()}
+
+
+# Event loop of the asynchronous filling running in the current thread, i.e. the loop awaiting the asynchronous
+# data sources, fill handlers and writers.
+_async_context = threading.local()
+# Flag indicating that the code runs in the event loop on behalf of a worker thread of the asynchronous filling,
+# e.g. in a coroutine fill handler.
+_async_nested: contextvars.ContextVar[bool] = contextvars.ContextVar("_async_nested", default=False)
+# Maximum number of worker threads filling the blocks and templates by the asynchronous methods.
+_ASYNC_WORKERS = 64
+# Executor of the worker threads of the asynchronous filling created when it is used for the first time.
+_async_executor: ThreadPoolExecutor | None = None
+_async_executor_lock = threading.Lock()
+
+
+async def _await(awaitable: object) -> object:
+    """
+    Awaits an awaitable object, e.g. a future, that cannot be scheduled in an event loop directly, on behalf of
+    a worker thread of the asynchronous filling.
+
+    Args:
+        awaitable (object): Awaitable object.
+
+    Returns:
+        object: Result of the awaitable object.
+    """
+    _async_nested.set(True)
+    return await awaitable
+
+
+def _wait_async(result: object) -> object:
+    """
+    Returns the result of a fill handler, a data source or a writer. If the result is awaitable, then it is awaited
+    in the event loop of the asynchronous filling running the current thread and its result is returned.
+
+    Args:
+        result (object): Result that can be awaitable.
+
+    Raises:
+        RuntimeError: If the result is awaitable, but the filling is not asynchronous.
+
+    Returns:
+        object: Result or the awaited result.
+    """
+    if not inspect.isawaitable(result):
+        return result
+    loop = getattr(_async_context, "loop", None)
+    if loop is None:
+        if inspect.iscoroutine(result):
+            result.close()
+        raise RuntimeError("Asynchronous data and fill handlers can be filled only by the asynchronous methods, "
+                           "e.g. Block.fill_async().")
+    return asyncio.run_coroutine_threadsafe(_await(result), loop).result()
+
+
+def _iter_items(items: Iterable | AsyncIterable) -> Iterable:
+    """
+    Returns the items of a list of the block clones. The items of an asynchronous iterable are awaited one by one
+    in the event loop of the asynchronous filling.
+
+    Args:
+        items (Iterable | AsyncIterable): List of the block clones.
+
+    Returns:
+        Iterable: List items.
+    """
+    return items if isinstance(items, Iterable) else _iter_async_items(items)
+
+
+def _iter_async_items(items: AsyncIterable) -> Iterator:
+    """
+    Returns the items of an asynchronous iterable awaited in the event loop of the asynchronous filling.
+
+    Args:
+        items (AsyncIterable): Asynchronous iterable.
+
+    Yields:
+        Iterator: Awaited items.
+    """
+    iterator = items.__aiter__()
+    while True:
+        try:
+            yield _wait_async(iterator.__anext__())
+        except StopAsyncIteration:
+            return
+
+
+def _get_async_executor() -> ThreadPoolExecutor:
+    """
+    Returns the executor of the worker threads of the asynchronous filling shared by all event loops.
+
+    Returns:
+        ThreadPoolExecutor: Executor with at most ``_ASYNC_WORKERS`` threads.
+    """
+    # pylint: disable=global-statement
+    # rationale: The worker threads are shared by all asynchronous fillings in the process.
+    global _async_executor
+    with _async_executor_lock:
+        if _async_executor is None:
+            _async_executor = ThreadPoolExecutor(_ASYNC_WORKERS, thread_name_prefix="blocky-async")
+        return _async_executor
+
+
+async def _run_async(function: Callable, *args: object) -> object:
+    """
+    Runs a synchronous filling function in a worker thread, so the event loop awaiting the asynchronous data,
+    fill handlers and writers used by the function is not blocked. The worker threads are not shared with
+    the default executor of the event loop. A filling started from a coroutine awaited on behalf of another
+    worker thread, e.g. from a fill handler, runs in its own thread, because all worker threads could be waiting
+    for the nested fillings.
+
+    Args:
+        function (Callable): Filling function.
+        args (object): Function arguments.
+
+    Returns:
+        object: Result of the function.
+    """
+    loop = asyncio.get_running_loop()
+
+    def run() -> object:
+        _async_context.loop = loop
+        try:
+            return function(*args)
+        finally:
+            _async_context.loop = None
+    if not _async_nested.get():
+        return await loop.run_in_executor(_get_async_executor(), run)
+    executor = ThreadPoolExecutor(1, thread_name_prefix="blocky-async-nested")
+    try:
+        return await loop.run_in_executor(executor, run)
+    finally:
+        executor.shutdown(wait=False)
+
+
+class _AsyncWriter:
+    """
+    Writer passing the written content to a synchronous or an asynchronous writer from the worker thread of
+    the asynchronous filling, e.g. to an ``asyncio.StreamWriter``.
+    """
+    def __init__(self, output: object) -> None:
+        """
+        Constructor.
+
+        Args:
+            output (object): Object with the ``write`` method returning None or an awaitable and with the optional
+                ``drain`` method waiting until the written content is sent.
+        """
+        self.output = output
+
+    def write(self, content: str) -> None:
+        """
+        Writes the content into the output and awaits the writing and draining of the content.
+
+        Args:
+            content (str): Content to be written.
+        """
+        _wait_async(self.output.write(content))
+        drain = getattr(self.output, "drain", None)
+        if drain is not None:
+            _wait_async(drain())
+
+
+class _FillPlan(NamedTuple):
+    """
+    Steps of filling the attributes of block data into a :class:`Block` by the textual filling. Each step is
+    defined by a tuple ``(index, tag_name, block_start_tag)`` with the index of the attribute value.
+    """
+    lists: tuple[tuple[int, str, str], ...]
+    blocks: tuple[tuple[int, str, str], ...]
+    # The tag name is None for the ``vari_idx`` attribute.
+    variables: tuple[tuple[int, str | None, str], ...]
+
+
+@lru_cache(maxsize=256)
+def _get_fill_plan(attribs: tuple[str, ...], value_types: tuple[type, ...], config: BlockConfig) -> _FillPlan:
+    """
+    Returns the steps of filling the block data attributes into a block, i.e. the lists filled into the cloned
+    blocks first, then the other objects filled into the single instance blocks and simple values at the end.
+
+    Args:
+        attribs (tuple[str, ...]): Attribute names of the block data.
+        value_types (tuple[type, ...]): Types of the attribute values.
+        config (BlockConfig): Block configuration.
+
+    Returns:
+        _FillPlan: Steps of filling the block data.
+    """
+    steps = ([], [], [])
+    for (idx, (attrib, value_type)) in enumerate(zip(attribs, value_types)):
+        name = attrib.upper()
+        start_tag = config.tags.block_start.str_name(name)
+        if _is_list_type(value_type):
+            steps[0].append((idx, name, start_tag))
+        elif issubclass(value_type, _SIMPLE_TYPES):
+            steps[2].append((idx, None if attrib == "vari_idx" else name, start_tag))
+        elif attrib != "fill_hndl":
+            steps[1].append((idx, name, start_tag))
+    return _FillPlan(*map(tuple, steps))
+
+
+def _get_data_scope(block_data: object | dict) -> tuple[dict, int | bool, Callable | None]:
+    """
+    Returns the data scope used for rendering a :class:`CompiledTemplate`, i.e. a dictionary with upper-case
+    tag names as keys and data values as values, together with the special ``vari_idx`` and ``fill_hndl`` values.
+
+    Args:
+        block_data (object | dict): Object or dictionary with the data to be filled into a template block.
+
+    Returns:
+        tuple[dict, int | bool, Callable | None]: Data scope in form of a following tuple:
+            ``(scope, vari_idx, fill_hndl)``.
+    """
+    scope = {}
+    vari_idx = 0
+    fill_hndl = None
+    # Values that are not dictionaries or objects are not filled into the template, i.e., the scope is empty.
+    data_dict = _get_data_dict(block_data)
+    if data_dict is None:
+        return (scope, vari_idx, fill_hndl)
+    scope = dict(zip(map(str.upper, data_dict), data_dict.values()))
+    if len(scope) == len(data_dict):
+        # Attributes have unique tag names, i.e. only the special attributes need to be removed from the scope.
+        if "FILL_HNDL" in scope and "fill_hndl" in data_dict:
+            fill_hndl = scope.pop("FILL_HNDL")
+        if "VARI_IDX" in scope and isinstance(data_dict.get("vari_idx"), _SIMPLE_TYPES):
+            vari_idx = scope.pop("VARI_IDX")
+        return (scope, vari_idx, fill_hndl)
+    scope = {}
+    for (attrib, value) in data_dict.items():
+        if attrib == "fill_hndl":
+            fill_hndl = value
+        elif attrib == "vari_idx" and isinstance(value, _SIMPLE_TYPES):
+            vari_idx = value
+        else:
+            # The first attribute with a specific tag name is used, same as in the textual filling.
+            scope.setdefault(attrib.upper(), value)
+    return (scope, vari_idx, fill_hndl)
+
+
+def _find_block_span(text: str, start_tag: str, end_tag: str, start_pos: int, ctx_start: int, ctx_end: int) \
+        -> tuple[int, int, int, int] | None:
+    """
+    Returns the positions of a block defined by the start and end tags in the text using the same rules as the
+    :class:`Block` methods, i.e. the lines containing only the block tags are included in the block span and the
+    empty lines after the start tag and before the end tag are excluded from the block content.
+
+    Args:
+        text (str): Text containing the block.
+        start_tag (str): Block start tag string.
+        end_tag (str): Block end tag string.
+        start_pos (int): Position of the block start tag in the text.
+        ctx_start (int): Start position of the block content in which the block is searched, i.e., the text
+            before this position is not taken into account.
+        ctx_end (int): End position of the block content in which the block is searched.
+
+    Returns:
+        tuple[int, int, int, int] | None: Block positions in form of a following tuple:
+            ``(span_start, content_start, content_end, span_end)`` or ``None`` if the end tag is not found.
+    """
+    end_pos = text.find(end_tag, start_pos + len(start_tag), ctx_end)
+    if end_pos < 0:
+        return None
+
+    span_start = start_pos
+    prev_nl = text.rfind("\n", ctx_start, start_pos) + 1
+    next_nl = text.find("\n", start_pos, ctx_end)
+    if next_nl >= 0 and text[max(prev_nl, ctx_start): next_nl].strip() == start_tag:
+        span_start = max(prev_nl, ctx_start)
+
+    cont_start = start_pos + len(start_tag)
+    next_nl = text.find("\n", cont_start, ctx_end) + 1
+    if next_nl > 0 and not text[cont_start: next_nl].strip():
+        cont_start = next_nl
+
+    cont_end = end_pos
+    last_nl = text.rfind("\n", cont_start, end_pos) + 1
+    if last_nl > 0 and not text[last_nl: end_pos].strip():
+        cont_end = last_nl
+
+    prev_nl = text.rfind("\n", ctx_start, end_pos)
+    span_end = end_pos + len(end_tag)
+    next_nl = text.find("\n", span_end, ctx_end) + 1
+    if prev_nl >= 0 and next_nl > 0 and text[prev_nl: next_nl].strip() == end_tag:
+        span_end = next_nl
+
+    return (span_start, cont_start, cont_end, span_end)
+
+
+def _trim_variation(content: str) -> str:
+    """
+    Removes the initial empty space up to the first new line char and the trailing empty space after
+    the final new line char from the content of a block variation.
+
+    Args:
+        content (str): Block variation content.
+
+    Returns:
+        str: Trimmed block variation content.
+    """
+    # Remove initial empty space up to the first new line char "\n", including the "\n" if present.
+    first_nl = content.find("\n") + 1
+    if first_nl > 0 and content[: first_nl].strip() == "":
+        content = content[first_nl:]
+    # Remove trailing empty space after the final new line char "\n", not including the final "\n" if present).
+    last_nl = content.rfind("\n") + 1
+    if last_nl > 0 and content[last_nl:].strip() == "":
+        content = content[0: last_nl]
+    return content
+
+
+@lru_cache(maxsize=1024)
+def _get_variations(content: str, variation_tag: str) -> tuple[str, ...]:
+    """
+    Returns the trimmed variations of a content split by the *block variation* tags in the same form as selected
+    by the :class:`Block`, e.g. for the variations of a block template or the values of a *std last first* tag.
+
+    Args:
+        content (str): Content with the variations.
+        variation_tag (str): *Block variation* tag string separating the variations.
+
+    Returns:
+        tuple[str, ...]: Tuple of the variations. The untrimmed content is the only variation if the content does
+            not contain the variation tag.
+    """
+    if variation_tag not in content:
+        return (content,)
+    return tuple(_trim_variation(var) for var in content.split(variation_tag))
+
+
+def _get_char_repeat_table(template: str, config: BlockConfig) -> list[tuple[int, int]]:
+    """
+    Returns the original column positions and lengths of all *char repeat* tags (including the repeated
+    characters) in the template in the same form as used by the :class:`Block` for the right-alignment.
+
+    Args:
+        template (str): Block template.
+        config (BlockConfig): Block configuration.
+
+    Returns:
+        list[tuple[int, int]]: List of ``(column_pos, length)`` tuples of the *char repeat* tags.
+    """
+    table = []
+    tag = config.tags.char_repeat.str
+    expanded = template.expandtabs(config.tab_size)
+    pos = 0
+    while True:
+        start_pos = expanded.find(tag, pos)
+        end_pos = start_pos + len(tag)
+        if start_pos < 0 or end_pos >= len(expanded):
+            break
+        repeat_char = expanded[end_pos]
+        while end_pos < len(expanded) and expanded[end_pos] == repeat_char:
+            end_pos += 1
+        line_start_pos = expanded.rfind("\n", 0, start_pos) + 1
+        table.append((start_pos - line_start_pos, end_pos - start_pos))
+        pos = end_pos
+    return table
+
+
+@lru_cache(maxsize=256)
+def _get_template_char_repeat_table(template: str, config: BlockConfig) -> dict[int, tuple[int, int, int, str]]:
+    """
+    Returns the data about the *char repeat* tags in the template searched one after another from the start of
+    the template with the tabulators expanded, i.e. the original column positions, lengths and the repeated
+    characters of the tags used by the :class:`Block` for the right-alignment.
+
+    Args:
+        template (str): Block template.
+        config (BlockConfig): Block configuration.
+
+    Returns:
+        dict[int, tuple[int, int, int, str]]: Dictionary with the search start positions as keys and the
+            ``(start_pos, end_pos, column_pos, repeated_char)`` tuples of the tags found from them as values. The
+            search of each tag starts at the end position of the previous tag.
+    """
+    table = {}
+    tag = config.tags.char_repeat.str
+    expanded = template.expandtabs(config.tab_size)
+    start_index = 0
+    while start_index not in table:
+        start_pos = expanded.find(tag, start_index)
+        end_pos = start_pos + len(tag)
+        (tag_col_pos, repeat_char) = (-1, None)
+        if start_pos >= 0:
+            repeat_char = expanded[end_pos: end_pos + 1]
+            while end_pos < len(expanded) and expanded[end_pos] == repeat_char:
+                end_pos += 1
+            if end_pos >= len(expanded):
+                # The tag or repeated chars at the end of the template are left to be handled by the block.
+                break
+            tag_col_pos = start_pos - expanded.rfind("\n", 0, start_pos) - 1
+        else:
+            end_pos = -1
+        table[start_index] = (start_pos, end_pos, tag_col_pos, repeat_char)
+        start_index = end_pos
+    return table
+
+
+def _ends_line(chunks: list[str]) -> bool:
+    """
+    Checks that the content formed by the chunks ends with a new line char.
+
+    Args:
+        chunks (list[str]): Content chunks.
+
+    Returns:
+        bool: ``True`` if the last non-empty chunk ends with a new line char.
+    """
+    return next((chunk for chunk in reversed(chunks) if chunk), "").endswith("\n")
+
+
+def _indent(lines: list[str], level: int) -> list[str]:
+    """
+    Indents the lines of the generated source code.
+
+    Args:
+        lines (list[str]): Source code lines.
+        level (int): Indentation level.
+
+    Returns:
+        list[str]: Indented source code lines.
+    """
+    return [f"{'    ' * level}{line}" for line in lines]
+
+
+def _get_line_state(parts: Iterable["str | TemplateNode"], backward: bool, static_blocks: bool = False) \
+        -> bool | None:
+    """
+    Returns the state of the part of a line next to a block tag that cannot be changed by filling the template.
+    The template nodes between the tag and the non-whitespace char of the static text are marked as single-line
+    nodes, which must not be rendered with a new line char.
+
+    Args:
+        parts (Iterable[str | TemplateNode]): Static strings and template nodes following the tag in the direction
+            of the search.
+        backward (bool): Flag indicating that the line is searched backward from the tag.
+        static_blocks (bool, optional): Flag indicating that the block and *char repeat* nodes are not filled
+            before the block position is determined, i.e. their raw template strings are used as a static text.
+            Defaults to False.
+
+    Returns:
+        bool | None: True if the line part contains a non-whitespace char of the static text, False if the line
+            part contains only a static empty space, None if the line part could be changed by filling the template.
+    """
+    line_nodes = []
+    for part in parts:
+        if isinstance(part, TemplateNode):
+            if not isinstance(part, (TextNode, VariationNode)) and \
+                    not (static_blocks and isinstance(part, (BlockNode, CharRepeatNode))):
+                if "\n" in part.raw:
+                    return None
+                line_nodes.append(part)
+                continue
+            part = part.raw
+        for char in (reversed(part) if backward else part):
+            if char == "\n":
+                return None if line_nodes else False
+            if not char.isspace():
+                for node in line_nodes:
+                    node.single_line = True
+                return True
+    return None if line_nodes else False
+
+
+class _InexactRenderError(Exception):
+    """
+    Exception raised when the rendering of a :class:`CompiledTemplate` could produce a different content than
+    the textual filling of a :class:`Block`, e.g. when the block data of the later list items would be filled into
+    the tags remaining unset in the previous list items. The textual filling is used instead in such a case.
+    """
+
+
+class _ListScope:
+    """
+    Data of a list being rendered shared by the data scopes of all list items.
+    """
+    def __init__(self, items: list | tuple, offset: int = 0) -> None:
+        """
+        Constructor.
+
+        Args:
+            items (list | tuple): List items.
+            offset (int, optional): Index of the first item in the whole list if the items are only a shard of the
+                list rendered separately. Defaults to 0.
+        """
+        self.items = items
+        self.offset = offset
+        # Tag names which were checked to be missing in the following list items.
+        self.checked_names: set[str] = set()
+        self.__last_idx: dict[str, int] | None = None
+
+    def get_last_idx(self, name: str) -> int:
+        """
+        Returns the index of the last list item having an attribute with the specified tag name.
+
+        Args:
+            name (str): Tag name.
+
+        Returns:
+            int: Index of the last list item with the attribute or -1 if there is no such item.
+        """
+        self.checked_names.add(name)
+        return self.get_last_indexes().get(name, -1)
+
+    def get_last_indexes(self) -> dict[str, int]:
+        """
+        Returns the indexes of the last list items having the attributes with the tag names used as keys.
+
+        Returns:
+            dict[str, int]: Tag names and the indexes of the last list items with the corresponding attribute.
+        """
+        if self.__last_idx is None:
+            self.__last_idx = {}
+            for (idx, item) in enumerate(self.items, self.offset):
+                for attrib in _get_data_dict(item) or ():
+                    self.__last_idx[attrib.upper()] = idx
+        return self.__last_idx
+
+
+class _ScopeInfo:
+    """
+    Information about a data scope needed for checking that the rendering produces the same content as the
+    textual filling, i.e. that the block data are filled in the same order.
+    """
+    # pylint: disable=too-few-public-methods
+    # rationale: The scope information only holds the data scope together with its lazily evaluated
+    # filling order.
+    def __init__(self, scope: dict, path_name: str = "", list_scope: _ListScope | None = None,
+                 item_idx: int = -1) -> None:
+        """
+        Constructor.
+
+        Args:
+            scope (dict): Data scope.
+            path_name (str, optional): Name of the block attribute in the parent scope leading to this scope.
+                Defaults to "".
+            list_scope (_ListScope | None, optional): List containing the data of this scope if the scope
+                represents a list item. Defaults to None.
+            item_idx (int, optional): Index of the list item. Defaults to -1.
+        """
+        self.scope = scope
+        self.path_name = path_name
+        self.list_scope = list_scope
+        self.item_idx = item_idx
+        self.__ranks: dict[str, tuple[int, int]] | None = None
+
+    def get_rank(self, name: str) -> tuple[int, int]:
+        """
+        Returns the order in which the attribute with the specified tag name is filled by the textual filling,
+        i.e. lists first, then other objects and simple values at the end.
+
+        Args:
+            name (str): Tag name.
+
+        Returns:
+            tuple[int, int]: Filling order of the attribute in form of a tuple ``(step, index)``.
+        """
+        if self.__ranks is None:
+            self.__ranks = {}
+            for (idx, (attrib, value)) in enumerate(self.scope.items()):
+                step = 0 if _is_data_list(value) else 2 if isinstance(value, _SIMPLE_TYPES) else 1
+                self.__ranks[attrib] = (step, idx)
+        return self.__ranks[name]
+
+
+class _RenderFrame:
+    """
+    State of a block being rendered from the :class:`CompiledTemplate` needed for setting the values of special
+    tags, i.e. the same state that is kept in the content of a :class:`Block` by the textual filling.
+    """
+    # pylint: disable=too-few-public-methods, too-many-instance-attributes
+    # rationale: The frame is a plain data holder mirroring the state kept in the block content by the
+    # textual filling.
+    def __init__(self, owner: "BlockNode | None", context: "BlockNode | None", std_last_first_idx: int,
+                 start: int, min_scope: int) -> None:
+        """
+        Constructor.
+
+        Args:
+            owner (BlockNode | None): Block node being rendered, i.e. the block setting the special tags in its
+                content. If ``None``, then the special tags are left unprocessed.
+            context (BlockNode | None): Block node in which content the subblocks are searched by the textual
+                filling. ``None`` represents the top-level block.
+            std_last_first_idx (int): Index of the *std last first* variation, i.e. 0 = standard, 1 = last,
+                2 = first. If negative, then the *std last first* tags are left unprocessed.
+            start (int): Index of the first output chunk belonging to the block.
+            min_scope (int): Index of the first data scope filled together with the block content, i.e. the values
+                from the outer data scopes are filled at a different time by the textual filling.
+        """
+        self.owner = owner
+        self.context = context
+        self.repeat_table = owner.repeat_table if owner else None
+        self.repeat_num = 0
+        self.std_last_first_idx = std_last_first_idx
+        self.start = start
+        self.min_scope = min_scope
+        # Flag indicating that the first line of the block content is joined with the last line of the previous
+        # block clone, i.e. the block content does not start at the line start.
+        self.joined = False
+
+
+class _TemplateRenderer:
+    """
+    Renderer walking the nodes of a :class:`CompiledTemplate` and collecting the output chunks.
+    """
+    # pylint: disable=too-many-instance-attributes
+    # rationale: The whole rendering state is kept in the renderer to be shared by all nodes of the tree.
+    def __init__(self, config: BlockConfig, scope: dict, tag_regex: re.Pattern,
+                 output: TextIO | None = None) -> None:
+        """
+        Constructor.
+
+        Args:
+            config (BlockConfig): Block configuration.
+            scope (dict): Data scope of the top-level block.
+            tag_regex (re.Pattern): Regular expression matching the template tags.
+            output (TextIO | None, optional): Output into which the finished lines are written during the rendering.
+                If ``None``, then all output chunks are kept until the end of rendering. Defaults to None.
+        """
+        self.config = config
+        self.tag_regex = tag_regex
+        self.out: list[str] = []
+        self.output = output
+        # Number of output chunks already written into the output and removed from the output chunks, i.e.
+        # the chunk indexes stored in the frames and outer values are offset by this number.
+        self.offset = 0
+        # Length and CRC of the content already written into the output.
+        self.written_len = 0
+        self.written_crc = 0
+        # Number of nodes being rendered which output chunks can still be replaced, i.e. cannot be written yet.
+        self.hold = 0
+        # Number of worker processes rendering the shards of the top-level lists longer than the shard size.
+        self.workers = 1
+        self.shard_size = 0
+        # Data scopes with the innermost scope being the last one and the corresponding scope information.
+        self.scopes: list[dict] = [scope]
+        self.scope_infos: list[_ScopeInfo] = [_ScopeInfo(scope)]
+        # Number of frames with the *char repeat* tags or block variations being rendered.
+        self.tracked_frames = 0
+        # Output chunk indexes and scope indexes of the values set from the data scopes outside of the rendered
+        # block, i.e. the values filled into the block content at a different time by the textual filling.
+        self.outer_values: list[tuple[int, int]] = []
+
+    def push_scope(self, scope: dict, path_name: str, list_scope: _ListScope | None = None,
+                   item_idx: int = -1) -> None:
+        """
+        Adds a new innermost data scope.
+
+        Args:
+            scope (dict): Data scope.
+            path_name (str): Name of the block attribute in the parent scope leading to the new scope.
+            list_scope (_ListScope | None, optional): List containing the data of the scope if the scope
+                represents a list item. Defaults to None.
+            item_idx (int, optional): Index of the list item. Defaults to -1.
+        """
+        self.scopes.append(scope)
+        self.scope_infos.append(_ScopeInfo(scope, path_name, list_scope, item_idx))
+
+    def pop_scope(self) -> None:
+        """
+        Removes the innermost data scope.
+        """
+        self.scopes.pop()
+        self.scope_infos.pop()
+
+    @property
+    def pos(self) -> int:
+        """
+        Returns the index of the next output chunk including the chunks already written into the output.
+
+        Returns:
+            int: Output chunk index.
+        """
+        return self.offset + len(self.out)
+
+    def write(self, content: str) -> None:
+        """
+        Writes the content into the output and updates the length and CRC of the written content.
+
+        Args:
+            content (str): Content to be written.
+        """
+        if content:
+            self.output.write(content)
+            self.written_len += len(content)
+            self.written_crc = zlib.crc32(content.encode("utf-8"), self.written_crc)
+
+    def flush(self) -> None:
+        """
+        Writes the output chunks up to the last new line char into the output. The actual line is kept in the output
+        chunks, because it is needed for setting the *char repeat* tags. Nothing is written if some of the output
+        chunks can still be replaced, e.g. by trimming of the block variation.
+        """
+        if self.hold:
+            return
+        out = self.out
+        for idx in range(len(out) - 1, -1, -1):
+            nl_pos = out[idx].rfind("\n")
+            if nl_pos >= 0:
+                break
+        else:
+            return
+        self.write(f"{''.join(out[: idx])}{out[idx][: nl_pos]}")
+        # The new line char is kept to indicate the line start and the end of the previous block clone.
+        out[idx] = out[idx][nl_pos:]
+        del out[: idx]
+        self.offset += idx
+        idx = 0
+        while idx < len(self.outer_values) and self.outer_values[idx][0] < self.offset:
+            idx += 1
+        del self.outer_values[: idx]
+
+    def check_order(self, name: str, scope_idx: int, block: bool) -> None:
+        """
+        Checks that the value of a tag taken from the specified scope is the same value that would be set by
+        the textual filling. Raises the :class:`_InexactRenderError` exception if it is not guaranteed.
+
+        Args:
+            name (str): Tag name.
+            scope_idx (int): Index of the scope providing the value or -1 if the tag is left unset.
+            block (bool): Flag indicating a block tag. Otherwise the tag is a variable tag.
+        """
+        infos = self.scope_infos
+        # Values of the outer scopes filled before the scope leading to the tag would overwrite the value.
+        for idx in range(scope_idx):
+            value = self.scopes[idx].get(name, _MISSING)
+            if value is not _MISSING and (block or not (value or _is_data_list(value) or
+                                                        isinstance(value, _SIMPLE_TYPES))):
+                if infos[idx].get_rank(name) < infos[idx].get_rank(infos[idx + 1].path_name):
+                    raise _InexactRenderError()
+        # Values of the following list items would be filled into the tags remaining unset in the previous items.
+        for idx in range(scope_idx + 1, len(infos)):
+            info = infos[idx]
+            if info.list_scope is not None and info.list_scope.get_last_idx(name) > info.item_idx:
+                raise _InexactRenderError()
+
+    def get_column(self, frame: _RenderFrame) -> int:
+        """
+        Returns the column position of the actual end of output within the current line of a block.
+
+        Args:
+            frame (_RenderFrame): Frame of the block being rendered.
+
+        Returns:
+            int: Column position.
+        """
+        line = []
+        line_idx = frame.start
+        for idx in range(len(self.out) - 1, max(frame.start - self.offset, 0) - 1, -1):
+            chunk = self.out[idx]
+            nl_pos = chunk.rfind("\n")
+            if nl_pos >= 0:
+                line.append(chunk[nl_pos + 1:])
+                line_idx = idx + self.offset
+                break
+            line.append(chunk)
+        for (chunk_idx, scope_idx) in reversed(self.outer_values):
+            if chunk_idx < line_idx:
+                # Values before the last new line char do not affect the column position.
+                break
+            if scope_idx < frame.min_scope:
+                # Value is filled at a different time than the block content when the textual filling is used.
+                raise _InexactRenderError()
+        return len("".join(reversed(line)).expandtabs(self.config.tab_size))
+
+    def check_value(self, value: str) -> str:
+        """
+        Checks that the value of a variable does not contain any template tags, which would be filled by the textual
+        filling as a part of the block content. Raises the :class:`_InexactRenderError` exception if it does.
+
+        Args:
+            value (str): Variable value.
+
+        Returns:
+            str: Checked variable value.
+        """
+        tags = self.config.tags
+        if (tags.variable.begin[:1] in value or tags.variable.end[-1:] in value) and (
+                self.tag_regex.search(value) or value.endswith(tags.variable.begin[:1]) or
+                value.startswith(tags.variable.end[-1:])):
+            raise _InexactRenderError()
+        if tags.variable.end[-1:] in value:
+            self.check_join(value)
+        return value
+
+    def check_join(self, content: str) -> None:
+        """
+        Checks that the content added after the actual output does not finish a tag started in the output, e.g.
+        the variable value joining the surrounding text ``<<VAR>NAME>`` into the ``<NAME>`` tag, which would be
+        filled by the textual filling as a part of the block content. Raises the :class:`_InexactRenderError`
+        exception if it does.
+
+        Args:
+            content (str): Content to be added to the output.
+        """
+        tags = self.config.tags
+        (begin_char, end_char) = (tags.variable.begin[:1], tags.variable.end[-1:])
+        end_pos = content.find(end_char)
+        if end_pos < 0 or begin_char in content[:end_pos] or "\n" in content[:end_pos]:
+            return
+        parts = [content[: end_pos + 1]]
+        for chunk in reversed(self.out):
+            pos = max(chunk.rfind(begin_char), chunk.rfind(end_char), chunk.rfind("\n"))
+            if pos >= 0:
+                if chunk[pos] != begin_char:
+                    return
+                parts.append(chunk[pos:])
+                break
+            parts.append(chunk)
+        else:
+            return
+        tag = "".join(reversed(parts))
+        if tag in (tags.std_last_first_start.str, tags.std_last_first_end.str, tags.char_repeat.str,
+                   tags.block_variation.str_name(tags.std_last_first_start.name)):
+            raise _InexactRenderError()
+        for tag_fmt in (tags.variable, tags.block_start, tags.block_end, tags.block_variation):
+            if len(tag) > len(tag_fmt.begin) + len(tag_fmt.end) and tag.startswith(tag_fmt.begin) and \
+                    tag.endswith(tag_fmt.end):
+                name = tag[len(tag_fmt.begin): len(tag) - len(tag_fmt.end)]
+                if any(name in scope for scope in self.scopes):
+                    raise _InexactRenderError()
+                self.check_order(name, -1, False)
+
+    def add_output(self, content: str, scope_idx: int, frame: _RenderFrame) -> None:
+        """
+        Adds the content of a tag set from the specified data scope to the output chunks.
+
+        Args:
+            content (str): Content of the tag.
+            scope_idx (int): Index of the scope providing the tag value.
+            frame (_RenderFrame): Frame of the block being rendered.
+        """
+        if scope_idx < frame.min_scope and self.tracked_frames:
+            # Value is filled into the block content before its template is extracted from the parent block or
+            # after the block is set into its parent block, i.e. it can affect the special tags of the block.
+            self.outer_values.append((self.pos, scope_idx))
+        self.out.append(content)
+
+    def trim_output(self, start: int, variation_start: int, frame: _RenderFrame) -> None:
+        """
+        Replaces the output chunks starting from the specified index with a single chunk containing the trimmed
+        content of a block variation.
+
+        Args:
+            start (int): Index of the first output chunk to be replaced.
+            variation_start (int): Index of the first output chunk of the variation.
+            frame (_RenderFrame): Frame of the block being rendered.
+        """
+        (first_nl_idx, last_nl_idx) = (-1, -1)
+        for idx in range(variation_start, len(self.out)):
+            if "\n" in self.out[idx]:
+                last_nl_idx = idx
+                if first_nl_idx < 0:
+                    first_nl_idx = idx
+        for (chunk_idx, scope_idx) in reversed(self.outer_values):
+            chunk_idx -= self.offset
+            if chunk_idx < variation_start:
+                break
+            if scope_idx < frame.min_scope and \
+                    (first_nl_idx < 0 or chunk_idx <= first_nl_idx or chunk_idx >= last_nl_idx):
+                # Value is filled at a different time than the block content when the textual filling is used.
+                raise _InexactRenderError()
+        content = _trim_variation("".join(self.out[variation_start:]))
+        del self.out[start:]
+        self.out.append(content)
+        start += self.offset
+        idx = len(self.outer_values) - 1
+        while idx >= 0 and self.outer_values[idx][0] > start:
+            self.outer_values[idx] = (start, self.outer_values[idx][1])
+            idx -= 1
+
+    def render_nodes(self, nodes: list["TemplateNode"], frame: _RenderFrame) -> None:
+        """
+        Renders the template nodes into the output chunks.
+
+        Args:
+            nodes (list[TemplateNode]): Nodes to be rendered.
+            frame (_RenderFrame): Frame of the block being rendered.
+        """
+        for node in nodes:
+            if node.single_line:
+                start = len(self.out)
+                self.hold += 1
+                node.render(self, frame)
+                self.hold -= 1
+                if any("\n" in chunk for chunk in self.out[start:]):
+                    # New line char would change the position of the block tags placed on the same line.
+                    raise _InexactRenderError()
+            else:
+                node.render(self, frame)
+            if self.output is not None and len(self.out) >= _STREAM_CHUNKS:
+                self.flush()
+
+
+class TemplateNode:
+    """
+    Base class of the nodes forming a :class:`CompiledTemplate` tree.
+    """
+    # pylint: disable=too-few-public-methods
+    # rationale: Nodes are only rendered by the renderer walking the tree.
+    def __init__(self, raw: str) -> None:
+        """
+        Constructor.
+
+        Args:
+            raw (str): Raw template string represented by the node.
+        """
+        self.raw = raw
+        # Flag indicating that the rendered node content must not contain a new line char.
+        self.single_line = False
+
+    def render(self, renderer: _TemplateRenderer, frame: _RenderFrame) -> None:
+        """
+        Renders the node content into the renderer output. The raw template string is rendered by default.
+
+        Args:
+            renderer (_TemplateRenderer): Renderer collecting the output.
+            frame (_RenderFrame): Frame of the block being rendered.
+        """
+        # pylint: disable=unused-argument
+        # rationale: The frame is used by the nodes setting the special tags.
+        renderer.out.append(self.raw)
+
+
+class TextNode(TemplateNode):
+    """
+    Node representing a static text of the template.
+    """
+    # pylint: disable=too-few-public-methods
+    # rationale: Static text only appends itself to the output.
+    def __init__(self, raw: str, closing: bool = False) -> None:
+        """
+        Constructor.
+
+        Args:
+            raw (str): Raw template string represented by the node.
+            closing (bool, optional): Flag indicating that the text starts with the end of a tag, i.e. it can join
+                the preceding output into a tag. Defaults to False.
+        """
+        super().__init__(raw)
+        self.closing = closing
+
+    def render(self, renderer: _TemplateRenderer, frame: _RenderFrame) -> None:
+        if self.closing:
+            renderer.check_join(self.raw)
+        renderer.out.append(self.raw)
+
+
+# rationale: Variation tags only split the block content, they are never rendered by themselves.
+# pylint: disable-next=too-few-public-methods
+class VariationNode(TemplateNode):
+    """
+    Node representing a *block variation* tag separating the block content variations, e.g. ``<^BLOCK>``.
+    """
+
+
+class VariableNode(TemplateNode):
+    """
+    Node representing a variable tag, e.g. ``<VARIABLE>``.
+    """
+    # pylint: disable=too-few-public-methods
+    # rationale: Variable tag only renders its value from the data scopes.
+    def __init__(self, raw: str, name: str, ambiguous: bool = False) -> None:
+        """
+        Constructor.
+
+        Args:
+            raw (str): Raw template string represented by the node.
+            name (str): Variable name.
+            ambiguous (bool, optional): Flag indicating that the tag could be paired with a block end tag outside of
+                the parent block content by the textual filling, i.e. it is not rendered if it is set. Defaults to
+                False.
+        """
+        super().__init__(raw)
+        self.name = name
+        self.ambiguous = ambiguous
+
+    def render(self, renderer: _TemplateRenderer, frame: _RenderFrame) -> None:
+        scopes = renderer.scopes
+        for scope_idx in range(len(scopes) - 1, -1, -1):
+            value = scopes[scope_idx].get(self.name, _MISSING)
+            if value is _MISSING:
+                continue
+            if self.ambiguous:
+                raise _InexactRenderError()
+            if isinstance(value, _SIMPLE_TYPES):
+                renderer.check_order(self.name, scope_idx, False)
+                renderer.add_output(renderer.check_value(f"{value}"), scope_idx, frame)
+                return
+            if not value and not _is_data_list(value):
+                # Variable is cleared by the None value or an empty dictionary.
+                renderer.check_order(self.name, scope_idx, False)
+                renderer.add_output("", scope_idx, frame)
+                return
+        # Variable without a value is kept in the content, same as with the textual filling.
+        renderer.check_order(self.name, -1, False)
+        renderer.out.append(self.raw)
+
+
+class BlockNode(TemplateNode):
+    """
+    Node representing a block defined by the start and end tags, e.g. ``<BLOCK>content</BLOCK>``, with
+    the block content split into variations.
+    """
+    # pylint: disable=too-many-instance-attributes
+    # rationale: Block properties are precomputed by the parser, so that the rendering does not need
+    # to inspect the block content.
+    def __init__(self, template: str, span: tuple[int, int, int, int], name: str, parent: "BlockNode | None",
+                 config: BlockConfig) -> None:
+        """
+        Constructor.
+
+        Args:
+            template (str): Template string containing the block.
+            span (tuple[int, int, int, int]): Span of the block in the template in form of a tuple
+                ``(block_start, content_start, content_end, block_end)``, where the block start and end include
+                the empty space removed together with the block tags.
+            name (str): Block name.
+            parent (BlockNode | None): Parent block node or ``None`` for the top-level blocks.
+            config (BlockConfig): Block configuration.
+        """
+        (span_start, cont_start, cont_end, span_end) = span
+        super().__init__(template[span_start: span_end])
+        self.name = name
+        self.parent = parent
+        self.open_raw = template[span_start: cont_start]
+        self.close_raw = template[cont_end: span_end]
+        # Flag indicating that the block position depends on the parent block content in which it is searched,
+        # e.g. because the block tags are placed on the same line as the parent block tags.
+        self.context_sensitive = False
+        # Flag indicating that the block tags are placed on the first line of the parent block content.
+        self.first_line = False
+        # Flags indicating that the filled content surrounding the block tags can change the block position,
+        # i.e. in general and if the block content is filled in a new data scope.
+        self.fragile = False
+        self.scoped_fragile = False
+        # Flag indicating that the block filled in a new data scope is not fragile if the content preceding its
+        # start tag line in the template and in the rendered output ends with a new line char.
+        self.line_start_fixed = False
+        self.nodes: list[TemplateNode] = []
+        self.variations: list[list[TemplateNode]] = [[]]
+        # Flag indicating that the block content contains tags set by the textual filling only when the block
+        # is set into its parent, i.e. the tags which values depend on the order of filling.
+        self.tracked = False
+        # Names of all subblocks in the block content.
+        self.block_names: frozenset[str] = frozenset()
+        self.repeat_table = _get_char_repeat_table(template[cont_start: cont_end], config)
+
+    def set_nodes(self, nodes: list[TemplateNode]) -> None:
+        """
+        Sets the nodes of the block content and splits them into variations.
+
+        Args:
+            nodes (list[TemplateNode]): Nodes of the block content.
+        """
+        self.nodes = nodes
+        self.variations = [[]]
+        for node in nodes:
+            if isinstance(node, VariationNode):
+                self.variations.append([])
+            else:
+                self.variations[-1].append(node)
+        self.tracked = bool(self.repeat_table) or len(self.variations) > 1 or any(
+            isinstance(node, BlockNode) and node.tracked for node in nodes)
+        self.block_names = frozenset(name for node in nodes if isinstance(node, BlockNode)
+                                     for name in (node.name, *node.block_names))
+
+    def render_variation(self, renderer: _TemplateRenderer, frame: _RenderFrame, variation_idx: int) -> None:
+        """
+        Renders the specified block content variation.
+
+        Args:
+            renderer (_TemplateRenderer): Renderer collecting the output.
+            frame (_RenderFrame): Frame of the block being rendered.
+            variation_idx (int): Index of the variation. The first variation is used for indexes out of range.
+        """
+        if len(self.variations) == 1:
+            renderer.render_nodes(self.nodes, frame)
+            return
+        if variation_idx >= len(self.variations):
+            variation_idx = 0
+        renderer.hold += 1
+        start = len(renderer.out)
+        if variation_idx and self.repeat_table:
+            # The *char repeat* tags are set with all variations in the block content, i.e. the previous
+            # variations could be located on the same line as the selected one.
+            renderer.render_nodes(self.variations[0], frame)
+            for vari in self.variations[1: variation_idx]:
+                renderer.out.append(self.raw_separator)
+                renderer.render_nodes(vari, frame)
+            renderer.out.append(self.raw_separator)
+            vari_start = len(renderer.out)
+            renderer.render_nodes(self.variations[variation_idx], frame)
+        else:
+            vari_start = start
+            renderer.render_nodes(self.variations[variation_idx], frame)
+        renderer.trim_output(start, vari_start, frame)
+        renderer.hold -= 1
+
+    @property
+    def raw_separator(self) -> str:
+        """
+        Returns the variation tag string separating the block content variations.
+
+        Returns:
+            str: Variation tag string.
+        """
+        return next((node.raw for node in self.nodes if isinstance(node, VariationNode)), "")
+
+    def render(self, renderer: _TemplateRenderer, frame: _RenderFrame) -> None:
+        scopes = renderer.scopes
+        for scope_idx in range(len(scopes) - 1, -1, -1):
+            value = scopes[scope_idx].get(self.name, _MISSING)
+            if value is not _MISSING:
+                break
+        else:
+            # Block without a value is kept in the content together with its tags.
+            renderer.check_order(self.name, -1, True)
+            renderer.render_nodes((TextNode(self.open_raw), *self.nodes, TextNode(self.close_raw)), frame)
+            return
+        if value.__class__ is not list and not isinstance(value, tuple) and _is_data_list(value):
+            if not isinstance(value, Collection):
+                # Iterators, e.g. generators, can be consumed only once, i.e. only by the textual filling.
+                raise _InexactRenderError()
+            value = tuple(value)
+        self.check_exact(renderer, frame, scope_idx, value)
+
+        if _is_data_list(value):
+            if value:
+                self.render_list(renderer, value)
+        elif isinstance(value, _SIMPLE_TYPES):
+            # Block is set without filling or cleared by the "", 0 or False value.
+            if value:
+                self.render_frame(renderer, _RenderFrame(self, frame.context, 1, renderer.pos, len(scopes)), 0)
+        elif value:
+            self.render_object(renderer, value)
+        renderer.add_output("", scope_idx, frame)
+
+    def check_exact(self, renderer: _TemplateRenderer, frame: _RenderFrame, scope_idx: int,
+                    value: object | dict | list | tuple) -> None:
+        """
+        Checks that the block set from the specified data scope is rendered with the same content as by the textual
+        filling.
+
+        Args:
+            renderer (_TemplateRenderer): Renderer collecting the output.
+            frame (_RenderFrame): Frame of the parent block being rendered.
+            scope_idx (int): Index of the scope providing the block value.
+            value (object | dict | list | tuple): Block value.
+
+        Raises:
+            _InexactRenderError: If the rendered content could be different from the textual filling.
+        """
+        scopes = renderer.scopes
+        # Content of a block set from an outer scope is processed by the inner blocks first and the position
+        # of the block tags could be different in the content of another parent block or after the content
+        # surrounding the block tags is filled.
+        if scope_idx < len(scopes) - 1:
+            raise _InexactRenderError()
+        if self.scoped_fragile and not (self.line_start_fixed and (_ends_line(renderer.out) or not any(renderer.out))):
+            raise _InexactRenderError()
+        if self.context_sensitive and (frame.context is not self.parent or (self.first_line and frame.joined)):
+            raise _InexactRenderError()
+        if scope_idx < frame.min_scope and self.repeat_table and frame.repeat_table:
+            # Block set from the data scope outside of the rendered block changes the *char repeat* tags
+            # in the template of the rendered block extracted by the textual filling.
+            raise _InexactRenderError()
+        renderer.check_order(self.name, scope_idx, True)
+
+        if self.fragile and (not value or isinstance(value, _SIMPLE_TYPES) or any(
+                name in scope for scope in scopes for name in self.block_names)):
+            # Subblocks are filled before the block is extracted if its content is not filled in a new data scope
+            # or if they are filled from the outer data scopes.
+            raise _InexactRenderError()
+
+    def render_object(self, renderer: _TemplateRenderer, value: object | dict) -> None:
+        """
+        Renders the block filled by a single object or dictionary in a new data scope.
+
+        Args:
+            renderer (_TemplateRenderer): Renderer collecting the output.
+            value (object | dict): Non-empty object or dictionary with the data for the block.
+        """
+        (item_scope, vari_idx, fill_hndl) = _get_data_scope(value)
+        if isinstance(vari_idx, bool):
+            vari_idx = 0 if vari_idx else -1
+        if self.fragile and vari_idx < 0:
+            raise _InexactRenderError()
+        if fill_hndl:
+            self.render_textual(renderer, value)
+        elif vari_idx >= 0:
+            renderer.push_scope(item_scope, self.name)
+            self.render_frame(renderer, _RenderFrame(self, self, 1, renderer.pos, len(renderer.scopes) - 1), vari_idx)
+            renderer.pop_scope()
+
+    def render_frame(self, renderer: _TemplateRenderer, frame: _RenderFrame, variation_idx: int) -> None:
+        """
+        Renders the specified block content variation using a new frame of the block.
+
+        Args:
+            renderer (_TemplateRenderer): Renderer collecting the output.
+            frame (_RenderFrame): New frame of the block.
+            variation_idx (int): Index of the variation.
+        """
+        if self.tracked:
+            renderer.tracked_frames += 1
+        self.render_variation(renderer, frame, variation_idx)
+        if self.tracked:
+            renderer.tracked_frames -= 1
+
+    def render_list(self, renderer: _TemplateRenderer, items: list | tuple) -> None:
+        """
+        Renders block clones for the list items.
+
+        Args:
+            renderer (_TemplateRenderer): Renderer collecting the output.
+            items (list | tuple): Non-empty list of items with the data for the block clones.
+        """
+        for item in items:
+            if (_get_data_dict(item) or {}).get("fill_hndl"):
+                self.render_textual(renderer, items)
+                return
+
+        if renderer.workers > 1 and len(items) > renderer.shard_size > 0 and self.parent is None and \
+                len(renderer.scopes) == 1 and len(self.variations) == 1 and self.render_shards(renderer, items):
+            return
+        # The block clones are set as a variation 0 of the whole cloned content if there are more variations,
+        # i.e. only the first variation of the first clone is used.
+        self.render_items(renderer, _ListScope(items), items if len(self.variations) == 1 else items[: 1],
+                          len(items) - 1)
+
+    def render_items(self, renderer: _TemplateRenderer, list_scope: _ListScope, items: list | tuple,
+                     last_idx: int) -> None:
+        """
+        Renders block clones for the list items being a part of the whole list.
+
+        Args:
+            renderer (_TemplateRenderer): Renderer collecting the output.
+            list_scope (_ListScope): List containing the items with the index of the first item.
+            items (list | tuple): Items with the data for the block clones.
+            last_idx (int): Index of the last item of the whole list.
+        """
+        frame = _RenderFrame(self, self, 0, renderer.pos, len(renderer.scopes))
+        if self.tracked:
+            renderer.tracked_frames += 1
+        for (idx, item) in enumerate(items, list_scope.offset):
+            # Data scopes of the list items are created one by one to keep only the rendered one in memory.
+            item_scope = _get_data_scope(item)[0]
+            frame.std_last_first_idx = 1 if idx == last_idx else 2 if idx == 0 else 0
+            frame.repeat_num = 0
+            frame.joined = idx > 0 and not _ends_line(renderer.out)
+            renderer.push_scope(item_scope, self.name, list_scope, idx)
+            self.render_variation(renderer, frame, 0)
+            renderer.pop_scope()
+        if self.tracked:
+            renderer.tracked_frames -= 1
+
+    def render_shards(self, renderer: _TemplateRenderer, items: list | tuple) -> bool:
+        """
+        Renders block clones for the shards of the list items in the worker processes. Each shard is rendered
+        with the assumption that the previous shard ends with a new line char, because the *char repeat* tags
+        and the position of the tags on the first line depend on the content of the current line.
+
+        Args:
+            renderer (_TemplateRenderer): Renderer collecting the output.
+            items (list | tuple): Items with the data for the block clones.
+
+        Returns:
+            bool: ``True`` if the shards are rendered with the same content as the whole list or ``False`` if
+                the list has to be rendered without the shards.
+        """
+        # Scope of the workers does not contain the list items, but the list value keeps the filling order.
+        scope = dict(renderer.scopes[0])
+        scope[self.name] = ()
+        starts = range(0, len(items), renderer.shard_size)
+        line_start = _ends_line(renderer.out)
+        with ProcessPoolExecutor(renderer.workers, initializer=_init_shard_worker,
+                                 initargs=(self, scope, renderer.config, renderer.tag_regex)) as executor:
+            shards = list(executor.map(
+                _render_shard, starts, (items[start: start + renderer.shard_size] for start in starts),
+                [len(items) - 1] * len(starts), (idx > 0 or line_start for idx in range(len(starts)))))
+        # Tag names checked to be missing in the following items must not be defined in the following shards.
+        following_names: set[str] = set()
+        for (content, checked_names, names) in reversed(shards):
+            if content is None or not checked_names.isdisjoint(following_names):
+                return False
+            following_names.update(names)
+        for (idx, (content, _, _)) in enumerate(shards):
+            if idx > 0 and not line_start:
+                return False
+            if content:
+                line_start = content.endswith("\n")
+        renderer.out.extend(content for (content, _, _) in shards)
+        return True
+
+    def render_textual(self, renderer: _TemplateRenderer, value: object | dict | list | tuple) -> None:
+        """
+        Renders the block using the textual filling of a :class:`Block` object. Used for the data with
+        a ``fill_hndl`` handler requiring a :class:`Block` object to work with.
+
+        Args:
+            renderer (_TemplateRenderer): Renderer collecting the output.
+            value (object | dict | list | tuple): Data to be filled into the block.
+        """
+        if self.fragile:
+            raise _InexactRenderError()
+        blk_parent = Block(config=renderer.config)
+        blk_parent.template = self.raw
+        subblk = blk_parent.get_subblock(self.name)
+        if _is_data_list(value):
+            for (i, val) in enumerate(value):
+                subblk.fill(val, i)
+                subblk.clone()
+            subblk.set(count=1)
+        else:
+            vari_idx = subblk.fill(value)
+            subblk.set(variation_idx=vari_idx, count=1)
+        renderer.out.append(blk_parent.content)
+
+
+class StdLastFirstNode(BlockNode):
+    """
+    Node representing a *std last first* tag, e.g. ``<.>STD_VALUE<^.>LAST_VALUE<^.>FIRST_VALUE</.>``.
+    """
+    def render(self, renderer: _TemplateRenderer, frame: _RenderFrame) -> None:
+        if frame.std_last_first_idx < 0:
+            renderer.render_nodes((TextNode(self.open_raw), *self.nodes, TextNode(self.close_raw)), frame)
+            return
+        if self.fragile or (self.context_sensitive and (
+                frame.owner is not self.parent or (self.first_line and frame.joined))):
+            raise _InexactRenderError()
+        if len(self.variations) > 1:
+            renderer.hold += 1
+        start = len(renderer.out)
+        vari_idx = frame.std_last_first_idx if frame.std_last_first_idx < len(self.variations) else 0
+        renderer.render_nodes(self.variations[vari_idx], frame)
+        if len(self.variations) > 1:
+            renderer.trim_output(start, start, frame)
+            renderer.hold -= 1
+
+
+class CharRepeatNode(TemplateNode):
+    """
+    Node representing a *char repeat* tag followed by the characters to be repeated, e.g. ``<+>    ``.
+    """
+    # pylint: disable=too-few-public-methods
+    # rationale: Char repeat tag only renders the repeated characters.
+    def __init__(self, raw: str, repeat_char: str) -> None:
+        """
+        Constructor.
+
+        Args:
+            raw (str): Raw template string represented by the node.
+            repeat_char (str): Character to be repeated or an empty string if the tag is followed by another tag,
+                i.e. the repeated character is taken from the filled value of the following tag.
+        """
+        super().__init__(raw)
+        self.repeat_char = repeat_char
+
+    def render(self, renderer: _TemplateRenderer, frame: _RenderFrame) -> None:
+        if frame.repeat_table is None:
+            renderer.out.append(self.raw)
+            return
+        if not self.repeat_char:
+            # The textual filling repeats the first char of the content filled into the following tag.
+            raise _InexactRenderError()
+        # The n-th processed tag in the block content corresponds to the n-th tag in the block template.
+        if frame.repeat_num < len(frame.repeat_table):
+            (orig_col, orig_len) = frame.repeat_table[frame.repeat_num]
+        else:
+            (orig_col, orig_len) = (-1, 0)
+        frame.repeat_num += 1
+        new_len = orig_len + (orig_col - renderer.get_column(frame))
+        if self.repeat_char == "\t":
+            temp_len = new_len
+            new_len //= renderer.config.tab_size
+            if new_len * renderer.config.tab_size < temp_len:
+                new_len += 1
+        if new_len <= 0:
+            new_len = 1
+        renderer.out.append(new_len * self.repeat_char)
+
+
+class _RenderCodeGenerator:
+    """
+    Generator of the Python source code rendering the nodes of a :class:`CompiledTemplate`. The generated functions
+    produce the same output chunks as the :meth:`_TemplateRenderer.render_nodes` method walking the nodes, but
+    the static properties of the nodes are resolved during the generation. The most common values are rendered
+    directly by the generated code and the other values are rendered by the node objects themselves.
+
+    The generated code renders only the blocks filled from the innermost data scope with a non-empty dictionary or
+    a list, i.e. the number of data scopes used by each node rendered by the generated code is known in advance.
+    Blocks which tag lines could be changed by filling their content in a new data scope are always rendered by
+    the nodes.
+    """
+    def __init__(self, nodes: list[TemplateNode], config: BlockConfig, profiled: bool = False) -> None:
+        """
+        Constructor. Generates the source code of the ``render_root`` function rendering the top-level nodes.
+
+        Args:
+            nodes (list[TemplateNode]): Top-level nodes of the template.
+            config (BlockConfig): Block configuration.
+            profiled (bool, optional): Flag indicating that the generated functions rendering the blocks are
+                measured by the enabled :class:`BlockProfiler`. Defaults to False.
+        """
+        # Objects used by the generated code available as its global names.
+        self.namespace: dict[str, object] = {
+            "_RenderFrame": _RenderFrame, "_ListScope": _ListScope, "_ScopeInfo": _ScopeInfo,
+            "_InexactRenderError": _InexactRenderError, "_get_data_scope": _get_data_scope,
+            "_get_data_dict": _get_data_dict, "_ends_line": _ends_line, "_trim_variation": _trim_variation,
+            "_MISSING": _MISSING, "_SIMPLE_CLASSES": frozenset(_SIMPLE_TYPES), "_profile_node": _profile_node}
+        self.__profiled = profiled
+        self.__functions: list[list[str]] = []
+        self.__names: dict[int, str] = {}
+        # Names of the functions rendering the node lists with the list identities as keys.
+        self.__nodes_functions: dict[int, str] = {}
+        # Names of the tuples of functions rendering the block variations with the block identities as keys.
+        self.__tables: dict[int, str] = {}
+        self.__table_lines: list[str] = []
+        self.__value_chars = (config.tags.variable.begin[:1], config.tags.variable.end[-1:])
+        root_name = self.__add_nodes(nodes, 1)
+        self.__functions.append(["def render_root(r):", f"    {root_name}(r, _RenderFrame(None, None, -1, 0, 0))"])
+
+    @property
+    def source(self) -> str:
+        """
+        Returns the generated source code.
+
+        Returns:
+            str: Source code of the generated functions.
+        """
+        return "\n\n\n".join(["\n".join(lines) for lines in self.__functions] + ["\n".join(self.__table_lines)]) + "\n"
+
+    def __get_name(self, obj: object) -> str:
+        """
+        Returns the global name of an object used by the generated code.
+
+        Args:
+            obj (object): Object, e.g. a template node.
+
+        Returns:
+            str: Global name of the object.
+        """
+        name = self.__names.get(id(obj))
+        if name is None:
+            name = self.__names[id(obj)] = f"_node{len(self.__names)}"
+            self.namespace[name] = obj
+        return name
+
+    def __add_function(self, lines: list[str]) -> str:
+        """
+        Adds a generated function.
+
+        Args:
+            lines (list[str]): Source code lines of the function starting with the ``def`` statement, in which
+                the function name is represented by the ``{name}`` placeholder.
+
+        Returns:
+            str: Name of the function.
+        """
+        name = f"_func{len(self.__functions)}"
+        lines[0] = lines[0].format(name=name)
+        self.__functions.append(lines)
+        return name
+
+    def __add_nodes(self, nodes: list[TemplateNode], depth: int) -> str:
+        """
+        Adds a function rendering the nodes the same way as the :meth:`_TemplateRenderer.render_nodes` method.
+
+        Args:
+            nodes (list[TemplateNode]): Nodes to be rendered.
+            depth (int): Number of data scopes used for rendering the nodes.
+
+        Returns:
+            str: Name of the function with the renderer and render frame arguments.
+        """
+        if id(nodes) in self.__nodes_functions:
+            return self.__nodes_functions[id(nodes)]
+        body = []
+        for node in nodes:
+            lines = self.__get_node_lines(node, depth)
+            if node.single_line:
+                # New line char would change the position of the block tags placed on the same line.
+                lines = ["start = len(out)", *lines,
+                         "if \"\\n\" in \"\".join(out[start:]):", "    raise _InexactRenderError()"]
+            body += lines
+        name = self.__nodes_functions[id(nodes)] = self.__add_function(
+            ["def {name}(r, frame):", "    out = r.out", "    scopes = r.scopes", *_indent(body, 1)])
+        return name
+
+    def __get_node_lines(self, node: TemplateNode, depth: int) -> list[str]:
+        """
+        Returns the source code lines rendering a node the same way as its ``render`` method.
+
+        Args:
+            node (TemplateNode): Node to be rendered.
+            depth (int): Number of data scopes used for rendering the node.
+
+        Returns:
+            list[str]: Source code lines.
+        """
+        if type(node) in (TextNode, VariationNode):
+            return [*([f"r.check_join({node.raw!r})"] if getattr(node, "closing", False) else []),
+                    f"out.append({node.raw!r})"]
+        node_name = self.__get_name(node)
+        if type(node) is VariableNode and not node.ambiguous:
+            # Simple value from the innermost data scope is set directly, other values are set by the node.
+            return [
+                f"value = scopes[{depth - 1}].get({node.name!r}, _MISSING)",
+                "if value.__class__ in _SIMPLE_CLASSES:",
+                *_indent(self.__get_order_lines(node.name, depth, False), 1),
+                "    if value.__class__ is not str:",
+                "        value = f\"{value}\"",
+                f"    if {self.__value_chars[0]!r} in value or {self.__value_chars[1]!r} in value:",
+                "        value = r.check_value(value)",
+                *_indent(self.__get_outer_value_lines(depth), 1),
+                "    out.append(value)",
+                "else:",
+                f"    {node_name}.render(r, frame)"]
+        if type(node) is BlockNode and not node.scoped_fragile:
+            return [f"{self.__add_block(node, node_name, depth)}(r, frame)"]
+        return [f"{node_name}.render(r, frame)"]
+
+    @staticmethod
+    def __get_order_lines(name: str, depth: int, block: bool) -> list[str]:
+        """
+        Returns the source code lines checking the order of filling the tag with a value from the innermost data
+        scope the same way as the :meth:`_TemplateRenderer.check_order` method, i.e. only the outer data scopes
+        containing the tag name need to be checked.
+
+        Args:
+            name (str): Tag name.
+            depth (int): Number of data scopes.
+            block (bool): Flag indicating a block tag.
+
+        Returns:
+            list[str]: Source code lines.
+        """
+        if depth == 1:
+            return []
+        return [f"if {' or '.join(f'{name!r} in scopes[{idx}]' for idx in range(depth - 1))}:",
+                f"    r.check_order({name!r}, {depth - 1}, {block})"]
+
+    @staticmethod
+    def __get_outer_value_lines(depth: int) -> list[str]:
+        """
+        Returns the source code lines tracking the value from the innermost data scope the same way as
+        the :meth:`_TemplateRenderer.add_output` method.
+
+        Args:
+            depth (int): Number of data scopes.
+
+        Returns:
+            list[str]: Source code lines.
+        """
+        return [f"if {depth - 1} < frame.min_scope and r.tracked_frames:",
+                f"    r.outer_values.append((r.pos, {depth - 1}))"]
+
+    def __add_block(self, node: BlockNode, node_name: str, depth: int) -> str:
+        """
+        Adds a function rendering a block node the same way as the :meth:`BlockNode.render` method. Blocks with
+        a non-empty dictionary or a list value from the innermost data scope are rendered directly, other values
+        are rendered by the node.
+
+        Args:
+            node (BlockNode): Block node.
+            node_name (str): Global name of the block node.
+            depth (int): Number of data scopes used for rendering the block node.
+
+        Returns:
+            str: Name of the function with the renderer and render frame arguments.
+        """
+        checks = []
+        if node.context_sensitive:
+            parent_name = self.__get_name(node.parent) if node.parent else "None"
+            checks += [f"if frame.context is not {parent_name}{' or frame.joined' if node.first_line else ''}:",
+                       "    raise _InexactRenderError()"]
+        if node.repeat_table:
+            checks += [f"if {depth - 1} < frame.min_scope and frame.repeat_table:", "    raise _InexactRenderError()"]
+        checks += self.__get_order_lines(node.name, depth, True)
+        if node.fragile:
+            # Subblocks filled from the outer data scopes are filled before the block is extracted.
+            checks += [f"if any(name in scope for scope in scopes for name in {node_name}.block_names):",
+                       "    raise _InexactRenderError()"]
+        frame_lines = [
+            "scopes.append(scope)",
+            f"r.scope_infos.append(_ScopeInfo(scope, {node.name!r}))",
+            f"sub_frame = _RenderFrame({node_name}, {node_name}, 1, r.pos, {depth})",
+            *self.__get_tracked_lines(
+                node, self.__get_variation_lines(node, node_name, depth + 1, "sub_frame", "vari_idx")),
+            "scopes.pop()",
+            "r.scope_infos.pop()"]
+        name = self.__add_function([
+            "def {name}(r, frame):",
+            "    scopes = r.scopes",
+            f"    value = scopes[{depth - 1}].get({node.name!r}, _MISSING)",
+            "    if value.__class__ is dict and value:",
+            *_indent(checks, 2),
+            "        (scope, vari_idx, fill_hndl) = _get_data_scope(value)",
+            "        if vari_idx.__class__ is bool:",
+            "            vari_idx = 0 if vari_idx else -1",
+            *(["        if vari_idx < 0:", "            raise _InexactRenderError()"] if node.fragile else []),
+            "        if fill_hndl:",
+            f"            {node_name}.render_textual(r, value)",
+            "        elif vari_idx >= 0:",
+            *_indent(frame_lines, 3),
+            # Fragile block with an empty list is rendered by the node falling back to the textual filling.
+            f"    elif (value.__class__ is list or value.__class__ is tuple){' and value' if node.fragile else ''}:",
+            *_indent(checks, 2),
+            "        if value:",
+            f"            {self.__add_list(node, node_name, depth)}(r, value)",
+            "    else:",
+            f"        {node_name}.render(r, frame)",
+            "        return",
+            *_indent(self.__get_outer_value_lines(depth), 1),
+            "    r.out.append(\"\")"])
+        if self.__profiled:
+            # Global name of the function is called from the other generated functions, i.e. it is replaced
+            # by the measuring function after all functions are defined.
+            self.__table_lines.append(f"{name} = _profile_node({name}, {node_name})")
+        return name
+
+    def __add_list(self, node: BlockNode, node_name: str, depth: int) -> str:
+        """
+        Adds a function rendering block clones for the list items the same way as the :meth:`BlockNode.render_list`
+        method.
+
+        Args:
+            node (BlockNode): Block node.
+            node_name (str): Global name of the block node.
+            depth (int): Number of data scopes used for rendering the block node.
+
+        Returns:
+            str: Name of the function with the renderer and list items arguments.
+        """
+        item_lines = [
+            "frame.std_last_first_idx = 1 if idx == last_idx else 2 if idx == 0 else 0",
+            "frame.repeat_num = 0",
+            "frame.joined = idx > 0 and not (out[-1].endswith(\"\\n\") if out and out[-1] else _ends_line(out))",
+            # Dictionary with the unique tag names and without the special attributes is used directly as a scope.
+            "if item.__class__ is dict:",
+            "    scope = dict(zip(map(str.upper, item), item.values()))",
+            "    if len(scope) != len(item) or \"FILL_HNDL\" in scope or \"VARI_IDX\" in scope:",
+            "        scope = _get_data_scope(item)[0]",
+            "else:",
+            "    scope = _get_data_scope(item)[0]",
+            "scopes.append(scope)",
+            f"infos.append(_ScopeInfo(scope, {node.name!r}, list_scope, idx))",
+            "vari_idx = 0",
+            *self.__get_variation_lines(node, node_name, depth + 1, "frame", "vari_idx"),
+            "scopes.pop()",
+            "infos.pop()"]
+        return self.__add_function([
+            "def {name}(r, items):",
+            "    for item in items:",
+            "        if (item if item.__class__ is dict else _get_data_dict(item) or {}).get(\"fill_hndl\"):",
+            f"            {node_name}.render_textual(r, items)",
+            "            return",
+            "    if r.workers > 1:",
+            f"        {node_name}.render_list(r, items)",
+            "        return",
+            "    (out, scopes, infos) = (r.out, r.scopes, r.scope_infos)",
+            "    list_scope = _ListScope(items)",
+            "    last_idx = len(items) - 1",
+            f"    frame = _RenderFrame({node_name}, {node_name}, 0, r.pos, {depth})",
+            *_indent(self.__get_tracked_lines(node, [
+                f"for (idx, item) in enumerate({'items' if len(node.variations) == 1 else 'items[: 1]'}):",
+                *_indent(item_lines, 1)]), 1)])
+
+    def __get_variation_lines(self, node: BlockNode, node_name: str, depth: int, frame_name: str,
+                              vari_name: str) -> list[str]:
+        """
+        Returns the source code lines rendering a block content variation the same way as
+        the :meth:`BlockNode.render_variation` method.
+
+        Args:
+            node (BlockNode): Block node.
+            node_name (str): Global name of the block node.
+            depth (int): Number of data scopes used for rendering the block content.
+            frame_name (str): Name of the local variable with the render frame.
+            vari_name (str): Name of the local variable with the variation index.
+
+        Returns:
+            list[str]: Source code lines.
+        """
+        if len(node.variations) == 1:
+            return [f"{self.__add_nodes(node.nodes, depth)}(r, {frame_name})"]
+        table_name = self.__tables.get(id(node))
+        if table_name is None:
+            table_name = self.__tables[id(node)] = f"_table{len(self.__tables)}"
+            self.__table_lines.append(
+                f"{table_name} = ({', '.join(self.__add_nodes(vari, depth) for vari in node.variations)})")
+        lines = [
+            "start = len(r.out)",
+            f"{table_name}[{vari_name}](r, {frame_name})",
+            # Trimmed content without the values from the outer data scopes does not need to be checked.
+            "if r.outer_values and r.outer_values[-1][0] >= r.offset + start:",
+            f"    r.trim_output(start, start, {frame_name})",
+            "else:",
+            "    content = _trim_variation(\"\".join(r.out[start:]))",
+            "    del r.out[start:]",
+            "    r.out.append(content)"]
+        if node.repeat_table:
+            # Previous variations are rendered together with the selected one by the node.
+            lines = [f"if {vari_name}:", f"    {node_name}.render_variation(r, {frame_name}, {vari_name})",
+                     "else:", *_indent(lines, 1)]
+        return [f"if {vari_name} >= {len(node.variations)}:", f"    {vari_name} = 0", *lines]
+
+    @staticmethod
+    def __get_tracked_lines(node: BlockNode, lines: list[str]) -> list[str]:
+        """
+        Returns the source code lines surrounded by the lines updating the number of tracked frames if the block
+        is tracked.
+
+        Args:
+            node (BlockNode): Block node.
+            lines (list[str]): Source code lines rendering the block frame.
+
+        Returns:
+            list[str]: Source code lines.
+        """
+        if not node.tracked:
+            return lines
+        return ["r.tracked_frames += 1", *lines, "r.tracked_frames -= 1"]
+
+
+class CompiledTemplate:
+    """
+    Template parsed once into a tree of :class:`TemplateNode` objects (texts, variables, blocks with their
+    variations, *std last first* and *char repeat* tags). The compiled template is rendered by a single walk
+    through the tree producing the same content as the textual filling of a :class:`Block` based on
+    the repeated searching of tags in the block content.
+    """
+    def __init__(self, template: str, config: BlockConfig = DEFAULT_BLOCK_CONFIG, codegen: bool = False) -> None:
+        """
+        Constructor. Parses the template into a tree of nodes.
+
+        Args:
+            template (str): Template string.
+            config (:class:`BlockConfig`, optional): Block configuration (template tags format, tabulator size, etc.)
+            codegen (bool, optional): Flag indicating that the template is rendered by a Python function generated
+                from the tree of nodes (see the :attr:`source` property) instead of walking through the nodes.
+                The function is generated when the template is rendered for the first time. Defaults to False.
+        """
+        self.template = template
+        self.config = config
+        self.codegen = codegen
+        # Generated functions rendering the template without and with the profiling of the blocks.
+        self.__render_functions: dict[bool, Callable[[_TemplateRenderer], None]] = {}
+        tags = config.tags
+        (block_pattern, var_pattern) = (
+            f"{re.escape(tag.begin)}([^\\n{re.escape(tag.begin[:1])}{re.escape(tag.end[:1])}]+){re.escape(tag.end)}"
+            for tag in (tags.block_start, tags.variable))
+        self.__tag_regex = re.compile(
+            f"{re.escape(tags.std_last_first_start.str)}|{re.escape(tags.char_repeat.str)}|"
+            f"{block_pattern}|{var_pattern}")
+        self.__block_regex = re.compile(block_pattern)
+        self.__var_regex = re.compile(var_pattern)
+        self.nodes: list[TemplateNode] = self.__parse(0, len(template), None)
+
+    @property
+    def source(self) -> str:
+        """
+        Property method that returns the Python source code of the function rendering the template if
+        the code generation is enabled.
+
+        Returns:
+            str: Source code of the ``render_root`` function and the functions it uses.
+        """
+        return _RenderCodeGenerator(self.nodes, self.config).source
+
+    def __getstate__(self) -> dict:
+        """
+        Returns the state of the compiled template for pickling without the generated function.
+
+        Returns:
+            dict: Attributes of the compiled template.
+        """
+        state = self.__dict__.copy()
+        state["_CompiledTemplate__render_functions"] = {}
+        return state
+
+    def render(self, block_data: object | dict, workers: int = 1, shard_size: int = 10000) -> str:
+        """
+        Renders the template filled with the data from a specified object or dictionary following the same
+        rules as the :meth:`Block.fill` method.
+
+        Args:
+            block_data (object | dict): Object or dictionary with the attribute-value or key-value pairs to be
+                used for filling the template.
+            workers (int, optional): Number of worker processes rendering the top-level lists longer than
+                the ``shard_size`` split into shards. The list items must be picklable if more than one worker is
+                used. The rendered content is the same as without the workers. Defaults to 1, i.e. the lists
+                are rendered in the calling process.
+            shard_size (int, optional): Number of list items rendered by a worker process at once. Defaults to
+                10000.
+
+        Returns:
+            str: Filled template content.
+        """
+        blk = Block(config=self.config)
+        blk.template = self.template
+        # pylint: disable=protected-access
+        # rationale: The block is filled directly using the already compiled template to avoid parsing it again.
+        if workers > 1 and not (_get_data_accessor(block_data.__class__) is None or _get_data_scope(block_data)[2]):
+            try:
+                return self._render_nodes(block_data, workers, shard_size)
+            except _InexactRenderError:
+                blk._fill_textual(block_data)
+                return blk.content
+        blk._fill_compiled(self, block_data)
+        return blk.content
+
+    def render_to(self, output: TextIO, block_data: object | dict) -> None:
+        """
+        Renders the template filled with the data from a specified object or dictionary following the same
+        rules as the :meth:`render` method and writes the filled content into the output. The finished lines of
+        the content are written as soon as they are rendered, i.e. the whole content is not kept in memory.
+
+        .. note::
+            If the data contain a ``fill_hndl`` handler for the whole template, an iterator, e.g. a generator, or if
+            the template cannot be rendered in a single walk through the nodes, then the content is filled as
+            a whole before it is written.
+
+        Args:
+            output (TextIO): Text file or other object with the ``write`` method into which the content is written.
+            block_data (object | dict): Object or dictionary with the attribute-value or key-value pairs to be
+                used for filling the template.
+
+        Raises:
+            RuntimeError: If the template had to be filled as a whole after some of the lines were already written
+                and the filled content does not start with them. The output already contains the written lines
+                in that case.
+        """
+        if _get_data_accessor(block_data.__class__) is None or _get_data_scope(block_data)[2]:
+            output.write(self.render(block_data))
+            return
+        renderer = _TemplateRenderer(self.config, _get_data_scope(block_data)[0], self.__tag_regex, output)
+        try:
+            self.__render_root(renderer)
+        except _InexactRenderError:
+            blk = Block(config=self.config)
+            blk.template = self.template
+            # pylint: disable=protected-access
+            # rationale: The compiled rendering is already known to fail, so the textual filling is used directly.
+            blk._fill_textual(block_data)
+            content = blk.content
+            # The lines already written into the output are the same as the beginning of the filled content.
+            if zlib.crc32(content[: renderer.written_len].encode("utf-8")) != renderer.written_crc:
+                raise RuntimeError("Streamed content differs from the filled template content.") from None
+            output.write(content[renderer.written_len:])
+            return
+        renderer.write("".join(renderer.out))
+
+    async def render_async(self, block_data: object | dict) -> str:
+        """
+        Renders the template the same way as the :meth:`render` method, but in a worker thread without blocking
+        the event loop, with the same additional data as the :meth:`Block.fill_async` method, i.e. asynchronous
+        iterables and coroutine ``fill_hndl`` handlers awaited in the event loop calling this method.
+
+        Args:
+            block_data (object | dict): Object or dictionary with the attribute-value or key-value pairs to be
+                used for filling the template.
+
+        Returns:
+            str: Filled template content.
+        """
+        return await _run_async(self.render, block_data)
+
+    async def render_to_async(self, output: object, block_data: object | dict) -> None:
+        """
+        Renders the template the same way as the :meth:`render_to` method, but in a worker thread without blocking
+        the event loop (see the :meth:`render_async` method). The finished lines are written into the output as
+        soon as they are rendered.
+
+        Args:
+            output (object): Object with the ``write`` method into which the content is written. The ``write``
+                method can be a coroutine function, e.g. of an asynchronous file. If the output also has a ``drain``
+                coroutine method, e.g. ``asyncio.StreamWriter``, then it is awaited after each write.
+            block_data (object | dict): Object or dictionary with the attribute-value or key-value pairs to be
+                used for filling the template.
+        """
+        await _run_async(self.render_to, _AsyncWriter(output), block_data)
+
+    def _render_nodes(self, block_data: object | dict, workers: int = 1, shard_size: int = 0) -> str:
+        """
+        Renders the template by walking through its nodes. Special tags in the top-level block are not set,
+        because they are set only when the block is set into its parent block.
+
+        Args:
+            block_data (object | dict): Object or dictionary with the data to be filled into the template.
+            workers (int, optional): Number of worker processes rendering the shards of the top-level lists.
+                Defaults to 1, i.e. the lists are not split into shards.
+            shard_size (int, optional): Number of list items in a shard. Defaults to 0.
+
+        Returns:
+            str: Filled template content.
+
+        Raises:
+            _InexactRenderError: If the rendered content could be different from the textual filling.
+        """
+        renderer = _TemplateRenderer(self.config, _get_data_scope(block_data)[0], self.__tag_regex)
+        (renderer.workers, renderer.shard_size) = (workers, shard_size)
+        self.__render_root(renderer)
+        return "".join(renderer.out)
+
+    def _render_fragments(self, scope: dict, fragments: dict[int, tuple[object, str]],
+                          dependencies: list[tuple[str, ...]]) -> tuple[str, int]:
+        """
+        Renders the template by walking through its top-level nodes and reuses the content of the top-level blocks
+        rendered previously if the data values the block depends on are the same.
+
+        Args:
+            scope (dict): Data scope of the top-level block.
+            fragments (dict[int, tuple[object, str]]): Data snapshots and the rendered content of the top-level
+                blocks indexed by the node index. The fragments of the rendered blocks are updated by this method.
+            dependencies (list[tuple[str, ...]]): Tag names used in each of the top-level nodes.
+
+        Returns:
+            tuple[str, int]: Filled template content and the number of reused blocks.
+
+        Raises:
+            _InexactRenderError: If the rendered content could be different from the textual filling.
+        """
+        renderer = _TemplateRenderer(self.config, scope, self.__tag_regex)
+        frame = _RenderFrame(None, None, -1, 0, 0)
+        out = renderer.out
+        reused = 0
+        for (idx, node) in enumerate(self.nodes):
+            # The block content can be reused only if it starts at the line start, i.e. it is not joined with
+            # the previous content that could form the tags together with the block content.
+            if not isinstance(node, BlockNode) or node.single_line or not (_ends_line(out) or not any(out)):
+                fragments.pop(idx, None)
+                renderer.render_nodes([node], frame)
+                continue
+            try:
+                snapshot = _get_data_snapshot({name: scope[name] for name in dependencies[idx] if name in scope})
+            except (TypeError, copy.Error):
+                snapshot = None
+            fragment = fragments.get(idx)
+            if snapshot is not None and fragment is not None and fragment[0] == snapshot:
+                out.append(fragment[1])
+                reused += 1
+                continue
+            start = len(out)
+            renderer.render_nodes([node], frame)
+            if snapshot is None:
+                fragments.pop(idx, None)
+            else:
+                fragments[idx] = (snapshot, "".join(out[start:]))
+        return ("".join(out), reused)
+
+    def __render_root(self, renderer: _TemplateRenderer) -> None:
+        """
+        Renders the top-level nodes of the template using the specified renderer.
+
+        Args:
+            renderer (_TemplateRenderer): Renderer collecting the output.
+
+        Raises:
+            _InexactRenderError: If the rendered content could be different from the textual filling.
+        """
+        if self.codegen and renderer.output is None:
+            profiled = _active_profiler is not None
+            render_function = self.__render_functions.get(profiled)
+            if render_function is None:
+                generator = _RenderCodeGenerator(self.nodes, self.config, profiled)
+                # pylint: disable=exec-used
+                # rationale: The source code is generated from the template nodes, not from the user input.
+                exec(compile(generator.source, "<blocky template>", "exec"), generator.namespace)
+                render_function = self.__render_functions[profiled] = generator.namespace["render_root"]
+            render_function(renderer)
+            return
+        renderer.render_nodes(self.nodes, _RenderFrame(None, None, -1, 0, 0))
+
+    def __parse(self, start: int, end: int, parent: BlockNode | None) -> list[TemplateNode]:
+        """
+        Parses a part of the template into a list of nodes.
+
+        Args:
+            start (int): Start position of the parsed part, i.e. the parent block content.
+            end (int): End position of the parsed part.
+            parent (BlockNode | None): Parent block node or ``None`` for the top-level part.
+
+        Returns:
+            list[TemplateNode]: List of template nodes.
+        """
+        text = self.template
+        nodes = []
+        pos = search_pos = std_pos = start
+        misplaced = set()
+        while True:
+            match = self.__tag_regex.search(text, search_pos, end)
+            if match is None:
+                break
+            (node, span_start, span_end) = self.__parse_tag(match, start, end, pos, parent)
+            if node is None:
+                search_pos = match.start() + 1
+                continue
+            if isinstance(node, StdLastFirstNode):
+                # End tag placed before the start tag stops processing of the tags by the textual filling.
+                if text.find(self.config.tags.std_last_first_end.str, std_pos, match.start()) >= 0:
+                    misplaced.add(id(node))
+                std_pos = span_end
+            if span_start > pos:
+                nodes.append(TextNode(text[pos: span_start], self.__is_closing(text[pos: span_start])))
+            nodes.append(node)
+            pos = search_pos = span_end
+        if pos < end:
+            nodes.append(TextNode(text[pos: end], self.__is_closing(text[pos: end])))
+        for (idx, node) in enumerate(nodes):
+            if isinstance(node, BlockNode):
+                self.__set_fragile(nodes, idx)
+                if id(node) in misplaced or self.__is_ambiguous(node):
+                    # Nested blocks with the same name, parent block variations spanning the block or misplaced
+                    # end tags could be paired with different tags by the textual filling.
+                    node.fragile = node.scoped_fragile = True
+                    node.line_start_fixed = False
+        return nodes
+
+    def __parse_tag(self, match: re.Match, ctx_start: int, ctx_end: int, min_pos: int, parent: BlockNode | None) \
+            -> tuple[TemplateNode | None, int, int]:
+        """
+        Parses a node starting with the tag found in a part of the template.
+
+        Args:
+            match (re.Match): Match of the tag.
+            ctx_start (int): Start position of the parsed part, i.e. the parent block content.
+            ctx_end (int): End position of the parsed part.
+            min_pos (int): Minimal position of the node span start, i.e. the end of previous node.
+            parent (BlockNode | None): Parent block node or ``None`` for the top-level part.
+
+        Returns:
+            tuple[TemplateNode | None, int, int]: Node with its start and end position in the template. Node is
+                ``None`` if the tag does not start any node, e.g. a block start tag without the end tag.
+        """
+        text = self.template
+        tags = self.config.tags
+        tag_str = match.group(0)
+        tag_start = match.start()
+        if tag_str == tags.std_last_first_start.str:
+            return self.__parse_block(match, ctx_start, ctx_end, min_pos, parent)
+        if tag_str == tags.char_repeat.str:
+            return self.__parse_char_repeat(tag_start, match.end(), ctx_end)
+        if parent is not None and tag_str == tags.block_variation.str_name(parent.name):
+            return (VariationNode(tag_str), tag_start, match.end())
+        block_match = self.__block_regex.match(text, tag_start, ctx_end)
+        parsed = self.__parse_block(block_match, ctx_start, ctx_end, min_pos, parent) if block_match else None
+        if parsed and parsed[0] is not None:
+            return parsed
+        var_match = self.__var_regex.match(text, tag_start, ctx_end)
+        if var_match:
+            name = var_match.group(1)
+            node = VariableNode(var_match.group(0), name, text.find(tags.block_end.str_name(name), ctx_end) >= 0)
+            return (node, tag_start, var_match.end())
+        return (None, tag_start, match.end())
+
+    def __parse_char_repeat(self, tag_start: int, tag_end: int, ctx_end: int) -> tuple[CharRepeatNode | None, int, int]:
+        """
+        Parses a *char repeat* tag together with the following characters to be repeated.
+
+        Args:
+            tag_start (int): Start position of the tag.
+            tag_end (int): End position of the tag.
+            ctx_end (int): End position of the parent block content.
+
+        Returns:
+            tuple[CharRepeatNode | None, int, int]: Node with its start and end position in the template. Node is
+                ``None`` if the tag is placed at the end of the parent block content.
+        """
+        text = self.template
+        if tag_end < ctx_end and text[tag_end] == self.config.tags.variable.begin[:1]:
+            # Repeated char is known only after the following tag is filled by the textual filling.
+            return (CharRepeatNode(text[tag_start: tag_end], ""), tag_start, tag_end)
+        span_end = tag_end
+        while span_end < ctx_end and text[span_end] == text[tag_end]:
+            span_end += 1
+        node = CharRepeatNode(text[tag_start: span_end], text[tag_end]) if span_end > tag_end else None
+        return (node, tag_start, span_end)
+
+    def __parse_block(self, tag_match: re.Match, ctx_start: int, ctx_end: int, min_pos: int,
+                      parent: BlockNode | None) -> tuple[BlockNode | None, int, int]:
+        """
+        Parses a block starting at the specified position of the template.
+
+        Args:
+            tag_match (re.Match): Match of the block start tag, i.e. a match of the block start tag pattern or
+                the *std last first* start tag.
+            ctx_start (int): Start position of the parent block content.
+            ctx_end (int): End position of the parent block content.
+            min_pos (int): Minimal position of the block span start, i.e. the end of previous node.
+            parent (BlockNode | None): Parent block node or ``None`` for the top-level blocks.
+
+        Returns:
+            tuple[BlockNode | None, int, int]: Block node with its start and end position in the template.
+                Node is ``None`` if the block end tag is not found.
+        """
+        tags = self.config.tags
+        if tag_match.re is self.__block_regex:
+            (name, node_class) = (tag_match.group(1), BlockNode)
+            end_tag = tags.block_end.str_name(name)
+        else:
+            (name, node_class) = (tags.std_last_first_start.name, StdLastFirstNode)
+            end_tag = tags.std_last_first_end.str
+        span = _find_block_span(self.template, tag_match.group(0), end_tag, tag_match.start(), ctx_start, ctx_end)
+        if span is None or span[0] < min_pos:
+            return (None, tag_match.start(), tag_match.start())
+        node = node_class(self.template, span, name, parent, self.config)
+        node.context_sensitive = self.__is_context_sensitive(tag_match, end_tag, span, ctx_start, ctx_end)
+        node.first_line = "\n" not in self.template[ctx_start: tag_match.start()]
+        node.set_nodes(self.__parse(span[1], span[2], node))
+        return (node, span[0], span[3])
+
+    def __is_context_sensitive(self, tag_match: re.Match, end_tag: str, span: tuple[int, int, int, int],
+                               ctx_start: int, ctx_end: int) -> bool:
+        """
+        Checks whether the block position depends on the parent block content in which it is searched.
+
+        Args:
+            tag_match (re.Match): Match of the block start tag.
+            end_tag (str): Block end tag string.
+            span (tuple[int, int, int, int]): Span of the block found in the parent block content.
+            ctx_start (int): Start position of the parent block content.
+            ctx_end (int): End position of the parent block content.
+
+        Returns:
+            bool: True if the block could be found at a different position in the content of another parent block.
+        """
+        text = self.template
+        (tag_pos, start_tag) = (tag_match.start(), tag_match.group(0))
+        end_pos = text.find(end_tag, tag_pos + len(start_tag), ctx_end)
+        # Lines of the block tags reaching the parent block content boundaries are joined with the surrounding
+        # content of another parent block if the parent block content is set into it before filling the block.
+        return "\n" not in text[ctx_start: tag_pos] or "\n" not in text[tag_pos: ctx_end] or \
+            "\n" not in text[ctx_start: end_pos] or "\n" not in text[end_pos: ctx_end] or \
+            span != _find_block_span(text, start_tag, end_tag, tag_pos, 0, len(text))
+
+    def __set_fragile(self, nodes: list[TemplateNode], idx: int) -> None:
+        """
+        Sets the flags of a block node indicating that the filled content surrounding the block tags can change
+        the block position.
+
+        Args:
+            nodes (list[TemplateNode]): Nodes of the parent block content.
+            idx (int): Index of the block node.
+        """
+        tags = self.config.tags
+        node = nodes[idx]
+        open_pos = node.open_raw.rfind(tags.block_start.begin[:1])
+        close_pos = node.close_raw.find(tags.block_end.begin[:1])
+        before_open = _get_line_state((*reversed(nodes[:idx]), node.open_raw[:open_pos]), True)
+        after_close = _get_line_state(
+            (node.close_raw[node.close_raw.find(tags.block_end.end[:1], close_pos) + 1:], *nodes[idx + 1:]), False)
+        # Subblocks of a block filled in a new data scope are filled only after the block is extracted from
+        # its parent, while the *std last first* tags are always processed after their content is filled.
+        for static_blocks in (False, not isinstance(node, StdLastFirstNode)):
+            after_open = _get_line_state(
+                (node.open_raw[node.open_raw.find(tags.block_start.end[:1], open_pos) + 1:], *node.nodes),
+                False, static_blocks)
+            before_close = _get_line_state((*reversed(node.nodes), node.close_raw[:close_pos]), True, static_blocks)
+            # Block tag lines are fixed if they contain a static text or if they are known to contain only
+            # the block tag and the static empty space.
+            fixed = not (after_open is None or before_close is None or (after_close is None and not before_close))
+            fragile = not fixed or (before_open is None and not after_open)
+            if static_blocks:
+                node.scoped_fragile = fragile
+                node.line_start_fixed = fragile and fixed and node.parent is None and nodes[idx - 1].raw.endswith("\n")
+            else:
+                node.fragile = fragile
+
+    def __is_ambiguous(self, node: BlockNode) -> bool:
+        """
+        Checks whether the block content contains the tags that could be paired with the block tags by the textual
+        filling, i.e. the start tag of the same block or the variation tag of the parent block.
+
+        Args:
+            node (BlockNode): Block node.
+
+        Returns:
+            bool: True if the block tags could be paired differently by the textual filling.
+        """
+        tags = self.config.tags
+        content = node.raw[len(node.open_raw): len(node.raw) - len(node.close_raw)]
+        start_tag = tags.std_last_first_start.str if isinstance(node, StdLastFirstNode) else \
+            tags.block_start.str_name(node.name)
+        separator = tags.block_variation.str_name(node.parent.name) if node.parent else ""
+        return start_tag in content or bool(separator and separator in content)
+
+    def __is_closing(self, text: str) -> bool:
+        """
+        Checks whether the static text starts with the end of a tag, i.e. whether it can join the preceding output
+        into a tag.
+
+        Args:
+            text (str): Static text.
+
+        Returns:
+            bool: True if the text can finish a tag started in the preceding output.
+        """
+        tags = self.config.tags
+        end_pos = text.find(tags.variable.end[-1:])
+        return end_pos >= 0 and tags.variable.begin[:1] not in text[:end_pos] and "\n" not in text[:end_pos]
+
+
+def _get_tag_names(nodes: list[TemplateNode]) -> set[str]:
+    """
+    Returns the names of the variables and blocks used in the template nodes including the nested blocks.
+
+    Args:
+        nodes (list[TemplateNode]): Template nodes.
+
+    Returns:
+        set[str]: Tag names.
+    """
+    names = set()
+    for node in nodes:
+        if isinstance(node, VariableNode):
+            names.add(node.name)
+        elif isinstance(node, BlockNode):
+            names.add(node.name)
+            names.update(_get_tag_names(node.nodes))
+    return names
+
+
+class IncrementalRenderer:
+    """
+    Renderer of a :class:`CompiledTemplate` filled repeatedly with changing data, e.g. a status document
+    regenerated periodically with only a few values changed each time. The renderer remembers the content of
+    the top-level blocks rendered by the previous call together with a snapshot of the data values used in each
+    block. The blocks with unchanged data are not rendered again, their remembered content is reused instead.
+
+    .. note::
+        The rendered content is always the same as the content rendered by the :meth:`CompiledTemplate.render`
+        method. The content is reused only for the top-level blocks starting at the line start. The data values
+        are compared by their snapshots, i.e. objects are compared by their attributes, the ``fill_hndl``
+        handlers are expected to fill the same content for the same data and the blocks with data containing
+        iterators are always rendered again. The renderer is not meant to be shared by multiple threads.
+    """
+    def __init__(self, template: "str | Path | Block | CompiledTemplate",
+                 config: BlockConfig = DEFAULT_BLOCK_CONFIG) -> None:
+        """
+        Constructor.
+
+        Args:
+            template (str | Path | Block | CompiledTemplate): Path to the text file containing the template, template
+                string, block with the content to be used as a template or an already compiled template.
+            config (:class:`BlockConfig`, optional): Block configuration (template tags format, tabulator size, etc.)
+                used if the template is not a block or a compiled template already having its own configuration.
+        """
+        if isinstance(template, CompiledTemplate):
+            self.template = template
+        elif isinstance(template, Block):
+            self.template = CompiledTemplate(template.content, template.config)
+        elif _is_template_file(template):
+            self.template = template_cache.get_template(template, config=config)
+        else:
+            self.template = CompiledTemplate(f"{template}", config)
+        # Number of the top-level blocks reused by the last rendering.
+        self.reused_blocks = 0
+        self.__dependencies = [tuple(_get_tag_names([node])) for node in self.template.nodes]
+        self.__fragments: dict[int, tuple[object, str]] = {}
+        self.__signature: tuple[tuple[str, int], ...] = ()
+
+    def render(self, block_data: object | dict) -> str:
+        """
+        Renders the template filled with the data from a specified object or dictionary following the same
+        rules as the :meth:`Block.fill` method and reuses the content of the top-level blocks with the same data
+        as in the previous call of this method.
+
+        Args:
+            block_data (object | dict): Object or dictionary with the attribute-value or key-value pairs to be
+                used for filling the template.
+
+        Returns:
+            str: Filled template content.
+        """
+        self.reused_blocks = 0
+        if _get_data_accessor(block_data.__class__) is None or _get_data_scope(block_data)[2]:
+            self.__fragments.clear()
+            return self.template.render(block_data)
+        scope = _get_data_scope(block_data)[0]
+        # Order of the attributes and their kinds determine the order of the textual filling, i.e. the content
+        # of all blocks could be different if they are changed.
+        signature = tuple((name, 0 if _is_data_list(value) else 2 if isinstance(value, _SIMPLE_TYPES) else 1)
+                          for (name, value) in scope.items())
+        if signature != self.__signature:
+            self.__fragments.clear()
+            self.__signature = signature
+        try:
+            # pylint: disable=protected-access
+            # rationale: Rendering of the nodes is meant to be used only by the compiled template and its renderers.
+            (content, self.reused_blocks) = self.template._render_fragments(
+                scope, self.__fragments, self.__dependencies)
+        except _InexactRenderError:
+            self.__fragments.clear()
+            self.reused_blocks = 0
+            blk = Block(config=self.template.config)
+            blk.template = self.template.template
+            # pylint: disable=protected-access
+            # rationale: The compiled rendering is already known to fail, so the textual filling is used directly.
+            blk._fill_textual(block_data)
+            content = blk.content
+        return content
+
+
+class TemplateCacheInfo(NamedTuple):
+    """
+    Statistics of the :class:`TemplateCache` in the same form as the ``cache_info()`` of the ``functools.lru_cache``.
+    """
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class TemplateCache:
+    """
+    Least recently used cache of the templates loaded from files and compiled into :class:`CompiledTemplate`
+    objects. The templates are identified by the file path, the extracted subblock name and the block
+    configuration. A cached template is loaded again automatically if the modification time or size
+    of its file is changed.
+
+    The compiled templates can be also saved into files in a cache directory shared by multiple processes.
+    A template compiled by one process is then loaded by the other processes from the cache directory instead of
+    being parsed again. The files are identified by the hash of the template string and the tags format, i.e. they
+    do not need to be removed if the template files are changed. The cache files are loaded using the ``pickle``
+    module, so the cache directory must not be writable by untrusted users.
+
+    The process-wide instance of this class used by the :meth:`Block.load_template` method is available as
+    the ``blocky.template_cache`` object.
+    """
+    def __init__(self, maxsize: int = 128, cache_dir: str | Path | None = None) -> None:
+        """
+        Constructor.
+
+        Args:
+            maxsize (int, optional): Maximum number of cached templates. The least recently used templates are
+                evicted if the number is exceeded. Caching is disabled if set to 0. Defaults to 128.
+            cache_dir (str | Path | None, optional): Directory in which the compiled templates are saved to be
+                loaded by other processes. Created automatically if it does not exist. The compiled templates are
+                not saved if set to ``None``. Defaults to None.
+        """
+        self.__maxsize = maxsize
+        self.cache_dir: str | Path | None = cache_dir
+        # Cached templates with the (path, subblock name, config) keys and the (mtime, size, template) values.
+        self.__entries: OrderedDict[tuple[str, str, BlockConfig], tuple[int, int, CompiledTemplate]] = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def maxsize(self) -> int:
+        """
+        Property method that returns the maximum number of cached templates.
+
+        Returns:
+            int: Maximum number of cached templates.
+        """
+        return self.__maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int) -> None:
+        """
+        Setter method that sets the maximum number of cached templates and evicts the least recently used
+        templates exceeding the new maximum.
+
+        Args:
+            maxsize (int): Maximum number of cached templates.
+        """
+        with self.__lock:
+            self.__maxsize = maxsize
+            self.__evict()
+
+    def get_template(self, template_file_path: str | Path, subblock_name: str = "",
+                     config: BlockConfig = DEFAULT_BLOCK_CONFIG) -> CompiledTemplate:
+        """
+        Returns the compiled template loaded from the text file. The template is loaded from the file only if it
+        is not cached yet or if the file has been modified since it was cached.
+
+        Args:
+            template_file_path (str | Path): Path to the text file containing the template.
+            subblock_name (str, optional): Name of the subblock to be extracted from the file template. If not
+                specified, then the whole file template is returned. Defaults to an empty string "".
+            config (:class:`BlockConfig`, optional): Block configuration (template tags format, tabulator size, etc.)
+
+        Returns:
+            CompiledTemplate: Compiled template.
+        """
+        path = os.path.abspath(template_file_path)
+        stat = os.stat(path)
+        key = (path, subblock_name, config)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+                return entry[2]
+            self.__misses += 1
+
+        # Only the part of the file with the subblock is read if possible instead of reading the whole file.
+        template_str = _load_subblock_template(path, subblock_name, config) if subblock_name and stat.st_size \
+            else None
+        if template_str is None:
+            with open(path, "r", encoding="utf-8") as file_template:
+                template_str = file_template.read()
+            if subblock_name:
+                template_str = Block.from_string(template_str, subblock_name, config).template
+        compiled = self.__compile(template_str, config)
+        with self.__lock:
+            if self.__maxsize > 0:
+                self.__entries[key] = (stat.st_mtime_ns, stat.st_size, compiled)
+                self.__entries.move_to_end(key)
+                self.__evict()
+        return compiled
+
+    def info(self) -> TemplateCacheInfo:
+        """
+        Returns the cache statistics.
+
+        Returns:
+            TemplateCacheInfo: Numbers of cache hits and misses, maximum and current number of cached templates.
+        """
+        with self.__lock:
+            return TemplateCacheInfo(self.__hits, self.__misses, self.__maxsize, len(self.__entries))
+
+    def clear(self) -> None:
+        """
+        Removes all cached templates and resets the cache statistics.
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+    def __evict(self) -> None:
+        """
+        Removes the least recently used templates exceeding the maximum number of cached templates.
+        """
+        while len(self.__entries) > max(self.__maxsize, 0):
+            self.__entries.popitem(last=False)
+
+    def __compile(self, template: str, config: BlockConfig) -> CompiledTemplate:
+        """
+        Returns the compiled template string. If the cache directory is set, then the compiled template is loaded
+        from the cache directory if it has been already saved there, otherwise it is saved there after the template
+        is parsed.
+
+        Args:
+            template (str): Template string.
+            config (BlockConfig): Block configuration.
+
+        Returns:
+            CompiledTemplate: Compiled template.
+        """
+        cache_dir = self.cache_dir
+        if cache_dir is None:
+            return CompiledTemplate(template, config)
+        cache_path = Path(cache_dir, f"{_get_template_hash(template, config)}.pickle")
+        try:
+            with open(cache_path, "rb") as cache_file:
+                compiled = pickle.load(cache_file)
+            if isinstance(compiled, CompiledTemplate) and compiled.template == template:
+                compiled.config = config
+                return compiled
+        except FileNotFoundError:
+            pass
+        except Exception:   # pylint: disable=broad-exception-caught
+            # rationale: A damaged or incompatible cache file is ignored and replaced by the newly compiled template.
+            pass
+
+        compiled = CompiledTemplate(template, config)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # The cache file is written under a temporary name first, so other processes never load a partial file.
+            (tmp_fd, tmp_path) = tempfile.mkstemp(".tmp", cache_path.stem, cache_dir)
+            try:
+                with os.fdopen(tmp_fd, "wb") as tmp_file:
+                    pickle.dump(compiled, tmp_file, pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, RecursionError, pickle.PicklingError):
+            # The template is used even if it cannot be saved into the cache directory.
+            pass
+        return compiled
+
+
+# Process-wide cache of the templates loaded from files by the blocks.
+template_cache: TemplateCache = TemplateCache()
+
+
+class TemplateLoader(abc.ABC):
+    """
+    Base class of the template loaders providing the templates identified by names, e.g. from a directory,
+    a dictionary or package resources. The loaded templates are compiled only once and the blocks created by
+    the :meth:`load` method use the compiled templates for filling without parsing the templates again.
+    The derived classes define the abstract :meth:`get_source` method returning the template string.
+    """
+    def __init__(self, config: BlockConfig = DEFAULT_BLOCK_CONFIG) -> None:
+        """
+        Constructor.
+
+        Args:
+            config (:class:`BlockConfig`, optional): Block configuration (template tags format, tabulator size, etc.)
+                of the loaded templates.
+        """
+        self.config: BlockConfig = config
+        # Compiled templates with the (name, subblock name) keys and the (template source, template) values.
+        self.__templates: dict[tuple[str, str], tuple[str, CompiledTemplate]] = {}
+        self.__lock = threading.Lock()
+
+    @abc.abstractmethod
+    def get_source(self, name: str) -> str:
+        """
+        Returns the template string.
+
+        Args:
+            name (str): Template name.
+
+        Returns:
+            str: Template string.
+        """
+
+    def get_template(self, name: str, subblock_name: str = "") -> CompiledTemplate:
+        """
+        Returns the compiled template. The template is compiled again only if its template string is changed.
+
+        Args:
+            name (str): Template name.
+            subblock_name (str, optional): Name of the subblock to be extracted from the template. If not
+                specified, then the whole template is returned. Defaults to an empty string "".
+
+        Returns:
+            CompiledTemplate: Compiled template.
+        """
+        source = self.get_source(name)
+        key = (name, subblock_name)
+        with self.__lock:
+            entry = self.__templates.get(key)
+        if entry is not None and entry[0] == source:
+            return entry[1]
+        compiled = CompiledTemplate(
+            Block.from_string(source, subblock_name, self.config).template if subblock_name else source, self.config)
+        with self.__lock:
+            self.__templates[key] = (source, compiled)
+        return compiled
+
+    def load(self, name: str, subblock_name: str = "") -> Block:
+        """
+        Creates a new block object with the loaded template.
+
+        Args:
+            name (str): Template name.
+            subblock_name (str, optional): Name of the subblock to be extracted from the template. If not
+                specified, then the whole template is used. Defaults to an empty string "".
+
+        Returns:
+            Block: Block object named after the subblock or the last part of the template name.
+        """
+        blk = Block(config=self.config)
+        # pylint: disable=protected-access
+        # rationale: The compiled template can be set into the block only by the loaders and the block itself.
+        blk._set_compiled_template(self.get_template(name, subblock_name),
+                                   subblock_name if subblock_name else PurePath(name).name)
+        return blk
+
+
+class FileSystemLoader(TemplateLoader):
+    """
+    Template loader providing the templates from the text files in a directory. The template names are the file
+    paths relative to the directory. The templates are kept in the process-wide :class:`TemplateCache`, i.e. the
+    files are read and parsed again only if they have been modified.
+    """
+    def __init__(self, directory: str | Path, config: BlockConfig = DEFAULT_BLOCK_CONFIG) -> None:
+        """
+        Constructor.
+
+        Args:
+            directory (str | Path): Directory with the template files.
+            config (:class:`BlockConfig`, optional): Block configuration (template tags format, tabulator size, etc.)
+                of the loaded templates.
+        """
+        super().__init__(config)
+        self.directory: Path = Path(directory)
+
+    def get_source(self, name: str) -> str:
+        """
+        Returns the template string read from the template file.
+
+        Args:
+            name (str): Path to the template file relative to the directory.
+
+        Returns:
+            str: Template string.
+
+        Raises:
+            FileNotFoundError: If the template file does not exist.
+            ValueError: If the path leads outside of the directory.
+        """
+        return self.__get_path(name).read_text(encoding="utf-8")
+
+    def get_template(self, name: str, subblock_name: str = "") -> CompiledTemplate:
+        """
+        Returns the compiled template loaded from the template file by the process-wide :class:`TemplateCache`.
+
+        Args:
+            name (str): Path to the template file relative to the directory.
+            subblock_name (str, optional): Name of the subblock to be extracted from the template. If not
+                specified, then the whole template is returned. Defaults to an empty string "".
+
+        Returns:
+            CompiledTemplate: Compiled template.
+
+        Raises:
+            FileNotFoundError: If the template file does not exist.
+            ValueError: If the path leads outside of the directory.
+        """
+        return template_cache.get_template(self.__get_path(name), subblock_name, self.config)
+
+    def __get_path(self, name: str) -> Path:
+        """
+        Returns the path to the template file checked without accessing the file system.
+
+        Args:
+            name (str): Path to the template file relative to the directory.
+
+        Returns:
+            Path: Path to the template file.
+        """
+        rel_path = os.path.normpath(name)
+        if os.path.isabs(rel_path) or rel_path.split(os.sep)[0] == os.pardir:
+            raise ValueError(f"Template path '{name}' leads outside of the template directory.")
+        return Path(self.directory, rel_path)
+
+
+class DictLoader(TemplateLoader):
+    """
+    Template loader providing the template strings from a dictionary with the template names as keys.
+    The templates changed in the dictionary are compiled again when they are loaded.
+    """
+    def __init__(self, templates: dict[str, str], config: BlockConfig = DEFAULT_BLOCK_CONFIG) -> None:
+        """
+        Constructor.
+
+        Args:
+            templates (dict[str, str]): Dictionary with the template names and the template strings.
+            config (:class:`BlockConfig`, optional): Block configuration (template tags format, tabulator size, etc.)
+                of the loaded templates.
+        """
+        super().__init__(config)
+        self.templates: dict[str, str] = templates
+
+    def get_source(self, name: str) -> str:
+        """
+        Returns the template string from the dictionary.
+
+        Args:
+            name (str): Template name.
+
+        Returns:
+            str: Template string.
+
+        Raises:
+            KeyError: If the template is not defined in the dictionary.
+        """
+        return self.templates[name]
+
+
+class PackageLoader(TemplateLoader):
+    """
+    Template loader providing the templates from the resource files of a Python package, e.g. from the template
+    files installed together with the package. The resource files are read only once.
+    """
+    def __init__(self, package: str, directory: str = "templates", config: BlockConfig = DEFAULT_BLOCK_CONFIG) \
+            -> None:
+        """
+        Constructor.
+
+        Args:
+            package (str): Name of the package.
+            directory (str, optional): Directory with the template files within the package. Defaults to
+                "templates".
+            config (:class:`BlockConfig`, optional): Block configuration (template tags format, tabulator size, etc.)
+                of the loaded templates.
+        """
+        super().__init__(config)
+        self.package: str = package
+        self.directory: str = directory
+        self.__sources: dict[str, str] = {}
+
+    def get_source(self, name: str) -> str:
+        """
+        Returns the template string read from the package resource file.
+
+        Args:
+            name (str): Path to the template file relative to the package directory using slashes as separators.
+
+        Returns:
+            str: Template string.
+
+        Raises:
+            FileNotFoundError: If the template file does not exist.
+        """
+        source = self.__sources.get(name)
+        if source is None:
+            resource = importlib.resources.files(self.package).joinpath(self.directory)
+            for name_part in name.split("/"):
+                resource = resource.joinpath(name_part)
+            source = self.__sources[name] = resource.read_text(encoding="utf-8")
+        return source
+
+
+def _get_template_hash(template: str, config: BlockConfig) -> str:
+    """
+    Returns the hash identifying the compiled template in the cache directory of the :class:`TemplateCache`.
+    The hash is created from the template string, the tags format, the tabulator size and the module version.
+
+    Args:
+        template (str): Template string.
+        config (BlockConfig): Block configuration.
+
+    Returns:
+        str: Hexadecimal hash string.
+    """
+    tags = config.tags
+    config_str = "\0".join(
+        f"{tag.begin}\0{tag.name}\0{tag.end}" for tag in (
+            tags.variable, tags.block_start, tags.block_end, tags.block_variation, tags.char_repeat,
+            tags.std_last_first_start, tags.std_last_first_end))
+    template_hash = hashlib.sha256(f"{__version__}\0{config.tab_size}\0{config_str}\0".encode("utf-8"))
+    template_hash.update(template.encode("utf-8", "surrogatepass"))
+    return template_hash.hexdigest()
+
+
+def _load_subblock_template(path: str, subblock_name: str, config: BlockConfig) -> str | None:
+    """
+    Returns the template of a subblock from the text file without reading the whole file. The file is
+    memory-mapped and only the part with the subblock is decoded. The returned template is the same as
+    the template of the subblock extracted using the :meth:`Block.get_subblock` method from the whole file template.
+
+    Args:
+        path (str): Path to the text file containing the template.
+        subblock_name (str): Name of the subblock.
+        config (BlockConfig): Block configuration.
+
+    Returns:
+        str | None: Subblock template or ``None`` if the subblock is not found or if the subblock contains the
+            carriage return chars converted to the new line chars when the file is read as a whole.
+    """
+    start_tag = config.tags.block_start.str_name(subblock_name).encode("utf-8")
+    end_tag = config.tags.block_end.str_name(subblock_name).encode("utf-8")
+    with open(path, "rb") as file_template, mmap.mmap(file_template.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        tag_start = data.find(start_tag)
+        end = data.find(end_tag)
+        if tag_start < 0 or end < 0:
+            return None
+        # Skip the new line following the start tag and the indentation preceding the end tag the same way as the
+        # get_subblock() method. The new line byte cannot be a part of other UTF-8 encoded chars.
+        start = tag_start + len(start_tag)
+        next_nl = data.find(b"\n", start) + 1
+        if data.find(b"\r", tag_start, max(next_nl, end)) >= 0:
+            return None
+        if next_nl > 0 and not data[start: next_nl].decode("utf-8").strip():
+            start = next_nl
+        last_nl = data.rfind(b"\n", start, end) + 1
+        if last_nl > 0 and not data[last_nl: end].decode("utf-8").strip():
+            end = last_nl
+        return data[start: end].decode("utf-8") if start < end else ""
+
+
+class BlockProfileStats(NamedTuple):
+    """
+    Statistics of an operation performed on the blocks with the same path collected by the :class:`BlockProfiler`.
+    """
+    path: str
+    operation: str
+    calls: int
+    total_time: float
+    self_time: float
+    scans: int
+    copied_chars: int
+
+
+class BlockProfiler:
+    """
+    Profiler measuring the time spent in the operations performed on the :class:`Block` objects, i.e. in the
+    :meth:`Block.fill`, :meth:`Block.set`, :meth:`Block.clone`, :meth:`Block.get_subblock`,
+    :meth:`Block.set_variables` and :meth:`Block.clear_variables` methods and in the passes setting the
+    *char repeat* and *std last first* tags. The operations are recorded separately for each block path consisting
+    of the names of the parent blocks and the block itself, e.g. ``file.txt/ITEMS/ROW``, together with the number
+    of searches in the block content and the number of content characters copied by the operation.
+
+    Blocks filled by a :class:`CompiledTemplate`, e.g. by the :meth:`Block.fill` method, are recorded the same way
+    as the ``render`` operations of the subblocks and the ``char_repeat`` and ``std_last_first`` operations of
+    the blocks containing the special tags, including the blocks rendered by the generated code.
+
+    The profiler is enabled using the ``with`` statement or the :meth:`start` and :meth:`stop` methods. The block
+    and template node methods are replaced by the measuring ones only while the profiler is enabled, i.e.
+    the blocks are not slowed down if the profiler is not used. Only one profiler can be enabled at a time.
+
+    .. code-block::
+
+        with BlockProfiler() as profiler:
+            blk.fill(data)
+        print(profiler.summary())
+    """
+    def __init__(self, callback: Callable[[str, str, float], None] | None = None) -> None:
+        """
+        Constructor.
+
+        Args:
+            callback (Callable[[str, str, float], None], optional): Tracer function called after each finished
+                operation with the block path, the operation name and the operation time in seconds.
+                Defaults to None.
+        """
+        self.callback: Callable[[str, str, float], None] | None = callback
+        # Recorded stacks of the (block path, operation) pairs with the [calls, total time, self time, scans,
+        # copied chars] values. The time, scans and copied chars of an operation do not include the nested operations.
+        self.__records: dict[tuple[tuple[str, str], ...], list] = {}
+        # Original block and template node methods replaced by the measuring ones while the profiler is enabled.
+        self.__methods: dict[tuple[type, str], Callable] = {}
+        # Stacks of the running operations in the form of [block path, operation, nested time, scans, copied chars,
+        # path of the filled block] lists for each thread. The filled block path is the path of the block which
+        # template is rendered by the nodes of the operation.
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+
+    def __enter__(self) -> "BlockProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """
+        Enables the profiler, i.e. replaces the :class:`Block` and template node methods by the methods measuring
+        them.
+
+        Raises:
+            RuntimeError: Another profiler is already enabled.
+        """
+        # pylint: disable=global-statement
+        # rationale: The block methods are replaced for the whole process, so only one profiler can be enabled.
+        global _active_profiler
+        if _active_profiler is self:
+            return
+        if _active_profiler is not None:
+            raise RuntimeError("Another block profiler is already enabled.")
+        _active_profiler = self
+        for (method_name, operation) in _PROFILED_OPERATIONS.items():
+            method = self.__methods[(Block, method_name)] = Block.__dict__[method_name]
+            setattr(Block, method_name, self.__measure_operation(method, operation))
+        for (method_name, counter) in _PROFILED_COUNTERS.items():
+            method = self.__methods[(Block, method_name)] = Block.__dict__[method_name]
+            setattr(Block, method_name, self.__count_scans(method, counter))
+        for (node_class, operation) in _PROFILED_NODE_OPERATIONS.items():
+            method = self.__methods[(node_class, "render")] = node_class.__dict__["render"]
+            setattr(node_class, "render", self.__measure_node_render(method, operation))
+
+    def stop(self) -> None:
+        """
+        Disables the profiler, i.e. restores the original :class:`Block` and template node methods. The recorded
+        statistics are kept.
+        """
+        # pylint: disable=global-statement
+        # rationale: The block methods are replaced for the whole process, so only one profiler can be enabled.
+        global _active_profiler
+        if _active_profiler is not self:
+            return
+        for ((owner_class, method_name), method) in self.__methods.items():
+            setattr(owner_class, method_name, method)
+        self.__methods = {}
+        _active_profiler = None
+
+    def reset(self) -> None:
+        """
+        Removes all recorded statistics.
+        """
+        with self.__lock:
+            self.__records = {}
+
+    def stats(self) -> list[BlockProfileStats]:
+        """
+        Returns the statistics of the operations performed on the blocks with the same path sorted from the longest
+        total time. The total time includes the time of the nested operations, e.g. of a subblock set from a filled
+        block, and the self time, number of scans and copied chars include only the operation itself.
+
+        Returns:
+            list[BlockProfileStats]: Statistics of the operations.
+        """
+        stats = {}
+        with self.__lock:
+            for (stack, (calls, total_time, self_time, scans, copied)) in self.__records.items():
+                values = stats.setdefault(stack[-1], [0, 0.0, 0.0, 0, 0])
+                values[0] += calls
+                # Time of the recursive calls of the same operation is already included in the outer call.
+                if stack[-1] not in stack[: -1]:
+                    values[1] += total_time
+                values[2] += self_time
+                values[3] += scans
+                values[4] += copied
+        return sorted((BlockProfileStats(*key, *values) for (key, values) in stats.items()),
+                      key=lambda stat: stat.total_time, reverse=True)
+
+    def summary(self) -> str:
+        """
+        Returns a text table with the statistics of the operations performed on the blocks (see :meth:`stats`).
+
+        Returns:
+            str: Table with the statistics.
+        """
+        rows = [("block", "operation", "calls", "total [ms]", "self [ms]", "scans", "copied chars")]
+        rows.extend((stat.path, stat.operation, f"{stat.calls}", f"{stat.total_time * 1e3:.3f}",
+                     f"{stat.self_time * 1e3:.3f}", f"{stat.scans}", f"{stat.copied_chars}") for stat in self.stats())
+        widths = [max(len(row[col]) for row in rows) for col in range(len(rows[0]))]
+        return "\n".join(
+            "  ".join(cell.ljust(width) if col < 2 else cell.rjust(width)
+                      for (col, (cell, width)) in enumerate(zip(row, widths))).rstrip()
+            for row in rows)
+
+    def collapsed_stacks(self) -> str:
+        """
+        Returns the self times of the recorded operation stacks in the collapsed stack format used by the flame
+        graph tools, i.e. one ``block:operation;subblock:operation time`` line for each stack with the time in
+        microseconds.
+
+        Returns:
+            str: Collapsed stacks separated by new line chars.
+        """
+        with self.__lock:
+            lines = [f"{';'.join(f'{path}:{operation}' for (path, operation) in stack)} {round(values[2] * 1e6)}"
+                     for (stack, values) in self.__records.items()]
+        return "".join(f"{line}\n" for line in lines)
+
+    def __get_stack(self) -> list[list]:
+        """
+        Returns the stack of the running operations of the actual thread.
+
+        Returns:
+            list[list]: Stack of the running operations.
+        """
+        stack = getattr(self.__local, "stack", None)
+        if stack is None:
+            stack = self.__local.stack = []
+        return stack
+
+    def __measure_operation(self, method: Callable, operation: str) -> Callable:
+        """
+        Returns a block method measuring the time of the original block method.
+
+        Args:
+            method (Callable): Original block method.
+            operation (str): Operation name.
+
+        Returns:
+            Callable: Measuring block method.
+        """
+        @wraps(method)
+        def measure(blk: Block, *args, **kwargs) -> object:
+            path = _get_block_path(blk)
+            return self.__measure(path, path, operation, method, blk, *args, **kwargs)
+        return measure
+
+    def __measure_node_render(self, method: Callable, operation: str) -> Callable:
+        """
+        Returns a template node ``render`` method measuring the time of the original method.
+
+        Args:
+            method (Callable): Original ``render`` method.
+            operation (str): Operation name.
+
+        Returns:
+            Callable: Measuring ``render`` method.
+        """
+        @wraps(method)
+        def measure(node: TemplateNode, renderer: _TemplateRenderer, frame: _RenderFrame) -> object:
+            # Special tags are recorded as the operations of the rendered block containing them the same way as
+            # the passes setting the special tags in the block content by the textual filling.
+            return self._measure_node(node if operation == "render" else frame.owner, operation, method,
+                                      node, renderer, frame)
+        return measure
+
+    def _measure_node(self, node: BlockNode | None, operation: str, function: Callable, *args) -> object:
+        """
+        Calls a function rendering the template nodes and records its time as an operation performed on a block
+        node of the template rendered by the running operation.
+
+        Args:
+            node (BlockNode | None): Block node or ``None`` for the top-level nodes of the template.
+            operation (str): Operation name.
+            function (Callable): Function rendering the nodes.
+            *args: Function arguments.
+
+        Returns:
+            object: Value returned by the function.
+        """
+        stack = self.__get_stack()
+        base_path = stack[-1][5] if stack else "<root>"
+        names = []
+        while node is not None:
+            # The *std last first* tags are not blocks in the path of the blocks they contain.
+            if not isinstance(node, StdLastFirstNode):
+                names.append(node.name)
+            node = node.parent
+        return self.__measure("/".join((base_path, *reversed(names))), base_path, operation, function, *args)
+
+    def __measure(self, path: str, base_path: str, operation: str, function: Callable, *args, **kwargs) -> object:
+        """
+        Calls a function and records its time as an operation performed on a block.
+
+        Args:
+            path (str): Block path.
+            base_path (str): Path of the block which template is rendered by the nested template nodes.
+            operation (str): Operation name.
+            function (Callable): Measured function.
+            *args: Function arguments.
+            **kwargs: Function keyword arguments.
+
+        Returns:
+            object: Value returned by the function.
+        """
+        stack = self.__get_stack()
+        frame = [path, operation, 0.0, 0, 0, base_path]
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            total_time = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][2] += total_time
+            key = (*((item[0], item[1]) for item in stack), (frame[0], operation))
+            with self.__lock:
+                values = self.__records.setdefault(key, [0, 0.0, 0.0, 0, 0])
+                values[0] += 1
+                values[1] += total_time
+                values[2] += total_time - frame[2]
+                values[3] += frame[3]
+                values[4] += frame[4]
+            if self.callback:
+                self.callback(frame[0], operation, total_time)
+
+    def __count_scans(self, method: Callable, counter: Callable[[Block, tuple, object], tuple[int, int]]) -> Callable:
+        """
+        Returns a block method counting the content scans and copied chars of the original block method into
+        the running operation.
+
+        Args:
+            method (Callable): Original block method.
+            counter (Callable[[Block, tuple, object], tuple[int, int]]): Function returning the number of scans and
+                copied chars from the block, the method arguments and its return value.
+
+        Returns:
+            Callable: Counting block method.
+        """
+        @wraps(method)
+        def count(blk: Block, *args, **kwargs) -> object:
+            ret = method(blk, *args, **kwargs)
+            stack = self.__get_stack()
+            if stack:
+                (scans, copied) = counter(blk, args, ret)
+                stack[-1][3] += scans
+                stack[-1][4] += copied
+            return ret
+        return count
+
+
+# Enabled block profiler.
+_active_profiler: BlockProfiler | None = None
+# Block methods measured by the profiler with the names of the operations.
+_PROFILED_OPERATIONS = {
+    "fill": "fill",
+    "set": "set",
+    "clone": "clone",
+    "get_subblock": "get_subblock",
+    "set_variables": "set_variables",
+    "clear_variables": "clear_variables",
+    "_Block__set_char_repeat_tag": "char_repeat",
+    "_Block__set_std_last_first_tag": "std_last_first"}
+# Template node classes which ``render`` methods are measured by the profiler with the names of the operations.
+_PROFILED_NODE_OPERATIONS = {
+    BlockNode: "render",
+    StdLastFirstNode: "std_last_first",
+    CharRepeatNode: "char_repeat"}
+# pylint: disable=protected-access
+# rationale: The profiler counts the scans and copies of the block content done by the private block methods.
+# Block methods scanning or copying the block content with the functions returning the number of scans and copied
+# chars from the block, method arguments and return value.
+_PROFILED_COUNTERS = {
+    "_Block__get_subblock_start_end_pos": lambda blk, args, ret: (1, 0),
+    "_Block__replace_variables": lambda blk, args, ret: (1, len(blk._Block__content)),
+    "_Block__replace_content": lambda blk, args, ret: (0, len(blk._Block__content)),
+    "_Block__join_content_chunks": lambda blk, args, ret: (0, len(blk._Block__content)),
+    # The char repeat tag found in the content is replaced by the repeated chars, i.e. the content is copied.
+    "_Block__get_char_repeat_data": lambda blk, args, ret: (
+        1, len(args[0]) if len(args) > 1 and args[1] else len(blk._Block__content) if ret[0] >= 0 else 0)}
+# pylint: enable=protected-access
+
+
+def _profile_node(function: Callable, node: BlockNode) -> Callable:
+    """
+    Returns a function measuring a generated function rendering a block node as the ``render`` operation of
+    the block if the :class:`BlockProfiler` is enabled.
+
+    Args:
+        function (Callable): Generated function with the renderer and render frame arguments.
+        node (BlockNode): Block node rendered by the function.
+
+    Returns:
+        Callable: Measuring function.
+    """
+    @wraps(function)
+    def measure(renderer: _TemplateRenderer, frame: _RenderFrame) -> object:
+        if _active_profiler is None:
+            return function(renderer, frame)
+        # pylint: disable=protected-access
+        # rationale: The profiler records the generated functions the same way as the template node methods.
+        return _active_profiler._measure_node(node, "render", function, renderer, frame)
+    return measure
+
+
+def _get_block_path(blk: Block) -> str:
+    """
+    Returns the path of a block consisting of the names of its parent blocks and its own name separated by slashes.
+
+    Args:
+        blk (Block): Block.
+
+    Returns:
+        str: Block path.
+    """
+    names = []
+    while blk is not None:
+        names.append(blk.name or "<root>")
+        blk = blk.parent
+    return "/".join(reversed(names))
+
+
+# Size of the buffers used for writing and comparing the output files.
+_FILE_BUFFER_SIZE = 1 << 20
+
+
+class _HashingWriter:
+    """
+    Writer encoding the text into a binary file the same way as a text file opened with the UTF-8 encoding and
+    computing the hash of the written bytes.
+    """
+    def __init__(self, file: object) -> None:
+        """
+        Constructor.
+
+        Args:
+            file (object): Binary file into which the encoded text is written.
+        """
+        self.file = file
+        self.hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, text: str) -> int:
+        """
+        Writes the text into the file.
+
+        Args:
+            text (str): Text to be written.
+
+        Returns:
+            int: Number of written chars.
+        """
+        data = _encode_text(text)
+        self.hash.update(data)
+        self.size += len(data)
+        self.file.write(data)
+        return len(text)
+
+
+def _encode_text(text: str) -> bytes:
+    """
+    Encodes the text into the bytes written into a text file opened with the UTF-8 encoding, i.e. the new line
+    chars are translated into the line separator of the platform.
+
+    Args:
+        text (str): Text to be encoded.
+
+    Returns:
+        bytes: Encoded text.
+    """
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    return text.encode("utf-8")
+
+
+def _has_file_content(path: str, size: int, digest: bytes) -> bool:
+    """
+    Checks that the file has the content with the specified size and SHA-256 hash.
+
+    Args:
+        path (str): Path to the file.
+        size (int): Size of the content in bytes.
+        digest (bytes): SHA-256 hash of the content.
+
+    Returns:
+        bool: True if the file exists and has the same content, False otherwise.
+    """
+    try:
+        if os.stat(path).st_size != size:
+            return False
+        file_hash = hashlib.sha256()
+        with open(path, "rb", buffering=0) as file:
+            chunk = file.read(_FILE_BUFFER_SIZE)
+            while chunk:
+                file_hash.update(chunk)
+                chunk = file.read(_FILE_BUFFER_SIZE)
+    except OSError:
+        return False
+    return file_hash.digest() == digest
+
+
+def _save_file(path: str | Path, content: str | Callable[[TextIO], None], only_changed: bool) -> bool:
+    """
+    Saves the content into a text file atomically, i.e. the content is written into a temporary file in the same
+    directory first and the temporary file then replaces the original file, so other processes never read
+    a partially written file. The replaced file is a new file, i.e. the hard links to the original file keep
+    the original content. Special files, e.g. pipes or devices, are written in place and they are never skipped,
+    because they cannot be replaced by a regular file and their content cannot be compared.
+
+    Args:
+        path (str | Path): Path to the text file.
+        content (str | Callable[[TextIO], None]): Content string or a function writing the content into the
+            output passed as an argument, e.g. a function rendering a template.
+        only_changed (bool): Flag indicating that the file is not written if it already has the same content.
+            A content string is compared with the file before anything is written. Content written by
+            a function is compared after it is written into the temporary file.
+
+    Returns:
+        bool: True if the file was written, False if it was skipped, because its content did not change.
+    """
+    path = os.path.realpath(path)
+    if os.path.exists(path) and not os.path.isfile(path):
+        with open(path, "w", encoding="utf-8") as file:
+            if isinstance(content, str):
+                file.write(content)
+            else:
+                content(file)
+        return True
+    data = None
+    if isinstance(content, str):
+        data = _encode_text(content)
+        if only_changed and _has_file_content(path, len(data), hashlib.sha256(data).digest()):
+            return False
+    # The temporary file is created with the default permissions of new files instead of using the tempfile
+    # module creating the files accessible only by their owner.
+    tmp_path = f"{path}.{os.urandom(4).hex()}.tmp"
+    tmp_fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        with os.fdopen(tmp_fd, "wb", buffering=_FILE_BUFFER_SIZE) as tmp_file:
+            if data is None:
+                writer = _HashingWriter(tmp_file)
+                content(writer)
+            else:
+                tmp_file.write(data)
+        if data is None and only_changed and _has_file_content(path, writer.size, writer.hash.digest()):
+            os.unlink(tmp_path)
+            return False
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return True
+
+
+class SaveReport(NamedTuple):
+    """
+    Paths to the files written and skipped by the :func:`save_many` and :func:`render_many` functions, because
+    their content did not change.
+    """
+    written: list[Path]
+    skipped: list[Path]
+
+
+def save_many(contents: "Mapping[str | Path, str | Block] | Iterable[tuple[str | Path, str | Block]]",
+              only_changed: bool = True) -> SaveReport:
+    """
+    Saves multiple contents into text files the same way as the :meth:`Block.save_content` method.
+
+    Args:
+        contents (Mapping[str | Path, str | Block] | Iterable[tuple[str | Path, str | Block]]): Paths to the text
+            files with the content strings or blocks which content is saved into them.
+        only_changed (bool, optional): Flag indicating that the files already having the same content are not
+            written. Defaults to True.
+
+    Returns:
+        SaveReport: Paths to the written and skipped files.
+    """
+    report = SaveReport([], [])
+    for (path, content) in (contents.items() if isinstance(contents, Mapping) else contents):
+        if isinstance(content, Block):
+            content = content.content
+        (report.written if _save_file(path, content, only_changed) else report.skipped).append(Path(path))
+    return report
+
+
+def render_many(template: "str | Path | Block | CompiledTemplate", records: Iterable[object | dict],
+                out_paths: Iterable[str | Path] | None = None, callback: Callable[[int, str], None] | None = None,
+                workers: int | None = None, chunksize: int = 64, config: BlockConfig = DEFAULT_BLOCK_CONFIG,
+                only_changed: bool = False) -> list[str] | SaveReport | None:
+    """
+    Renders one template filled with each of the data records following the same rules as the
+    :meth:`Block.fill` method. The template is parsed only once and the records are rendered in chunks
+    by a pool of worker processes, i.e. the records and their data must be picklable (including the
+    ``fill_hndl`` handlers) if more than one worker is used.
+
+    Args:
+        template (str | Path | Block | CompiledTemplate): Path to the text file containing the template, template
+            string, block with the content to be used as a template or an already compiled template.
+        records (Iterable[object | dict]): Objects or dictionaries with the data to be filled into the template.
+        out_paths (Iterable[str | Path] | None, optional): Paths to the text files, into which the filled templates
+            are written by the workers, one file for each record. The number of paths must be the same as the
+            number of records. Defaults to ``None``, i.e. the filled templates are not written into files.
+        callback (Callable[[int, str], None] | None, optional): Function called in the calling process with the
+            record index and the filled template for each record in the order of the records. Can be used
+            only if the ``out_paths`` are not specified. Defaults to ``None``.
+        workers (int | None, optional): Number of worker processes. The records are rendered directly in the
+            calling process if set to 1. Defaults to ``None``, i.e. the number of CPUs.
+        chunksize (int, optional): Number of records sent to a worker process at once. Defaults to 64.
+        config (:class:`BlockConfig`, optional): Block configuration (template tags format, tabulator size, etc.)
+            used if the template is not a block or a compiled template already having its own configuration.
+        only_changed (bool, optional): Flag indicating that the files specified by the ``out_paths`` already
+            having the same content as the filled template are not replaced. The files are always written
+            atomically (see the :meth:`Block.save_content` method). Defaults to False.
+
+    Returns:
+        list[str] | SaveReport | None: Filled templates in the order of the records, paths to the written and
+            skipped files if the filled templates are written into the ``out_paths`` files or ``None`` if they are
+            passed to the callback function.
+
+    Raises:
+        ValueError: If both the ``out_paths`` and ``callback`` are specified or if the number of the ``out_paths``
+            differs from the number of records.
+    """
+    if out_paths is not None and callback is not None:
+        raise ValueError("The out_paths and callback arguments cannot be used together.")
+    if isinstance(template, CompiledTemplate):
+        compiled = template
+    elif isinstance(template, Block):
+        compiled = CompiledTemplate(template.content, template.config)
+    elif _is_template_file(template):
+        compiled = template_cache.get_template(template, config=config)
+    else:
+        compiled = CompiledTemplate(f"{template}", config)
+
+    if out_paths is None:
+        tasks = ((record, None, False) for record in records)
+    else:
+        out_paths = list(out_paths)
+        tasks = ((record, out_path, only_changed) for (record, out_path) in zip(records, out_paths, strict=True))
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if workers > 1:
+        with ProcessPoolExecutor(workers, initializer=_init_render_worker, initargs=(compiled,)) as executor:
+            return _collect_rendered(executor.map(_render_task, tasks, chunksize=max(chunksize, 1)),
+                                     out_paths, callback)
+    return _collect_rendered((_render_record(compiled, *task) for task in tasks), out_paths, callback)
+
+
+# Compiled template used by the worker processes of the render_many() function.
+_worker_template: CompiledTemplate | None = None
+
+
+def _init_render_worker(template: CompiledTemplate) -> None:
+    """
+    Initializes the worker process of the :func:`render_many` function with the compiled template to be rendered.
+
+    Args:
+        template (CompiledTemplate): Compiled template.
+    """
+    # pylint: disable=global-statement
+    # rationale: The template is sent to each worker process only once instead of sending it with each record.
+    global _worker_template
+    _worker_template = template
+
+
+def _render_task(task: tuple[object | dict, str | Path | None, bool]) -> str | bool:
+    """
+    Renders the template of the worker process filled with the data record.
+
+    Args:
+        task (tuple[object | dict, str | Path | None, bool]): Data record, the output file path or ``None`` and
+            the flag indicating that an unchanged output file is not written.
+
+    Returns:
+        str | bool: Filled template or a flag indicating that the output file was written.
+    """
+    return _render_record(_worker_template, *task)
+
+
+def _render_record(template: CompiledTemplate, record: object | dict, out_path: str | Path | None,
+                   only_changed: bool = False) -> str | bool:
+    """
+    Renders the template filled with the data record and returns it or writes it into the output file.
+
+    Args:
+        template (CompiledTemplate): Compiled template.
+        record (object | dict): Object or dictionary with the data to be filled into the template.
+        out_path (str | Path | None): Path to the output text file or ``None`` if the filled template is returned.
+        only_changed (bool, optional): Flag indicating that the output file with the same content is not written.
+            Defaults to False.
+
+    Returns:
+        str | bool: Filled template or a flag indicating that the output file was written.
+    """
+    if out_path is None:
+        return template.render(record)
+    return _save_file(out_path, lambda output: template.render_to(output, record), only_changed)
+
+
+# Top-level list block node, data scope without the list items, configuration and tag regular expression used by
+# the worker processes rendering the list shards.
+_shard_state: tuple["BlockNode", dict, BlockConfig, re.Pattern] | None = None
+
+
+def _init_shard_worker(node: "BlockNode", scope: dict, config: BlockConfig, tag_regex: re.Pattern) -> None:
+    """
+    Initializes the worker process rendering the shards of a top-level list with the list block node and
+    the top-level data scope.
+
+    Args:
+        node (BlockNode): Block node rendered for the list items.
+        scope (dict): Top-level data scope without the list items.
+        config (BlockConfig): Block configuration.
+        tag_regex (re.Pattern): Regular expression matching the template tags.
+    """
+    # pylint: disable=global-statement
+    # rationale: The template and data shared by all shards are sent to each worker process only once.
+    global _shard_state
+    _shard_state = (node, scope, config, tag_regex)
+
+
+def _render_shard(start: int, items: list | tuple, last_idx: int, line_start: bool) \
+        -> tuple[str | None, set[str], set[str]]:
+    """
+    Renders block clones for a shard of the top-level list items in the worker process.
+
+    Args:
+        start (int): Index of the first shard item in the whole list.
+        items (list | tuple): Shard items.
+        last_idx (int): Index of the last item of the whole list.
+        line_start (bool): Flag indicating that the content before the shard ends with a new line char.
+
+    Returns:
+        tuple[str | None, set[str], set[str]]: Rendered shard content or ``None`` if it could differ from the
+            textual filling, tag names checked to be missing in the following items and tag names of the
+            attributes defined in the shard items.
+    """
+    (node, scope, config, tag_regex) = _shard_state
+    renderer = _TemplateRenderer(config, scope, tag_regex)
+    # Content before the shard is represented by a chunk ending or not ending with a new line char.
+    renderer.out.append("\n" if line_start else " ")
+    list_scope = _ListScope(items, start)
+    try:
+        node.render_items(renderer, list_scope, items, last_idx)
+    except _InexactRenderError:
+        return (None, list_scope.checked_names, set())
+    return ("".join(renderer.out[1:]), list_scope.checked_names, set(list_scope.get_last_indexes()))
+
+
+def _collect_rendered(results: Iterable[str | bool], out_paths: list[str | Path] | None,
+                      callback: Callable[[int, str], None] | None) -> list[str] | SaveReport | None:
+    """
+    Collects the results of the :func:`render_many` function in the order of the records.
+
+    Args:
+        results (Iterable[str | bool]): Filled templates or flags indicating that the output files were written.
+        out_paths (list[str | Path] | None): Paths to the output files or ``None``.
+        callback (Callable[[int, str], None] | None): Function called with each record index and filled template.
+
+    Returns:
+        list[str] | SaveReport | None: Filled templates, paths to the written and skipped files if the templates
+            are written into files or ``None`` if they are passed to the callback.
+    """
+    if callback is not None:
+        for (idx, content) in enumerate(results):
+            callback(idx, content)
+        return None
+    if out_paths is not None:
+        report = SaveReport([], [])
+        for (out_path, written) in zip(out_paths, results):
+            (report.written if written else report.skipped).append(Path(out_path))
+        return report
+    return list(results)
+
+
+# Compiled templates used by the worker processes of the command-line interface.
+_worker_templates: list[CompiledTemplate] = []
+
+
+def _init_job_worker(templates: list[CompiledTemplate]) -> None:
+    """
+    Initializes the worker process of the command-line interface with the compiled templates to be rendered.
+
+    Args:
+        templates (list[CompiledTemplate]): Compiled templates.
+    """
+    # pylint: disable=global-statement
+    # rationale: The templates are sent to each worker process only once instead of sending them with each job.
+    global _worker_templates
+    _worker_templates = templates
+
+
+def _render_job(job: tuple[int, object | dict, str | None, bool]) -> tuple[str | bool, float]:
+    """
+    Renders the template of the worker process filled with the data record and measures the rendering time.
+
+    Args:
+        job (tuple[int, object | dict, str | None, bool]): Template index, data record, output file path or
+            ``None`` and the flag indicating that an unchanged output file is not written.
+
+    Returns:
+        tuple[str | bool, float]: Filled template or a flag indicating that the output file was written and
+            the rendering time in seconds.
+    """
+    start_time = time.perf_counter()
+    result = _render_record(_worker_templates[job[0]], *job[1:])
+    return (result, time.perf_counter() - start_time)
+
+
+def _load_records(data_file_path: str) -> list[object]:
+    """
+    Loads the data records from a JSON file containing a record or a list of records or from a JSON Lines file
+    (``.jsonl`` or ``.ndjson``) containing a record on each line.
+
+    Args:
+        data_file_path (str): Path to the data file.
+
+    Returns:
+        list[object]: Data records.
+    """
+    with open(data_file_path, "r", encoding="utf-8") as data_file:
+        if Path(data_file_path).suffix.lower() in (".jsonl", ".ndjson"):
+            return [json.loads(line) for line in data_file if line.strip()]
+        data = json.load(data_file)
+    return data if isinstance(data, list) else [data]
+
+
+def main(args: list[str] | None = None) -> int:
+    """
+    Command-line interface used by ``python -m blocky`` rendering the template files filled with the data records
+    loaded from the JSON or JSON Lines files, e.g.
+    ``python -m blocky template.txt --data records.jsonl --output "out/{data}_{index}.txt"``.
+    Each combination of a template and a data record is rendered as a separate job by a pool of worker
+    processes. The templates are parsed only once and sent to each worker process only once. The number of
+    jobs per second and the rendering time of the jobs are reported to the standard error output.
+
+    Args:
+        args (list[str] | None, optional): Command-line arguments. Defaults to ``None``, i.e. the arguments
+            of the program.
+
+    Returns:
+        int: Exit status of the program.
+    """
+    parser = argparse.ArgumentParser(
+        prog="blocky", description="Renders the templates filled with the data records loaded from JSON files.")
+    parser.add_argument("templates", nargs="+", metavar="TEMPLATE", help="template file")
+    parser.add_argument(
+        "-d", "--data", nargs="+", required=True, metavar="DATA",
+        help="JSON file with a record or a list of records or JSON Lines file (.jsonl, .ndjson) with a record on "
+             "each line")
+    parser.add_argument(
+        "-o", "--output", metavar="PATTERN",
+        help="output file path pattern with the {template} and {data} file names without suffix, {index} of "
+             "the record in the data file, {job} index and {record[KEY]} values, e.g. 'out/{data}_{index}.txt', "
+             "the filled templates are written into the standard output if not specified")
+    parser.add_argument("-s", "--subblock", default="", metavar="NAME",
+                        help="name of the subblock extracted from the template files")
+    parser.add_argument("-j", "--workers", type=int, metavar="N",
+                        help="number of worker processes (default: number of CPUs)")
+    parser.add_argument("--chunksize", type=int, default=64, metavar="N",
+                        help="number of jobs sent to a worker process at once (default: 64)")
+    parser.add_argument("--only-changed", action="store_true",
+                        help="do not write the output files already having the same content")
+    parser.add_argument("-v", "--verbose", action="store_true", help="report the rendering time of each job")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not report the rendering summary")
+    opts = parser.parse_args(args)
+
+    start_time = time.perf_counter()
+    jobs = []
+    names = []
+    try:
+        templates = [template_cache.get_template(path, opts.subblock) for path in opts.templates]
+        records = [(path, idx, record) for path in opts.data for (idx, record) in enumerate(_load_records(path))]
+        for (data_path, idx, record) in records:
+            if not isinstance(record, dict):
+                parser.error(f"Record {idx} in '{data_path}' is not a JSON object.")
+        for (template_idx, template_path) in enumerate(opts.templates):
+            for (data_path, idx, record) in records:
+                out_path = None if opts.output is None else opts.output.format(
+                    template=Path(template_path).stem, data=Path(data_path).stem, index=idx, job=len(jobs),
+                    record=record)
+                jobs.append((template_idx, record, out_path, opts.only_changed))
+                names.append(f"{template_path} {data_path}[{idx}]")
+        if opts.output is not None:
+            if len({job[2] for job in jobs}) < len(jobs):
+                raise ValueError(f"Output pattern '{opts.output}' produces the same path for multiple jobs.")
+            for out_dir in {os.path.dirname(job[2]) for job in jobs}:
+                os.makedirs(out_dir or ".", exist_ok=True)
+    except (OSError, ValueError) as exc:
+        parser.exit(1, f"{parser.prog}: error: {exc}\n")
+    except LookupError as exc:
+        parser.exit(1, f"{parser.prog}: error: Output pattern '{opts.output}' uses a missing record value {exc}.\n")
+    except TypeError as exc:
+        parser.error(f"Output pattern '{opts.output}' uses an invalid record value: {exc}.")
+
+    workers = (os.cpu_count() or 1) if opts.workers is None else opts.workers
+    executor = None
+    if workers > 1 and len(jobs) > 1:
+        executor = ProcessPoolExecutor(min(workers, len(jobs)), initializer=_init_job_worker, initargs=(templates,))
+        results = executor.map(_render_job, jobs, chunksize=max(opts.chunksize, 1))
+    else:
+        _init_job_worker(templates)
+        results = map(_render_job, jobs)
+    (written, skipped, job_time, max_job_time) = (0, 0, 0.0, 0.0)
+    try:
+        for (job, name, (result, elapsed)) in zip(jobs, names, results):
+            if job[2] is None:
+                sys.stdout.write(result)
+                status = "stdout"
+            elif result:
+                written += 1
+                status = f"written to {job[2]}"
+            else:
+                skipped += 1
+                status = f"skipped {job[2]}"
+            (job_time, max_job_time) = (job_time + elapsed, max(max_job_time, elapsed))
+            if opts.verbose:
+                print(f"{parser.prog}: {elapsed * 1000:.3f} ms {name} {status}", file=sys.stderr)
+    except OSError as exc:
+        parser.exit(1, f"{parser.prog}: error: {exc}\n")
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    total_time = time.perf_counter() - start_time
+    if not opts.quiet:
+        print(f"{parser.prog}: {len(jobs)} jobs ({written} written, {skipped} skipped) in {total_time:.3f} s, "
+              f"{len(jobs) / total_time:.1f} jobs/s, job time {job_time * 1000 / max(len(jobs), 1):.3f} ms average, "
+              f"{max_job_time * 1000:.3f} ms maximum", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+# pylint: disable = missing-module-docstring, missing-class-docstring, missing-function-docstring
+
+import argparse
+import inspect
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+
+sys.path.insert(0, str(Path(Path(__file__).parent.parent, "src").resolve()))
+
+from blocky import Block    # pylint: disable = import-error, wrong-import-position     # noqa: E402
+
+# The compiled templates and the profiler are not available in the older versions measured as a baseline.
+try:
+    from blocky import CompiledTemplate    # pylint: disable = import-error, wrong-import-position     # noqa: E402
+except ImportError:
+    CompiledTemplate = None    # pylint: disable = invalid-name
+try:
+    from blocky import BlockProfiler    # pylint: disable = import-error, wrong-import-position     # noqa: E402
+except ImportError:
+    BlockProfiler = None    # pylint: disable = invalid-name
+
+
+class Scenario(NamedTuple):
+    name: str
+    template: str
+    make_data: Callable[[int], dict]
+
+
+def make_list_data(n: int) -> dict:
+    return {"rows": [{"name": f"item {i}", "qty": i % 7, "price": f"{i * 1.25:.2f}"} for i in range(n)]}
+
+
+def make_wide_data(n: int) -> dict:
+    return {"rows": [{f"v{j}": f"{i}.{j}" for j in range(20)} for i in range(n)]}
+
+
+def split_rows(n: int, size: int) -> list[int]:
+    return [min(size, n - start) for start in range(0, n, size)]
+
+
+def make_nested_data(n: int) -> dict:
+    # Four nesting levels with up to ten members on each of the three inner levels, n leaf rows in total.
+    return {"groups": [
+        {"group": f"g{g}", "sections": [
+            {"section": f"s{s}", "items": [
+                {"item": f"i{i}", "details": [{"detail": f"d{d}"} for d in range(details_num)]}
+                for (i, details_num) in enumerate(split_rows(items_num, 10))]}
+            for (s, items_num) in enumerate(split_rows(sections_num, 100))]}
+        for (g, sections_num) in enumerate(split_rows(n, 1000))]}
+
+
+def make_align_data(n: int) -> dict:
+    return {"rows": [{"name": "x" * (i % 30), "type": "uint" + "8" * (i % 3), "desc": f"row {i}"} for i in range(n)]}
+
+
+def make_separated_data(n: int) -> dict:
+    return {"rows": [{"name": f"n{i}", "values": [{"value": j} for j in range(3)]} for i in range(n)]}
+
+
+def make_variation_data(n: int) -> dict:
+    return {"rows": [{"name": f"n{i}", "state": {"vari_idx": i % 3, "code": i % 5}} for i in range(n)]}
+
+
+SCENARIOS = (
+    Scenario(
+        "list",
+        "Items:\n<ROWS>\n* <NAME>: <QTY> pcs for <PRICE>\n</ROWS>\n",
+        make_list_data),
+    Scenario(
+        "wide",
+        "<ROWS>\n" + " ".join(f"<V{j}>" for j in range(20)) + "\n</ROWS>\n",
+        make_wide_data),
+    Scenario(
+        "nested",
+        "<GROUPS>\n<GROUP>\n<SECTIONS>\n  <SECTION>\n<ITEMS>\n    <ITEM>:\n<DETAILS>\n      <DETAIL>\n</DETAILS>\n"
+        "</ITEMS>\n</SECTIONS>\n</GROUPS>\n",
+        make_nested_data),
+    Scenario(
+        "align",
+        "<ROWS>\n<NAME><+>                                |<TYPE><+>          |// <DESC>\n</ROWS>\n",
+        make_align_data),
+    Scenario(
+        "std_last_first",
+        "<ROWS>\n<.>next: <^.>next: <^.>first: </.><NAME><.>,<^.>;</.>\n<VALUES>\n  = <VALUE><.>,<^.></.>\n"
+        "</VALUES>\n</ROWS>\n",
+        make_separated_data),
+    Scenario(
+        "variations",
+        "<ROWS>\n<NAME> <STATE>is fine<^STATE>has warning <CODE><^STATE>failed with error <CODE></STATE>\n</ROWS>\n",
+        make_variation_data))
+
+
+def prepare_fill(template: str) -> Callable[[dict], str]:
+    def run(data: dict) -> str:
+        blk = Block(template)
+        blk.fill(data)
+        return blk.content
+    return run
+
+
+def prepare_clone(template: str) -> Callable[[dict], str]:
+    # Low-level API equivalent of the "list" scenario: set the variables and clone the block for every row.
+    def run(data: dict) -> str:
+        blk = Block(template)
+        blk_rows = blk.get_subblock("ROWS")
+        for row in data["rows"]:
+            blk_rows.set_variables(autoclone=True, NAME=row["name"], QTY=row["qty"], PRICE=row["price"])
+        blk_rows.set()
+        return blk.content
+    return run
+
+
+def prepare_compiled(template: str) -> Callable[[dict], str]:
+    # The template is compiled outside of the measured time to get the rendering time of a reused template.
+    return CompiledTemplate(template).render
+
+
+def prepare_codegen(template: str) -> Callable[[dict], str]:
+    compiled = CompiledTemplate(template, codegen=True)
+    compiled.render({})
+    return compiled.render
+
+
+METHODS = {
+    "fill": prepare_fill,
+    "clone": prepare_clone}
+if CompiledTemplate is not None:
+    METHODS["compiled"] = prepare_compiled
+    if "codegen" in inspect.signature(CompiledTemplate).parameters:
+        METHODS["codegen"] = prepare_codegen
+
+
+def is_fallback(template: str, data: dict) -> bool | None:
+    # Templates that cannot be rendered exactly by the compiled template are filled textually by all methods, i.e.
+    # the subblocks are set into their parent blocks, which never happens when the compiled template is rendered.
+    if CompiledTemplate is None or BlockProfiler is None:
+        return None
+    with BlockProfiler() as profiler:
+        Block(template).fill(data)
+    return any(stat.operation == "set" for stat in profiler.stats())
+
+
+def measure(render: Callable[[dict], str], data: dict, n: int, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        content = render(data)
+        times.append(time.perf_counter() - start)
+    seconds = min(times)
+    return {
+        "seconds": seconds,
+        "ops_per_sec": 1.0 / seconds if seconds else None,
+        "rows_per_sec": n / seconds if seconds else None,
+        "row_latency_us": seconds / n * 1e6,
+        "output_chars": len(content)}
+
+
+def run_benchmarks(scenario_names: list[str], method_names: list[str], sizes: list[int], repeat: int,
+                   time_limit: float) -> list[dict]:
+    results = []
+    for scenario in SCENARIOS:
+        if scenario.name not in scenario_names:
+            continue
+        for method_name in method_names:
+            if method_name == "clone" and scenario.name != "list":
+                continue
+            fallback = None if method_name == "clone" else is_fallback(scenario.template, scenario.make_data(sizes[0]))
+            base_latency = None
+            for n in sizes:
+                result = {"scenario": scenario.name, "method": method_name, "n": n}
+                result.update(measure(METHODS[method_name](scenario.template), scenario.make_data(n), n, repeat))
+                result["fallback"] = fallback
+                # The scaling factor is the per-row latency relative to the smallest size, i.e. 1.0 for a linear
+                # scaling and a value growing with n for a superlinear one.
+                base_latency = base_latency or result["row_latency_us"]
+                result["scaling"] = result["row_latency_us"] / base_latency
+                results.append(result)
+                print(f"{scenario.name:<16}{method_name:<10}{n:>9}{result['seconds']:>12.4f} s"
+                      f"{result['rows_per_sec']:>14.0f} rows/s{result['row_latency_us']:>10.2f} us/row"
+                      f"{result['scaling']:>8.2f}x{'  textual fallback' if result['fallback'] else ''}", flush=True)
+                if result["seconds"] * repeat > time_limit:
+                    break
+    return results
+
+
+def compare(results: list[dict], baseline_path: str, tolerance: float) -> list[str]:
+    with open(baseline_path, "r", encoding="utf-8") as baseline_file:
+        baseline = {(res["scenario"], res["method"], res["n"]): res for res in json.load(baseline_file)["results"]}
+    regressions = []
+    for res in results:
+        base_res = baseline.get((res["scenario"], res["method"], res["n"]))
+        if base_res and res["seconds"] > base_res["seconds"] * (1.0 + tolerance):
+            regressions.append(f"{res['scenario']} {res['method']} n={res['n']}: "
+                               f"{base_res['seconds']:.4f} s -> {res['seconds']:.4f} s")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure the blocky template filling performance.")
+    parser.add_argument("--scenarios", nargs="+", default=[scn.name for scn in SCENARIOS],
+                        choices=[scn.name for scn in SCENARIOS], help="scenarios to run (default: all)")
+    parser.add_argument("--methods", nargs="+", default=list(METHODS), choices=list(METHODS),
+                        help="filling methods to measure (default: all)")
+    parser.add_argument("--max-exp", type=int, default=4,
+                        help="measure the sizes 10^2 up to 10^MAX_EXP rows (default: 4, use 6 for the full curve)")
+    parser.add_argument("--sizes", type=int, nargs="+", help="explicit sizes to measure instead of the powers of ten")
+    parser.add_argument("--repeat", type=int, default=3, help="number of repetitions, the best one is reported")
+    parser.add_argument("--time-limit", type=float, default=60.0,
+                        help="skip the larger sizes of a scenario once a size takes longer than this many seconds")
+    parser.add_argument("--json", metavar="PATH", help="write the results into a JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="compare the results with a baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="allowed relative slowdown against the baseline (default: 0.1)")
+    args = parser.parse_args()
+
+    sizes = args.sizes or [10 ** exp for exp in range(2, args.max_exp + 1)]
+    results = run_benchmarks(args.scenarios, args.methods, sorted(sizes), max(args.repeat, 1), args.time_limit)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump({"python": platform.python_version(), "platform": platform.platform(), "results": results},
+                      json_file, indent=2)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,37 @@
 # pylint: disable = missing-module-docstring, missing-class-docstring, missing-function-docstring
 
+import asyncio
+import os
+import stat
 import sys
+import threading
+from dataclasses import dataclass
 from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import MappingProxyType
+from typing import NamedTuple
 
 sys.path.insert(0, str(Path(Path(__file__).parent.parent, "src").resolve()))
 
 # pylint: disable = wrong-import-position, import-error
-from blocky import Block   # noqa: E402
+from blocky import (    # noqa: E402
+    Block, BlockProfiler, CompiledTemplate, DictLoader, FileSystemLoader, IncrementalRenderer, SaveReport, Tag,
+    TemplateCache, TemplateCacheInfo, TemplateLoader, main, template_cache, render_many, save_many)
+
+
+FILL_DATA = {
+    "to_set": 1,
+    "to_clear": 0,
+    "struct_name": "SOME_STRUCT_T",
+    "members": (
+        {"type": {"vari_idx": 0, "t": "UNSIGNED8"}, "name": "u8Var", "arr": None},
+        {"type": {"vari_idx": 1, "t": "UNSIGNED16"}, "name": "au16Var", "arr": {"size": 10}},
+        {"type": {"vari_idx": 2, "t": "SIGNED8"}, "name": "ps8Var", "arr": None},
+        {"type": {"vari_idx": 3, "t": "SIGNED16"}, "name": "aps16Var", "arr": {"size": 20}},
+        {"type": {"vari_idx": -1}, "name": "InvalidVar1", "arr": None},
+        {"type": {"vari_idx": False}, "name": "InvalidVar2", "arr": None},
+        {"type": None, "name": "InvalidVar3", "arr": None},
+        {"type": {}, "name": "InvalidVar4", "arr": None})}
 
 
 def compare_files(gen_file: Path, exp_file: Path) -> bool:
@@ -19,6 +44,12 @@ def compare_files(gen_file: Path, exp_file: Path) -> bool:
     return files_match
 
 
+def compare_fill_content(content: str) -> bool:
+    with open("data/fill_gen.txt", "w", encoding="utf-8") as file_gen:
+        file_gen.write(content)
+    return compare_files("data/fill_gen.txt", "data/fill_exp.txt")
+
+
 def test_lowlevel() -> None:
     Path("data/content_gen.txt").unlink(missing_ok=True)
 
@@ -181,24 +212,477 @@ def test_lowlevel() -> None:
     assert compare_files("data/content_gen.txt", "data/content_exp.txt")
 
 
+def test_set_variables() -> None:
+    blk = Block()
+
+    blk.template = "<A>-<B>-<A>"
+    blk.set_variables("A", 1, "B", "x")
+    assert blk.content == "1-x-1"
+
+    # Variables are set one after another if the same variable is set twice, if a tag name contains a tag char,
+    # or if a value combined with the surrounding content forms another tag being set.
+    blk.template = "<A>-<B>"
+    blk.set_variables("A", "1", A="2", B="x")
+    assert blk.content == "1-x"
+    blk.template = "<A<B>> <B>"
+    blk.set_variables(**{"A<B": "1", "B": "2"})
+    assert blk.content == "1> 2"
+    blk.template = "<A<B>> <B>"
+    blk.set_variables(**{"B": "2", "A<B": "1"})
+    assert blk.content == "<A2> 2"
+    blk.template = "<A> <B>"
+    blk.set_variables(A="<B>", B="x")
+    assert blk.content == "x x"
+    blk.template = "<A> <B>"
+    blk.set_variables(B="x", A="<B>")
+    assert blk.content == "<B> x"
+    blk.template = "<A>B> <B>"
+    blk.set_variables(A="<", B="x")
+    assert blk.content == "x x"
+
+    blk.template = "<<A>B> <A>"
+    blk.clear_variables("A", "B")
+    assert blk.content == " "
+    blk.template = "<<A>B> <A>"
+    blk.clear_variables("B", "A")
+    assert blk.content == "<B> "
+
+
+def test_subblock_positions() -> None:
+    blk = Block()
+    blk.template = "<A>a<V></A>, <B>b</B>, <A>a<V></A>\n<C>c</C><A>a<V></A>\n<B>b</B>\n"
+    for (name, value, count) in (("A", 1, 1), ("B", 2, -1), ("A", 3, -1), ("C", 4, -1)):
+        subblk = blk.get_subblock(name)
+        subblk.set_variables(V=value)
+        subblk.set(count=count)
+    assert blk.get_subblock("A") is None
+    assert blk.content == "a1, b, a3\nca3\nb\n"
+
+    # Positions of too many different tags are searched again after the content is changed.
+    blk.template = "".join(f"<B{i}>{i}</B{i}>" + ("\n" if i % 3 else " ") for i in range(40))
+    for i in range(40):
+        blk.get_subblock(f"B{i}")
+    for i in range(0, 40, 2):
+        blk.get_subblock(f"B{i}").set()
+    assert blk.content == "".join((f"{i}" if i % 2 == 0 else f"<B{i}>{i}</B{i}>") + ("\n" if i % 3 else " ")
+                                  for i in range(40))
+
+    # Subblock set into the content can contain the tags of other subblocks searched before.
+    blk.template = "<A><V></A> <B>b</B>\n<B>c</B>"
+    blk.get_subblock("B")
+    subblk = blk.get_subblock("A")
+    subblk.set_variables(V="<B>a</B>")
+    subblk.set()
+    subblk = blk.get_subblock("B")
+    assert subblk.template == "a"
+    subblk.set()
+    assert blk.content == "a a\na"
+
+
+def test_content_chunks() -> None:
+    # Lines finished by the cloning can contain the tags only from the values set into the block content.
+    blk = Block()
+    blk.template = "<B> <D>\n<D>\n"
+    blk.set_variables(B="<C>", D=1)
+    blk.clone()
+    blk.set_variables(D=2)
+    blk.set_variables(C="c")
+    assert blk.content == "c 1\n1\n<B> 2\n2\n"
+    blk.set_variables(B="<C>", D=3)
+    blk.clone()
+    blk.clear_variables("C")
+    assert blk.content == "c 1\n1\n 2\n2\n"
+
+    blk = Block()
+    blk.template = "<B>\n<S>s<V></S>\n"
+    blk.set_variables(B="<S>t<V></S>")
+    blk.clone()
+    subblk = blk.get_subblock("S")
+    assert subblk.template == "t<V>"
+    subblk.set_variables(V=1)
+    subblk.set(count=-1)
+    assert blk.content == "t1\nt1\n<B>\nt1\n"
+
+    blk = Block()
+    blk.template = "<B>\n<D>\n"
+    blk.set_variables(B="<S>t<V></S>")
+    blk.clone()
+    blk.fill({"S": {"V": 2}, "D": 1})
+    assert blk.content == "t2\n1\n<B>\n1\n"
+
+
+def test_tag() -> None:
+    tag = Tag("NAME")
+    assert tag.str_name("VAR") is Tag().str_name("VAR")
+    tag.begin = "{{"
+    tag.end = "}}"
+    assert (tag.str, tag.str_name(), tag.str_name("VAR")) == ("{{NAME}}", "{{NAME}}", "{{VAR}}")
+
+
 def test_dictfill() -> None:
     Path("data/fill_gen.txt").unlink(missing_ok=True)
+
+    blk_file = Block("data/fill_tmpl.txt")
+    blk_file.fill(FILL_DATA)
+    blk_file.save_content("data/fill_gen.txt")
+
+    assert compare_files("data/fill_gen.txt", "data/fill_exp.txt")
+
+
+def test_fill_data_types() -> None:
+    @dataclass
+    class Member:
+        type: object
+        name: str
+        arr: object = None
+
+    @dataclass(slots=True)
+    class Array:
+        size: int
+
+    class VarType(NamedTuple):
+        t: str
+        vari_idx: int = 0
+
+    class Struct:
+        __slots__ = ("to_set", "to_clear", "struct_name", "members")
+
+        def __init__(self, members: list) -> None:
+            (self.to_set, self.to_clear, self.struct_name, self.members) = (1, 0, "SOME_STRUCT_T", members)
+
+    data = Struct([
+        Member(VarType("UNSIGNED8"), "u8Var"),
+        Member(MappingProxyType({"vari_idx": 1, "t": "UNSIGNED16"}), "au16Var", Array(10)),
+        Member(VarType("SIGNED8", 2), "ps8Var"),
+        Member(VarType("SIGNED16", 3), "aps16Var", Array(20)),
+        Member(VarType("", -1), "InvalidVar1"),
+        Member(None, "InvalidVar3")])
+
+    blk_file = Block("data/fill_tmpl.txt")
+    blk_file.fill(data)
+    blk_dict = Block("data/fill_tmpl.txt")
+    blk_dict.fill({"to_set": 1, "to_clear": 0, "struct_name": "SOME_STRUCT_T", "members": [
+        {"type": {"t": "UNSIGNED8", "vari_idx": 0}, "name": "u8Var", "arr": None},
+        {"type": {"vari_idx": 1, "t": "UNSIGNED16"}, "name": "au16Var", "arr": {"size": 10}},
+        {"type": {"t": "SIGNED8", "vari_idx": 2}, "name": "ps8Var", "arr": None},
+        {"type": {"t": "SIGNED16", "vari_idx": 3}, "name": "aps16Var", "arr": {"size": 20}},
+        {"type": {"t": "", "vari_idx": -1}, "name": "InvalidVar1", "arr": None},
+        {"type": None, "name": "InvalidVar3", "arr": None}]})
+    assert blk_file.content == blk_dict.content
+    assert "    UNSIGNED16 *au16Var[10];\n" in blk_file.content and "    InvalidVar1;\n" in blk_file.content
+    assert CompiledTemplate(blk_file.template).render(data) == blk_dict.content
+
+
+def test_fill_iterators() -> None:
+    members = [
+        {"type": {"vari_idx": 0, "t": "UNSIGNED8"}, "name": "u8Var", "arr": None},
+        {"type": {"vari_idx": 1, "t": "UNSIGNED16"}, "name": "au16Var", "arr": {"size": 10}},
+        {"type": {"vari_idx": -1}, "name": "InvalidVar1", "arr": None}]
+
+    blk_list = Block("data/fill_tmpl.txt")
+    blk_list.fill({"struct_name": "SOME_STRUCT_T", "members": members})
+    blk_gen = Block("data/fill_tmpl.txt")
+    blk_gen.fill({"struct_name": "SOME_STRUCT_T", "members": (member for member in members)})
+    assert blk_gen.content == blk_list.content
+    tmpl = CompiledTemplate(blk_gen.template)
+    assert tmpl.render({"struct_name": "SOME_STRUCT_T", "members": iter(members)}) == blk_list.content
+
+    blk_list = Block("<ROW><.>, <^.>.</.><ID></ROW>\n<ROW>[<ID>]</ROW>")
+    blk_list.fill({"row": [{"id": 1}, {"id": 2}]})
+    blk_gen = Block(blk_list.template)
+    blk_gen.fill({"row": ({"id": idx} for idx in range(1, 3))})
+    assert blk_gen.content == blk_list.content == ", 1.2\n[1][2]"
+    blk_gen = Block(blk_list.template)
+    blk_gen.fill({"row": (row for row in ())})
+    assert blk_gen.content == "\n"
+
+    # Binary data are not lists of block clones, i.e. the block is set once without filling it.
+    for value in (b"ab", bytearray(b"ab")):
+        blk_bytes = Block("<ROW>x<ID></ROW>|")
+        blk_bytes.fill({"row": value})
+        assert blk_bytes.content == CompiledTemplate(blk_bytes.template).render({"row": value}) == "x<ID>|"
+
+
+def test_compiled() -> None:
+    with open("data/fill_tmpl.txt", "r", encoding="utf-8") as file_tmpl:
+        tmpl = CompiledTemplate(file_tmpl.read())
+    tmpl.render({"members": [], "struct_name": "UNUSED_T"})
+
+    assert compare_fill_content(tmpl.render(FILL_DATA))
+
+    # Tags formed by the values joined with the surrounding text are filled the same way as by the textual filling.
+    for codegen in (False, True):
+        assert CompiledTemplate("<<V>W>-", codegen=codegen).render({"v": "", "w": "s"}) == "s-"
+        assert CompiledTemplate("<R>\n<V><<W>B>b</B>\n</R>", codegen=codegen).render(
+            {"r": [{"v": 1, "w": "", "b": True}, {"v": 2, "w": "", "b": False}]}) == "1b\n2\n"
+        # Char repeat tag followed by another tag repeats the first char of the value filled into that tag.
+        assert CompiledTemplate("<B>\n<C><+><.>,<^.>.</.>\n</B>\n<D>\nab<+><X>|\n</D>", codegen=codegen).render(
+            {"b": [{"c": 1}, {"c": 22}], "d": {"x": "...."}}) == "1,,,,,,\n22.....\nab....|\n"
+
+
+def test_codegen() -> None:
+    with open("data/fill_tmpl.txt", "r", encoding="utf-8") as file_tmpl:
+        tmpl = CompiledTemplate(file_tmpl.read(), codegen=True)
+
+    assert compare_fill_content(tmpl.render(FILL_DATA))
+
+    # Blocks with the tag lines changed by the filling of outer content are rendered by the generated code too.
+    tmpl = CompiledTemplate("<ROWS>\n<NAME>\n<VALUES>\n  <VALUE>\n</VALUES>\n</ROWS>\n", codegen=True)
+    for rows in ([{"name": "a", "values": [{"value": 1}, {"value": 2}]}, {"name": "b", "values": []}], []):
+        blk_rows = Block(tmpl.template)
+        blk_rows.fill({"rows": rows})
+        assert tmpl.render({"rows": rows}) == blk_rows.content
+
+
+def test_render_to() -> None:
+    Path("data/fill_gen.txt").unlink(missing_ok=True)
     data = {
         "to_set": 1,
         "to_clear": 0,
         "struct_name": "SOME_STRUCT_T",
-        "members": (
-            {"type": {"vari_idx": 0, "t": "UNSIGNED8"}, "name": "u8Var", "arr": None},
-            {"type": {"vari_idx": 1, "t": "UNSIGNED16"}, "name": "au16Var", "arr": {"size": 10}},
-            {"type": {"vari_idx": 2, "t": "SIGNED8"}, "name": "ps8Var", "arr": None},
-            {"type": {"vari_idx": 3, "t": "SIGNED16"}, "name": "aps16Var", "arr": {"size": 20}},
-            {"type": {"vari_idx": -1}, "name": "InvalidVar1", "arr": None},
-            {"type": {"vari_idx": False}, "name": "InvalidVar2", "arr": None},
-            {"type": None, "name": "InvalidVar3", "arr": None},
-            {"type": {}, "name": "InvalidVar4", "arr": None})}
+        "members": [{"type": {"vari_idx": i % 4, "t": "UNSIGNED8"}, "name": f"var{i}", "arr": None}
+                    for i in range(5000)]}
 
     blk_file = Block("data/fill_tmpl.txt")
+    with open("data/fill_gen.txt", "w", encoding="utf-8") as file_gen:
+        blk_file.render_to(file_gen, data)
+    assert blk_file.content == blk_file.template
     blk_file.fill(data)
-    blk_file.save_content("data/fill_gen.txt")
+    blk_file.save_content("data/fill_exp_gen.txt")
+
+    assert compare_files("data/fill_gen.txt", "data/fill_exp_gen.txt")
+    Path("data/fill_exp_gen.txt").unlink()
+
+
+def test_fill_async() -> None:
+    class AsyncWriter:
+        def __init__(self) -> None:
+            self.chunks = []
+
+        async def write(self, content: str) -> None:
+            await asyncio.sleep(0)
+            self.chunks.append(content)
+
+    async def get_members(num: int):
+        for i in range(num):
+            await asyncio.sleep(0)
+            yield {"type": {"vari_idx": i % 4, "t": "UNSIGNED8"}, "name": f"var{i}", "arr": None}
+
+    async def set_name(blk: Block, _data: dict, idx: int) -> None:
+        await asyncio.sleep(0)
+        blk.set_variables(NAME=f"hndl{idx}")
+
+    async def set_nested_name(blk: Block, _data: dict, idx: int) -> None:
+        blk_nested = Block("<ID>-<SUB><ID></SUB>")
+        await blk_nested.fill_async({"id": idx, "sub": {"id": 0}})
+        blk.set_variables(NAME=blk_nested.content)
+
+    async def fill_all() -> None:
+        blk_async = Block("data/fill_tmpl.txt")
+        await blk_async.fill_async({"struct_name": "SOME_STRUCT_T", "members": get_members(50)})
+        blk_sync = Block("data/fill_tmpl.txt")
+        blk_sync.fill({"struct_name": "SOME_STRUCT_T", "members": [
+            {"type": {"vari_idx": i % 4, "t": "UNSIGNED8"}, "name": f"var{i}", "arr": None} for i in range(50)]})
+        assert blk_async.content == blk_sync.content
+
+        tmpl = CompiledTemplate("<ROW><NAME>\n</ROW>")
+        writer = AsyncWriter()
+        await tmpl.render_to_async(writer, {"row": [{"name": "a", "fill_hndl": set_name}, {"name": "b"}]})
+        assert "".join(writer.chunks) == "a\nb\n"
+        contents = await asyncio.gather(*(tmpl.render_async({"row": [{"fill_hndl": set_name}]}) for _ in range(3)))
+        assert contents == ["hndl0\n"] * 3
+        # Blocks filled from the handlers of more concurrent fillings than the worker threads do not wait for them.
+        contents = await asyncio.wait_for(asyncio.gather(*(
+            tmpl.render_async({"row": [{"fill_hndl": set_nested_name}] * 2}) for _ in range(80))), 10)
+        assert contents == ["0-0\n1-0\n"] * 80
+
+    asyncio.run(fill_all())
+
+
+def test_template_cache() -> None:
+    template_cache.clear()
+    blk_file = Block("data/fill_tmpl.txt")
+    blk_members = Block()
+    blk_members.load_template("data/fill_tmpl.txt", "MEMBERS")
+    Block("data/fill_tmpl.txt")
+    Block().load_template("data/fill_tmpl.txt", "MEMBERS")
+
+    assert blk_members.template == blk_file.get_subblock("MEMBERS").template
+    assert template_cache.info() == TemplateCacheInfo(hits=2, misses=2, maxsize=128, currsize=2)
+    template_cache.maxsize = 1
+    assert template_cache.info().currsize == 1
+    template_cache.maxsize = 128
+
+    with TemporaryDirectory() as cache_dir:
+        compiled = TemplateCache(cache_dir=cache_dir).get_template("data/fill_tmpl.txt", "MEMBERS")
+        assert len(list(Path(cache_dir).glob("*.pickle"))) == 1
+        loaded = TemplateCache(cache_dir=cache_dir).get_template("data/fill_tmpl.txt", "MEMBERS")
+        assert loaded is not compiled and loaded.template == compiled.template
+        assert loaded.render({"name": "var", "arr": 2}) == compiled.render({"name": "var", "arr": 2})
+
+
+def test_loaders() -> None:
+    blk_members = FileSystemLoader("data").load("fill_tmpl.txt", "MEMBERS")
+    assert blk_members.name == "MEMBERS"
+    assert blk_members.template == Block.from_file("data/fill_tmpl.txt").get_subblock("MEMBERS").template
+
+    templates = {"list": "<ITEMS>\n* <ITEM>\n</ITEMS>\n"}
+    loader = DictLoader(templates)
+    assert loader.get_template("list") is loader.get_template("list")
+    templates["list"] = "<ITEMS><ITEM><.>, <^.></.></ITEMS>"
+    blk_list = loader.load("list")
+    blk_list.fill({"items": [{"item": "a"}, {"item": "b"}]})
+    assert blk_list.content == "a, b"
+    assert TemplateLoader.__abstractmethods__ == frozenset({"get_source"})
+
+    # Long template strings are not checked as file paths.
+    assert Block.from_string("x" * 5000).template == Block("x" * 5000).template == "x" * 5000
+
+
+def test_save_only_changed() -> None:
+    with TemporaryDirectory() as out_dir:
+        paths = [Path(out_dir, f"gen_{i}.txt") for i in range(3)]
+        blk = Block("<V>\n")
+        blk.fill({"v": "value"})
+        assert blk.save_content(paths[0], only_changed=True)
+        assert not blk.save_content(paths[0], only_changed=True)
+        assert blk.save_content(paths[0])
+        assert save_many({paths[0]: blk, paths[1]: "other\n"}) == SaveReport([paths[1]], [paths[0]])
+
+        records = [{"v": "value"}, {"v": "other"}, {"v": "new"}]
+        assert render_many("<V>\n", records, paths, workers=1, only_changed=True) == \
+            SaveReport([paths[2]], paths[:2])
+        assert [path.read_text(encoding="utf-8") for path in paths] == ["value\n", "other\n", "new\n"]
+        assert sorted(Path(out_dir).iterdir()) == paths
+
+        # Special files are written in place instead of being replaced by a regular file.
+        if hasattr(os, "mkfifo"):
+            fifo_path = Path(out_dir, "fifo")
+            os.mkfifo(fifo_path)
+            Path(out_dir, "fifo_link").symlink_to(fifo_path)
+            received = []
+            reader = threading.Thread(target=lambda: received.append(fifo_path.read_text(encoding="utf-8")),
+                                      daemon=True)
+            reader.start()
+            assert blk.save_content(Path(out_dir, "fifo_link"), only_changed=True)
+            reader.join(10)
+            assert received == ["value\n"]
+            assert stat.S_ISFIFO(os.stat(fifo_path).st_mode)
+
+
+def test_cli() -> None:
+    with TemporaryDirectory() as out_dir:
+        Path(out_dir, "records.jsonl").write_text('{"struct_name": "A_T"}\n{"struct_name": "B_T"}\n', encoding="utf-8")
+        Path(out_dir, "record.json").write_text('{"struct_name": "C_T"}', encoding="utf-8")
+        args = ["data/fill_tmpl.txt", "--data", str(Path(out_dir, "records.jsonl")), str(Path(out_dir, "record.json")),
+                "--output", str(Path(out_dir, "out", "{data}_{record[struct_name]}.txt")), "--workers", "1", "--quiet"]
+        assert main(args) == 0
+        assert main([*args, "--only-changed"]) == 0
+        for (data_name, struct_name) in (("records", "A_T"), ("records", "B_T"), ("record", "C_T")):
+            blk_file = Block("data/fill_tmpl.txt")
+            blk_file.fill({"struct_name": struct_name})
+            assert Path(out_dir, "out", f"{data_name}_{struct_name}.txt").read_text(encoding="utf-8") == \
+                blk_file.content
+
+        # Records that are not JSON objects and invalid record values in the output pattern are reported.
+        Path(out_dir, "lists.json").write_text('[["D_T"]]', encoding="utf-8")
+        for (data_path, pattern) in (("lists.json", "{record[struct_name]}.txt"),
+                                     ("record.json", "{record[struct_name][name]}.txt")):
+            try:
+                main(["data/fill_tmpl.txt", "--data", str(Path(out_dir, data_path)),
+                      "--output", str(Path(out_dir, "err", pattern)), "--workers", "1", "--quiet"])
+            except SystemExit as exc:
+                assert exc.code != 0
+            else:
+                assert False
+        assert not Path(out_dir, "err").exists()
+
+
+def test_block_profiler() -> None:
+    fill = Block.fill
+    traced = []
+    with BlockProfiler(lambda path, operation, _: traced.append((path, operation))) as profiler:
+        blk_items = Block("<ITEMS><ITEM><.>, <^.>.</.></ITEMS>", "LIST").get_subblock("ITEMS")
+        for item in ("a", "b"):
+            blk_items.set_variables(autoclone=True, ITEM=item)
+        blk_items.set()
+    assert Block.fill is fill
+    assert blk_items.parent.content == "a, b."
+
+    stats = {(stat.path, stat.operation): stat for stat in profiler.stats()}
+    assert stats[("LIST/ITEMS", "set_variables")].calls == 2
+    assert stats[("LIST/ITEMS", "std_last_first")].copied_chars > 0
+    assert ("LIST/ITEMS", "set") in traced
+    assert "LIST/ITEMS:set;LIST/ITEMS:std_last_first " in profiler.collapsed_stacks()
+    assert profiler.summary().splitlines()[0].split() == \
+        ["block", "operation", "calls", "total", "[ms]", "self", "[ms]", "scans", "copied", "chars"]
+
+    # Blocks filled by the compiled template are recorded for each block path.
+    template = "<ROWS>\n<NAME><+>    |\n<CELLS>\n  <CELL><.>,<^.>;</.>\n</CELLS>\n</ROWS>\n"
+    data = {"rows": [{"name": "a", "cells": [{"cell": 1}, {"cell": 2}]}, {"name": "bb", "cells": [{"cell": 3}]}]}
+    for codegen in (False, True):
+        with BlockProfiler() as profiler:
+            content = CompiledTemplate(template, codegen=codegen).render(data)
+        assert content == "a            |\n  1,\n  2;\nbb           |\n  3;\n"
+        stats = {(stat.path, stat.operation): stat for stat in profiler.stats()}
+        assert stats[("<root>/ROWS", "render")].calls == 1
+        assert stats[("<root>/ROWS/CELLS", "render")].calls == 2
+        assert stats[("<root>/ROWS", "char_repeat")].calls == 2
+        assert stats[("<root>/ROWS/CELLS", "std_last_first")].calls == 3
+        assert ("<root>/ROWS", "set") not in stats
+
+
+def test_render_many() -> None:
+    records = [{"to_set": i % 2, "to_clear": 0, "struct_name": f"STRUCT{i}_T",
+                "members": [{"type": {"vari_idx": j % 4, "t": "UNSIGNED8"}, "name": f"var{j}", "arr": None}
+                            for j in range(i)]}
+               for i in range(20)]
+    contents = []
+    for record in records:
+        blk_file = Block("data/fill_tmpl.txt")
+        blk_file.fill(record)
+        contents.append(blk_file.content)
+
+    assert render_many("data/fill_tmpl.txt", records, workers=2, chunksize=3) == contents
+    assert render_many(Block("data/fill_tmpl.txt"), records, workers=1) == contents
+    out_paths = [Path(f"data/fill_gen_{i}.txt") for i in range(len(records))]
+    render_many("data/fill_tmpl.txt", records, out_paths, workers=2)
+    for (out_path, content) in zip(out_paths, contents):
+        assert out_path.read_text(encoding="utf-8") == content
+        out_path.unlink()
+
+
+def test_render_shards() -> None:
+    data = {
+        "to_set": 1,
+        "to_clear": 0,
+        "struct_name": "SOME_STRUCT_T",
+        "members": [{"type": {"vari_idx": i % 4, "t": "UNSIGNED8"}, "name": f"var{i}",
+                     "arr": {"size": i} if i % 3 else None}
+                    for i in range(50)]}
 
-    assert compare_files("data/fill_gen.txt", "data/fill_exp.txt")
+    blk_file = Block("data/fill_tmpl.txt")
+    tmpl = CompiledTemplate(blk_file.template)
+    blk_file.fill(data)
+
+    assert tmpl.render(data, workers=2, shard_size=7) == blk_file.content
+
+
+def test_incremental_render() -> None:
+    data = {
+        "to_set": 1,
+        "to_clear": 0,
+        "struct_name": "SOME_STRUCT_T",
+        "members": [{"type": {"vari_idx": i % 4, "t": "UNSIGNED8"}, "name": f"var{i}", "arr": None}
+                    for i in range(5)]}
+
+    renderer = IncrementalRenderer("data/fill_tmpl.txt")
+    tmpl = CompiledTemplate(renderer.template.template)
+    assert renderer.render(data) == tmpl.render(data)
+    assert renderer.reused_blocks == 0
+    # Only the blocks depending on the changed data are rendered again, the other blocks are reused.
+    data["members"][1]["name"] = "changedVar"
+    assert renderer.render(data) == tmpl.render(data)
+    assert renderer.reused_blocks == 4
+    data["to_set"] = 0
+    assert renderer.render(data) == tmpl.render(data)